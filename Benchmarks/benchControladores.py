@@ -0,0 +1,166 @@
+'''
+ Benchmark comparativo de los controladores (ExpertSystem, FuzzySystem y ControlPredictivo)
+ Para cada controlador y cada ruta de Simulador/rutas.py mide la latencia de
+ tomarDecision (p50/p99), el coste de generar las trayectorias de la ruta, la
+ memoria de una instancia y la calidad de la ruta simulada (tiempo de vuelta y
+ error transversal). Los resultados se guardan en JSON junto con el commit,
+ para seguir las regresiones entre versiones.
+
+ Uso:
+     python Benchmarks/benchControladores.py [--controladores experto difuso] [--rutas rectas triangulos larga]
+                                             [--salida resultados.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "Simulador"))
+
+from simulador import CONTROLADORES, cargar_controlador, crear_controlador, simular
+from rutas import RUTAS
+
+
+def commit_actual():
+    """
+    Hash del commit del repositorio, o None si no se puede obtener.
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def memoria_instancia(clase, objetivos):
+    """
+    Memoria reservada al construir una instancia del controlador, medida con tracemalloc.
+
+    Returns:
+        tuple: (memoria retenida, pico durante la construcción), en bytes.
+
+    Detalles:
+    - Antes se construye una instancia sin medir, para que las cachés compartidas por todas las
+    instancias (p. ej. la base de conocimiento del FuzzySystem) no cuenten como memoria de la
+    instancia.
+    """
+    crear_controlador(clase, objetivos)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        antes = tracemalloc.get_traced_memory()[0]
+        controlador = crear_controlador(clase, objetivos)
+        actual, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del controlador
+    return actual - antes, pico - antes
+
+
+def cronometrar(controlador, latencias):
+    """
+    Cambia la clase de la instancia por una subclase cuyo `tomarDecision` añade a `latencias`
+    la duración (ns) de cada llamada.
+
+    Los controladores usan `__slots__`, así que no se puede sustituir el método en la instancia;
+    la subclase no añade atributos y comparte su disposición en memoria.
+    """
+    clase = type(controlador)
+
+    class Cronometrado(clase):
+        __slots__ = ()
+
+        def tomarDecision(self, poseRobot):
+            inicio = time.perf_counter_ns()
+            decision = clase.tomarDecision(self, poseRobot)
+            latencias.append(time.perf_counter_ns() - inicio)
+            return decision
+
+    controlador.__class__ = Cronometrado
+
+
+def medir(nombre_controlador, nombre_ruta, objetivos, args):
+    """
+    Ejecuta todas las medidas de un controlador sobre una ruta.
+    """
+    clase = cargar_controlador(nombre_controlador)
+    memoria, memoria_pico = memoria_instancia(clase, objetivos)
+
+    # --- Coste de generar las trayectorias de toda la ruta ---
+    controlador = crear_controlador(clase, objetivos)
+    inicio = time.perf_counter()
+    controlador.compilar_ruta(objetivos)
+    generacion = time.perf_counter() - inicio
+
+    # --- Simulación en lazo cerrado con la latencia de cada decisión ---
+    latencias = []
+    cronometrar(controlador, latencias)
+    resultado = simular(controlador, objetivos, args.dt, args.tiempo_maximo, tiempo_sin_avance=args.tiempo_sin_avance)
+    latencias_us = np.asarray(latencias, dtype=np.float64) / 1e3
+
+    return {
+        "controlador": nombre_controlador,
+        "ruta": nombre_ruta,
+        "segmentos": len(objetivos),
+        "latencia_p50_us": float(np.percentile(latencias_us, 50)),
+        "latencia_p99_us": float(np.percentile(latencias_us, 99)),
+        "latencia_media_us": float(np.mean(latencias_us)),
+        "generacion_ruta_ms": generacion * 1e3,
+        "generacion_por_segmento_us": generacion * 1e6 / len(objetivos),
+        "memoria_kb": memoria / 1024,
+        "memoria_pico_kb": memoria_pico / 1024,
+        **resultado,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--controladores", nargs="+", choices=sorted(CONTROLADORES), default=sorted(CONTROLADORES))
+    parser.add_argument("--rutas", nargs="+", choices=list(RUTAS), default=list(RUTAS))
+    parser.add_argument("--dt", type=float, default=0.05, help="Paso de simulación en segundos")
+    parser.add_argument("--tiempo-maximo", type=float, default=20000.0, help="Tiempo simulado máximo por ruta")
+    parser.add_argument("--tiempo-sin-avance", type=float, default=60.0,
+                        help="Detiene la simulación si el robot no avanza de segmento en este tiempo simulado")
+    parser.add_argument("--salida", default="resultados_controladores.json")
+    args = parser.parse_args()
+
+    resultados = []
+    for nombre_ruta in args.rutas:
+        objetivos = RUTAS[nombre_ruta]()
+        for nombre_controlador in args.controladores:
+            resultados.append(medir(nombre_controlador, nombre_ruta, objetivos, args))
+
+    informe = {
+        "commit": commit_actual(),
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "parametros": {"dt": args.dt, "tiempo_maximo": args.tiempo_maximo, "tiempo_sin_avance": args.tiempo_sin_avance},
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as f:
+        json.dump(informe, f, indent=2, ensure_ascii=False)
+
+    print(f"{'controlador':<13}{'ruta':<12}{'p50 (us)':>10}{'p99 (us)':>10}{'gen. (ms)':>11}{'mem. (KB)':>11}"
+          f"{'vuelta (s)':>12}{'segm.':>11}{'err. medio':>12}")
+    for r in resultados:
+        vuelta = f"{r['tiempo_vuelta']:.1f}" if r["completada"] else "-"
+        print(f"{r['controlador']:<13}{r['ruta']:<12}{r['latencia_p50_us']:>10.1f}{r['latencia_p99_us']:>10.1f}"
+              f"{r['generacion_ruta_ms']:>11.2f}{r['memoria_kb']:>11.1f}{vuelta:>12}"
+              f"{str(r['segmentos_completados']) + '/' + str(r['segmentos']):>11}{r['error_medio']:>12.3f}")
+    print(f"\nResultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
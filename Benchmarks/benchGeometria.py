@@ -0,0 +1,178 @@
+'''
+ Benchmark del núcleo de geometría
+ Compara la preparación geométrica de cada segmento triangular (circuncentro,
+ puntos sobre D, desplazamiento de C y puntos de control) con las versiones
+ originales basadas en arrays de NumPy, sobre triángulos aleatorios, tanto en
+ tiempo como en resultado.
+
+ Uso (desde el directorio del lanzador usa sus robot.py, segmento.py y P1Launcher.py;
+ desde cualquier otro, los sustitutos de la carpeta Simulador):
+     python <repo>/Benchmarks/benchGeometria.py [--triangulos N] [--repeticiones R] [--semilla S]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import contextlib
+import io
+import math
+import os
+import sys
+import timeit
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.getcwd()] + [os.path.join(RAIZ, carpeta) for carpeta in ("Comun", "SistemaExperto", "FuzzyExpert", "Simulador")]
+
+from expertSystem import ExpertSystem
+from fuzzyExpert import FuzzySystem
+from geometria import circuncentro
+
+
+# ##############################
+# ---- GEOMETRÍA ORIGINAL ----
+# ##############################
+
+def circuncentro_original(B, C, D):
+    A = np.array(B)
+    B = np.array(C)
+    C = np.array(D)
+    AB, BC, CA = B - A, C - B, A - C
+    punto_medio_AB = A + 0.5 * AB
+    punto_medio_BC = B + 0.5 * BC
+    punto_medio_CA = C + 0.5 * CA
+    perp_AB = np.array([-AB[1], AB[0]])
+    perp_BC = np.array([-BC[1], BC[0]])
+    perp_CA = np.array([-CA[1], CA[0]])
+
+    def ecuacion_linea(p1, p2):
+        A = p2[1] - p1[1]
+        B = p1[0] - p2[0]
+        return A, B, A * p1[0] + B * p1[1]
+
+    A1, B1, C1 = ecuacion_linea(punto_medio_AB, punto_medio_AB + perp_AB)
+    A2, B2, C2 = ecuacion_linea(punto_medio_BC, punto_medio_BC + perp_BC)
+    A3, B3, C3 = ecuacion_linea(punto_medio_CA, punto_medio_CA + perp_CA)
+
+    def interseccion(A1, B1, C1, A2, B2, C2):
+        det = A1 * B2 - A2 * B1
+        if det == 0:
+            raise ValueError("Las líneas no se intersectan o son paralelas")
+        return np.array([(B2 * C1 - B1 * C2) / det, (A1 * C2 - A2 * C1) / det])
+
+    P = interseccion(A1, B1, C1, A2, B2, C2)
+    if np.isclose(A3 * P[0] + B3 * P[1], C3):
+        return P
+    raise ValueError("Las líneas no se intersectan en un único punto")
+
+
+def puntos_sobre_D_original(B, C, D):
+    D = np.array(D)
+    vector_BD = D - circuncentro_original(B, C, D)
+    vector_perpendicular = np.array([-vector_BD[1], vector_BD[0]])
+    unitario = vector_perpendicular / np.linalg.norm(vector_perpendicular)
+    return D + unitario * 4, D + unitario * 2.5, D + unitario * 1.5
+
+
+def mover_C_original(B, C, D, distancia):
+    B, C, D = np.array(B), np.array(C), np.array(D)
+    vector_BD = D - B
+    vector_perpendicular = np.array([-vector_BD[1], vector_BD[0]])
+    return C + vector_perpendicular / np.linalg.norm(vector_perpendicular) * distancia
+
+
+def puntos_control_original(B, C, D, constante, offset):
+    vBC = np.array(C) - np.array(B)
+    vCD = np.array(D) - np.array(C)
+    norm_vBC = np.array([-vBC[1], vBC[0]]) / np.linalg.norm(vBC)
+    norm_vCD = np.array([-vCD[1], vCD[0]]) / np.linalg.norm(vCD)
+    CP1 = np.array(B) + constante * vBC + offset * norm_vBC
+    CP2 = np.array(C) + constante * vCD + offset * norm_vCD
+    return CP1, CP2
+
+
+def offset_original(A, B, C, base, factor, maximo):
+    longitud_base = math.dist(A, B)
+    altura = abs((B[1] - A[1]) * C[0] - (B[0] - A[0]) * C[1] + B[0] * A[1] - B[1] * A[0]) / longitud_base
+    return max(0.5, min(base + factor * (altura / (longitud_base + 1)), maximo))
+
+
+def preparacion_original_experto(controlador, B, C, D):
+    D_nuevo = puntos_sobre_D_original(B, C, D)[0]
+    nuevo_C = mover_C_original(B, C, D, controlador.CURVE_EXPANSION_FACTOR)
+    offset = offset_original(B, D_nuevo, nuevo_C, controlador.CURVE_CONTROLL_POINTS_OFFSET, 2, 1.5)
+    CP1, CP2 = puntos_control_original(B, nuevo_C, D_nuevo, controlador.CONTROL_POINT_CONSTANT, offset)
+    return (D_nuevo, nuevo_C, CP1, CP2)
+
+
+def preparacion_experto(controlador, B, C, D):
+    D_nuevo = controlador.add_point_above_D(B, C, D)[0]
+    nuevo_C = controlador.move_point_C_perpendicular(B, C, D)
+    CP1, CP2 = controlador.calculate_control_points(B, nuevo_C, D_nuevo)
+    return (D_nuevo, nuevo_C, CP1, CP2)
+
+
+def preparacion_original_difusa(controlador, B, C, D):
+    offset = offset_original(B, D, C, 1.5, 0.5, 5)
+    return puntos_control_original(B, C, D, controlador.CONTROL_POINT_CONSTANT, offset)
+
+
+# ####################
+# ---- BENCHMARK ----
+# ####################
+
+def triangulos_aleatorios(n, semilla):
+    """
+    `n` triángulos (B, C, D) como los de las rutas: base de 6 a 14 m y vértice C a 2-5 m de ella.
+    """
+    rng = np.random.default_rng(semilla)
+    triangulos = []
+    for _ in range(n):
+        B = rng.uniform(-50, 50, 2)
+        rumbo = rng.uniform(0, 2 * math.pi)
+        direccion = np.array((math.cos(rumbo), math.sin(rumbo)))
+        D = B + rng.uniform(6, 14) * direccion
+        C = (B + D) / 2 + rng.uniform(2, 5) * rng.choice((-1.0, 1.0)) * np.array((-direccion[1], direccion[0]))
+        triangulos.append(tuple(tuple(float(v) for v in P) for P in (B, C, D)))
+    return triangulos
+
+
+def medir(funcion, triangulos, repeticiones):
+    """Tiempo medio por triángulo, en microsegundos, del mejor de cinco lotes."""
+    lote = lambda: [funcion(*t) for t in triangulos]
+    return min(timeit.repeat(lote, number=repeticiones, repeat=5)) / (repeticiones * len(triangulos)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--triangulos", type=int, default=1000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        experto, difuso = ExpertSystem(), FuzzySystem()
+    triangulos = triangulos_aleatorios(args.triangulos, args.semilla)
+
+    casos = [
+        ("circuncentro", circuncentro_original, circuncentro),
+        ("ExpertSystem: preparación del segmento",
+         lambda B, C, D: preparacion_original_experto(experto, B, C, D),
+         lambda B, C, D: preparacion_experto(experto, B, C, D)),
+        ("FuzzySystem.calculate_control_points",
+         lambda B, C, D: preparacion_original_difusa(difuso, B, C, D), difuso.calculate_control_points),
+    ]
+
+    print(f"{'operación':40s} {'original (us)':>14s} {'núcleo (us)':>12s} {'aceleración':>12s} {'dif. máx.':>10s}")
+    for nombre, original, nucleo in casos:
+        diferencia = max(np.max(np.abs(np.asarray(original(*t), dtype=np.float64) - np.asarray(nucleo(*t), dtype=np.float64)))
+                         for t in triangulos)
+        t_original = medir(original, triangulos, args.repeticiones)
+        t_nucleo = medir(nucleo, triangulos, args.repeticiones)
+        print(f"{nombre:40s} {t_original:14.2f} {t_nucleo:12.2f} {t_original / t_nucleo:11.1f}x {diferencia:10.1e}")
+
+
+if __name__ == "__main__":
+    main()
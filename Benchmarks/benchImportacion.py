@@ -0,0 +1,132 @@
+'''
+ Benchmark de arranque de los controladores
+ Mide, en un proceso nuevo por repetición (como un proceso de trabajo del barrido
+ de parámetros), el tiempo de importar cada módulo de los controladores, el de
+ construir la primera instancia y la memoria residente, y desglosa la importación
+ con `python -X importtime` para señalar los módulos más pesados y comprobar que
+ matplotlib y fuzzy_expert no se cargan salvo que se pidan.
+
+ Uso (desde el directorio del lanzador usa sus robot.py, segmento.py y P1Launcher.py;
+ desde cualquier otro, los sustitutos de la carpeta Simulador):
+     python <repo>/Benchmarks/benchImportacion.py [--repeticiones R] [--mas-pesados N] [--json FICHERO]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUTAS_IMPORTACION: list = [os.getcwd()] + [os.path.join(RAIZ, carpeta) for carpeta in ("Comun", "SistemaExperto", "FuzzyExpert", "ControlPredictivo", "Simulador")]
+
+# Módulo -> expresión que construye su primera instancia
+CASOS: dict = {
+    "expertSystem": "expertSystem.ExpertSystem()",
+    "fuzzyExpert": "fuzzyExpert.FuzzySystem()",
+    "expertFleet": "expertFleet.FlotaExpertSystem(100)",
+    "fuzzyFleet": "fuzzyFleet.FlotaFuzzySystem(100)",
+    "controlPredictivo": "controlPredictivo.ControlPredictivo()",
+    "fuzzyExpert (referencia)": "fuzzyExpert.FuzzySystem().inferencia_referencia(1.0, 10.0)",
+}
+
+# Módulos que no deberían cargarse en un proceso de trabajo
+MODULOS_PESADOS: tuple = ("matplotlib", "fuzzy_expert", "ipywidgets")
+
+# Programa que ejecuta cada proceso hijo; escribe el resultado en JSON por stdout
+PROGRAMA_HIJO = """
+import contextlib, io, json, sys, time
+sys.path[:0] = {rutas!r}
+inicio = time.perf_counter()
+import {modulo}
+importado = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    {construccion}
+construido = time.perf_counter()
+try:
+    import resource
+    memoria = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+except ImportError:
+    memoria = None
+print(json.dumps({{
+    "importacion": importado - inicio,
+    "construccion": construido - importado,
+    "memoria_mb": memoria,
+    "pesados": sorted({{nombre.split(".")[0] for nombre in sys.modules}} & set({pesados!r})),
+}}))
+"""
+
+
+def leer_importtime(salida):
+    """
+    Interpreta la salida de `-X importtime`.
+
+    Returns:
+        dict: Módulo -> tiempo acumulado de importación en segundos (el de su primera aparición).
+    """
+    tiempos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "cumulative" in linea:
+            continue
+        _, acumulado, nombre = linea[len("import time:"):].split("|")
+        tiempos.setdefault(nombre.strip(), int(acumulado) / 1e6)
+    return tiempos
+
+
+def medir(modulo, construccion, repeticiones):
+    """
+    Ejecuta `repeticiones` procesos nuevos que importan `modulo` y evalúan `construccion`.
+
+    Returns:
+        dict: Medianas de importación y construcción (s), memoria (MB), módulos pesados cargados
+        y tiempos acumulados de `-X importtime` de la última repetición.
+    """
+    programa = PROGRAMA_HIJO.format(rutas=RUTAS_IMPORTACION, modulo=modulo, construccion=construccion,
+                                    pesados=MODULOS_PESADOS)
+    resultados, importtime = [], {}
+    for _ in range(repeticiones):
+        proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", programa],
+                                 capture_output=True, text=True, check=True)
+        resultados.append(json.loads(proceso.stdout.strip().splitlines()[-1]))
+        importtime = leer_importtime(proceso.stderr)
+
+    return {
+        "importacion": statistics.median(r["importacion"] for r in resultados),
+        "construccion": statistics.median(r["construccion"] for r in resultados),
+        "memoria_mb": resultados[-1]["memoria_mb"],
+        "pesados": resultados[-1]["pesados"],
+        "importtime": importtime,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5, help="Procesos por caso (se informa la mediana)")
+    parser.add_argument("--mas-pesados", type=int, default=5, help="Importaciones más costosas que se listan por caso")
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda los resultados en JSON")
+    args = parser.parse_args()
+
+    resultados = {}
+    print(f"{'caso':26s} {'importación (ms)':>17s} {'construcción (ms)':>18s} {'memoria (MB)':>13s}  pesados")
+    for nombre, construccion in CASOS.items():
+        modulo = nombre.split()[0]
+        resultado = resultados[nombre] = medir(modulo, construccion, args.repeticiones)
+        memoria = f"{resultado['memoria_mb']:13.1f}" if resultado["memoria_mb"] is not None else f"{'-':>13s}"
+        print(f"{nombre:26s} {1e3 * resultado['importacion']:17.1f} {1e3 * resultado['construccion']:18.1f} "
+              f"{memoria}  {', '.join(resultado['pesados']) or '-'}")
+
+        propios = {m: t for m, t in resultado["importtime"].items() if m != modulo}
+        for importacion, tiempo in sorted(propios.items(), key=lambda par: -par[1])[:args.mas_pesados]:
+            print(f"    {importacion:40s} {1e3 * tiempo:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
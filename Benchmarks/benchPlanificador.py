@@ -0,0 +1,71 @@
+'''
+ Benchmark del planificador de simulaciones
+ Simula el mismo conjunto de trabajos (ruta, controlador, semilla) con distinto
+ número de procesos e informa del tiempo real, de los trabajos y ticks por
+ segundo, de la aceleración respecto al primer número de procesos y de la
+ eficiencia paralela. Los datos compartidos de las rutas se preparan una vez,
+ antes de las medidas, y su tiempo se informa aparte.
+
+ Uso:
+     python Benchmarks/benchPlanificador.py [--procesos 1 2 4 8] [--controladores experto predictivo]
+                                            [--rutas rectas triangulos] [--semillas 8] [--json resultados.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "Simulador"))
+
+from planificador import planificar, preparar_rutas, resumir, trabajos_rejilla
+from rutas import FAMILIAS_RUTAS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--procesos", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--controladores", nargs="+", default=["experto", "predictivo"])
+    parser.add_argument("--rutas", nargs="+", choices=list(FAMILIAS_RUTAS), default=["rectas", "triangulos"])
+    parser.add_argument("--semillas", type=int, default=8, help="Semillas por ruta y controlador (0..N-1)")
+    parser.add_argument("--dt", type=float, default=0.05)
+    parser.add_argument("--tiempo-maximo", type=float, default=2000.0)
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda los resultados en JSON")
+    args = parser.parse_args()
+
+    trabajos = trabajos_rejilla(args.rutas, args.controladores, range(args.semillas))
+    nucleos = os.cpu_count()
+    resultados = {"nucleos": nucleos, "trabajos": len(trabajos), "medidas": []}
+    with tempfile.TemporaryDirectory(prefix="benchPlanificador_") as directorio:
+        inicio = time.perf_counter()
+        preparar_rutas(trabajos, directorio)
+        resultados["preparacion"] = time.perf_counter() - inicio
+        print(f"{len(trabajos)} trabajos, {nucleos} núcleos, preparación de las rutas {resultados['preparacion']:.2f} s\n")
+
+        print(f"{'procesos':>8s}{'tiempo (s)':>12s}{'trabajos/s':>12s}{'ticks/s':>10s}{'aceleración':>13s}{'eficiencia':>12s}")
+        referencia = None
+        for procesos in args.procesos:
+            inicio = time.perf_counter()
+            simulados = list(planificar(trabajos, args.dt, args.tiempo_maximo, procesos=procesos, directorio=directorio))
+            rendimiento = resumir(simulados, time.perf_counter() - inicio, procesos)["rendimiento"]
+            referencia = referencia or rendimiento["tiempo_real"]
+            rendimiento["aceleracion"] = referencia / rendimiento["tiempo_real"]
+            resultados["medidas"].append(rendimiento)
+            aviso = "  (más procesos que núcleos)" if procesos > nucleos else ""
+            print(f"{procesos:>8d}{rendimiento['tiempo_real']:>12.2f}{rendimiento['trabajos_por_segundo']:>12.2f}"
+                  f"{rendimiento['ticks_por_segundo']:>10.0f}{rendimiento['aceleracion']:>12.2f}x"
+                  f"{100 * rendimiento['eficiencia']:>11.0f}%{aviso}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+'''
+ Benchmark del ControlPredictivo
+ Mide el compromiso entre latencia y calidad del control predictivo: para cada
+ tamaño de lote simula las rutas de Simulador/rutas.py e informa de los ticks y
+ el tiempo por vuelta, el error transversal y la latencia de tomarDecision
+ (p50/p99), junto a las leyes reactivas del ExpertSystem como referencia.
+ También muestra el lote que elige la calibración (TAMANO_LOTE=0) para cada
+ presupuesto de latencia en esta máquina.
+
+ Uso:
+     python Benchmarks/benchPredictivo.py [--lotes 16 32 64 128] [--presupuestos 500 1000 2000]
+                                          [--rutas rectas triangulos] [--json resultados.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "Simulador"))
+
+from simulador import cargar_controlador, crear_controlador, pose_inicial, simular
+from robot import Robot
+from rutas import RUTAS
+from seguimiento import LEYES_SEGUIMIENTO
+from controlPredictivo import ConfiguracionPredictiva, calibrar_lote
+from benchControladores import cronometrar
+
+
+def medir(nombre_ruta, objetivos, args, controlador, **opciones):
+    """
+    Simula una ruta con el controlador `controlador` de `CONTROLADORES` construido con `opciones`.
+
+    Returns:
+        dict: Resultado de `simular` junto con la latencia de tomarDecision (p50 y p99, en µs) y,
+        si se completó la ruta, la decisión que se toma después (`decision_final`).
+
+    Detalles:
+    - El lanzador sigue llamando a `tomarDecision` mientras `esObjetivoAlcanzado()` sea falso,
+    también después del último segmento, pero `simular` se detiene antes. Para comprobar ese caso,
+    tras completar la ruta se pide una decisión más fuera de las medidas de latencia.
+    """
+    instancia = crear_controlador(cargar_controlador(controlador), objetivos, **opciones)
+    latencias = []
+    cronometrar(instancia, latencias)
+    robot = Robot(*pose_inicial(objetivos), dt=args.dt)
+    resultado = simular(instancia, objetivos, args.dt, args.tiempo_maximo, robot, tiempo_sin_avance=args.tiempo_sin_avance)
+    latencias_us = np.asarray(latencias, dtype=np.float64) / 1e3
+    if resultado["completada"]:
+        resultado["decision_final"] = tuple(instancia.tomarDecision(robot.pose()))
+    return {
+        "ruta": nombre_ruta,
+        "segmentos": len(objetivos),
+        "latencia_p50_us": float(np.percentile(latencias_us, 50)),
+        "latencia_p99_us": float(np.percentile(latencias_us, 99)),
+        **resultado,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lotes", nargs="+", type=int, default=[16, 32, 64, 128], help="Tamaños de lote del ControlPredictivo")
+    parser.add_argument("--presupuestos", nargs="+", type=float, default=[250.0, 500.0, 1000.0, 2000.0],
+                        help="Presupuestos de latencia (µs) para los que se muestra el lote calibrado")
+    parser.add_argument("--leyes", nargs="*", choices=LEYES_SEGUIMIENTO, default=list(LEYES_SEGUIMIENTO),
+                        help="Leyes del ExpertSystem que se simulan como referencia")
+    parser.add_argument("--rutas", nargs="+", choices=list(RUTAS), default=["rectas", "triangulos"])
+    parser.add_argument("--dt", type=float, default=0.05, help="Paso de simulación en segundos")
+    parser.add_argument("--tiempo-maximo", type=float, default=20000.0, help="Tiempo simulado máximo por ruta")
+    parser.add_argument("--tiempo-sin-avance", type=float, default=60.0,
+                        help="Detiene la simulación si el robot no avanza de segmento en este tiempo simulado")
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda los resultados en JSON")
+    args = parser.parse_args()
+
+    # --- Lote calibrado para cada presupuesto en esta máquina ---
+    calibrados = {}
+    for presupuesto in args.presupuestos:
+        calibrados[presupuesto] = calibrar_lote(replace(ConfiguracionPredictiva(), PRESUPUESTO_LATENCIA_US=presupuesto))
+        print(f"presupuesto {presupuesto:7.0f} us -> lote {calibrados[presupuesto]}")
+    print()
+
+    resultados = []
+    print(f"{'ruta':<12}{'variante':<24}{'ticks':>8}{'vuelta (s)':>12}{'segm.':>9}{'err. medio':>12}{'err. máx.':>11}"
+          f"{'p50 (us)':>10}{'p99 (us)':>10}")
+    for nombre_ruta in args.rutas:
+        objetivos = RUTAS[nombre_ruta]()
+        variantes = [(f"experto {ley}", "experto", {"LEY_SEGUIMIENTO": ley}) for ley in args.leyes]
+        variantes += [(f"predictivo lote {lote}", "predictivo", {"TAMANO_LOTE": lote}) for lote in args.lotes]
+        for variante, controlador, opciones in variantes:
+            r = {"variante": variante, **medir(nombre_ruta, objetivos, args, controlador, **opciones)}
+            resultados.append(r)
+            vuelta = f"{r['tiempo_vuelta']:.1f}" if r["completada"] else "-"
+            print(f"{nombre_ruta:<12}{variante:<24}{r['ticks']:>8}{vuelta:>12}"
+                  f"{str(r['segmentos_completados']) + '/' + str(r['segmentos']):>9}{r['error_medio']:>12.3f}"
+                  f"{r['error_maximo']:>11.3f}{r['latencia_p50_us']:>10.1f}{r['latencia_p99_us']:>10.1f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"lotes_calibrados": calibrados, "resultados": resultados}, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
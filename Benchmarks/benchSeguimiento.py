@@ -0,0 +1,99 @@
+'''
+ Benchmark de las leyes de seguimiento del ExpertSystem
+ Simula cada ruta de Simulador/rutas.py con cada `LEY_SEGUIMIENTO` (checkpoints,
+ pure pursuit y Stanley) y compara el tiempo de vuelta, el error transversal
+ (medio y máximo) y la latencia de tomarDecision, con la mejora relativa de cada
+ ley continua frente a la de checkpoints en cada tipo de segmento.
+
+ Uso:
+     python Benchmarks/benchSeguimiento.py [--leyes checkpoints pure_pursuit stanley] [--rutas rectas triangulos larga]
+                                           [--json resultados.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, "Simulador"))
+
+from simulador import cargar_controlador, crear_controlador, simular
+from rutas import RUTAS
+from seguimiento import LEYES_SEGUIMIENTO
+from benchControladores import cronometrar
+
+
+def medir(ley, nombre_ruta, objetivos, args):
+    """
+    Simula una ruta con el ExpertSystem y la ley de seguimiento `ley`.
+
+    Returns:
+        dict: Resultado de `simular` junto con la latencia de tomarDecision (media y p99, en µs).
+    """
+    controlador = crear_controlador(cargar_controlador("experto"), objetivos, LEY_SEGUIMIENTO=ley)
+    latencias = []
+    cronometrar(controlador, latencias)
+    resultado = simular(controlador, objetivos, args.dt, args.tiempo_maximo, tiempo_sin_avance=args.tiempo_sin_avance)
+    latencias_us = np.asarray(latencias, dtype=np.float64) / 1e3
+    return {
+        "ley": ley,
+        "ruta": nombre_ruta,
+        "segmentos": len(objetivos),
+        "latencia_media_us": float(np.mean(latencias_us)),
+        "latencia_p99_us": float(np.percentile(latencias_us, 99)),
+        **resultado,
+    }
+
+
+def mejora(valor, referencia):
+    """
+    Mejora relativa (%) de `valor` frente a `referencia` cuando menor es mejor, o "-" si no se puede calcular.
+    """
+    if valor is None or referencia is None or referencia <= 0:
+        return "-"
+    return f"{100.0 * (referencia - valor) / referencia:+.1f}%"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--leyes", nargs="+", choices=LEYES_SEGUIMIENTO, default=list(LEYES_SEGUIMIENTO))
+    parser.add_argument("--rutas", nargs="+", choices=list(RUTAS), default=list(RUTAS))
+    parser.add_argument("--dt", type=float, default=0.05, help="Paso de simulación en segundos")
+    parser.add_argument("--tiempo-maximo", type=float, default=20000.0, help="Tiempo simulado máximo por ruta")
+    parser.add_argument("--tiempo-sin-avance", type=float, default=60.0,
+                        help="Detiene la simulación si el robot no avanza de segmento en este tiempo simulado")
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda los resultados en JSON")
+    args = parser.parse_args()
+
+    resultados = []
+    print(f"{'ruta':<12}{'ley':<14}{'vuelta (s)':>12}{'segm.':>11}{'err. medio':>12}{'err. máx.':>11}"
+          f"{'media (us)':>12}{'p99 (us)':>10}{'Δ vuelta':>10}{'Δ error':>10}")
+    for nombre_ruta in args.rutas:
+        objetivos = RUTAS[nombre_ruta]()
+        referencia = None
+        for ley in args.leyes:
+            r = medir(ley, nombre_ruta, objetivos, args)
+            resultados.append(r)
+            vuelta = r["tiempo_vuelta"] if r["completada"] else None
+            if ley == "checkpoints":
+                referencia = (vuelta, r["error_medio"])
+            delta_vuelta, delta_error = ("-", "-") if referencia is None or ley == "checkpoints" else \
+                (mejora(vuelta, referencia[0]), mejora(r["error_medio"], referencia[1]))
+            print(f"{nombre_ruta:<12}{ley:<14}{f'{vuelta:.1f}' if vuelta is not None else '-':>12}"
+                  f"{str(r['segmentos_completados']) + '/' + str(r['segmentos']):>11}{r['error_medio']:>12.3f}"
+                  f"{r['error_maximo']:>11.3f}{r['latencia_media_us']:>12.1f}{r['latencia_p99_us']:>10.1f}"
+                  f"{delta_vuelta:>10}{delta_error:>10}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
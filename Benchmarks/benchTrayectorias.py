@@ -0,0 +1,140 @@
+'''
+ Benchmark de generación de trayectorias
+ Compara los generadores vectorizados de ExpertSystem y FuzzySystem con las
+ versiones originales basadas en bucles, tanto en tiempo como en resultado.
+
+ Uso (desde el directorio del lanzador usa sus robot.py, segmento.py y P1Launcher.py;
+ desde cualquier otro, los sustitutos de la carpeta Simulador):
+     python <repo>/Benchmarks/benchTrayectorias.py [--checkpoints N] [--repeticiones R]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.getcwd()] + [os.path.join(RAIZ, carpeta) for carpeta in ("Comun", "SistemaExperto", "FuzzyExpert", "Simulador")]
+
+from expertSystem import ExpertSystem
+from fuzzyExpert import FuzzySystem
+
+
+class _Segmento:
+    """Segmento mínimo con la interfaz que usan los generadores."""
+
+    def __init__(self, inicio, medio, fin):
+        self.inicio, self.medio, self.fin = inicio, medio, fin
+
+    def getInicio(self):
+        return self.inicio
+
+    def getMedio(self):
+        return self.medio
+
+    def getFin(self):
+        return self.fin
+
+    def getType(self):
+        return 2
+
+
+# ###############################
+# ---- GENERADORES ORIGINALES ----
+# ###############################
+
+def linea_original(controlador, A, B, extension):
+    x1, y1 = float(A[0]), float(A[1])
+    x2, y2 = float(B[0]), float(B[1])
+    puntos = []
+    if extension:
+        puntos.append(controlador.generate_point_on_extension(A, B))
+    puntos.append(A)
+    dx = (x2 - x1) / (controlador.LINE_CHECKPOINTS + 1)
+    dy = (y2 - y1) / (controlador.LINE_CHECKPOINTS + 1)
+    for i in range(1, controlador.LINE_CHECKPOINTS + 1):
+        puntos.append((round(x1 + i * dx, 6), round(y1 + i * dy, 6)))
+    puntos.append(B)
+    return puntos
+
+
+def curva_original_experto(controlador, B, C, D):
+    D_nuevo, punto_encima_D2, punto_encima_D3 = controlador.add_point_above_D(B, C, D)
+    nuevo_C = controlador.move_point_C_perpendicular(B, C, D)
+    CP1, CP2 = controlador.calculate_control_points(controlador.segmentoObjetivo.getInicio(), nuevo_C, D_nuevo)
+    trayectoria = []
+    for t in np.linspace(0, 1, controlador.MAX_TRIANGLE_CHECKPOINTS):
+        trayectoria.append(controlador.cubic_bezier(t, np.array(B), np.array(CP1), np.array(CP1), np.array(nuevo_C)))
+    for t in np.linspace(0, 1, controlador.MAX_TRIANGLE_CHECKPOINTS):
+        trayectoria.append(controlador.cubic_bezier(t, np.array(nuevo_C), np.array(CP2), np.array(CP2), np.array(D_nuevo)))
+    trayectoria.extend((punto_encima_D2, punto_encima_D3, D))
+    return np.array(trayectoria)
+
+
+def curva_original_difusa(controlador, B, C, D, CP1, CP2):
+    trayectoria = []
+    for t in np.linspace(0, 1, controlador.TRIANGLE_CHECKPOINTS):
+        trayectoria.append(controlador.cubic_bezier(t, np.array(B), np.array(CP1), np.array(CP1), np.array(C)))
+    for t in np.linspace(0, 1, controlador.TRIANGLE_CHECKPOINTS):
+        trayectoria.append(controlador.cubic_bezier(t, np.array(C), np.array(CP2), np.array(CP2), np.array(D)))
+    return np.array(trayectoria)
+
+
+# ####################
+# ---- BENCHMARK ----
+# ####################
+
+def medir(funcion, repeticiones):
+    """Tiempo medio por llamada, en microsegundos, del mejor de cinco lotes."""
+    return min(timeit.repeat(funcion, number=repeticiones, repeat=5)) / repeticiones * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checkpoints", type=int, default=200, help="Checkpoints por segmento lineal y por curva")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    A, B, C, D = (0.0, 0.0), (25.0, 10.0), (30.0, 18.0), (42.0, 12.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        experto = ExpertSystem(LINE_CHECKPOINTS=args.checkpoints, MAX_TRIANGLE_CHECKPOINTS=args.checkpoints)
+        difuso = FuzzySystem(LINE_CHECKPOINTS=args.checkpoints, TRIANGLE_CHECKPOINTS=args.checkpoints)
+        CP1, CP2 = difuso.calculate_control_points(B, C, D)
+
+    experto.segmentoObjetivo = _Segmento(B, C, D)
+    experto.segment_number = 0
+    experto.TOTAL_SEGMENT_NUMBER = 10
+
+    casos = [
+        ("ExpertSystem.generate_linear_path",
+         lambda: linea_original(experto, A, B, True), lambda: experto.generate_linear_path(A, B)),
+        ("ExpertSystem.generate_curved_path",
+         lambda: curva_original_experto(experto, B, C, D), lambda: experto.generate_curved_path(B, C, D)),
+        ("FuzzySystem.generate_linear_path",
+         lambda: linea_original(difuso, A, B, False), lambda: difuso.generate_linear_path(A, B)),
+        ("FuzzySystem.generate_curved_path",
+         lambda: curva_original_difusa(difuso, B, C, D, CP1, CP2), lambda: difuso.generate_curved_path(B, C, D, CP1, CP2)),
+    ]
+
+    print(f"{'generador':38s} {'original (us)':>14s} {'vectorizado (us)':>17s} {'aceleración':>12s} {'dif. máx.':>10s}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados = []
+        for nombre, original, vectorizado in casos:
+            diferencia = np.max(np.abs(np.asarray(original(), dtype=np.float64) - vectorizado()))
+            t_original = medir(original, args.repeticiones)
+            t_vectorizado = medir(vectorizado, args.repeticiones)
+            resultados.append((nombre, t_original, t_vectorizado, diferencia))
+
+    for nombre, t_original, t_vectorizado, diferencia in resultados:
+        print(f"{nombre:38s} {t_original:14.1f} {t_vectorizado:17.1f} {t_original / t_vectorizado:11.1f}x {diferencia:10.1e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+'''
+ Bucle de control asíncrono
+ Ejecuta un controlador a frecuencia fija sobre un bucle de eventos de asyncio:
+ en cada tick lee la pose de una fuente asíncrona, llama a tomarDecision y envía
+ (V, W) a un destino asíncrono, como haría el lanzador con el robot real. Registra
+ los plazos incumplidos y los histogramas de jitter, de cómputo y de ciclo. Varios
+ robots pueden compartir el mismo bucle de eventos, con sus ticks escalonados.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import asyncio
+import time
+
+from histograma import Histograma
+
+
+class FuenteLocal:
+    """
+    Sustituto en proceso del hardware: fuente de poses y destino de velocidades sobre un robot
+    simulado (cualquier objeto con `pose()` y `mover(V, W)`, como el `Robot` de `Simulador/robot.py`).
+
+    El robot avanza un paso de su `dt` por cada velocidad recibida, así que con `dt` igual al
+    periodo del bucle se mueve al ritmo del tiempo real.
+    """
+
+    __slots__ = ("robot", "latencia")
+
+    def __init__(self, robot, latencia: float = 0.0) -> None:
+        """
+        Args:
+            robot: Robot simulado.
+            latencia (float): Retardo (s) de cada lectura de la pose, para emular la comunicación.
+        """
+        self.robot = robot
+        self.latencia: float = latencia
+
+    async def leer(self):
+        if self.latencia:
+            await asyncio.sleep(self.latencia)
+        return self.robot.pose()
+
+    async def enviar(self, V, W):
+        self.robot.mover(V, W)
+
+
+class BucleControl:
+    """
+    Ejecución de un controlador a frecuencia fija con seguimiento de plazos.
+
+    El plazo de cada tick es el instante programado del siguiente. Un tick que termina después
+    cuenta como plazo incumplido; si se retrasa más de un periodo entero, los ticks que ya no
+    llegan a tiempo se saltan (`saltados`) en lugar de ejecutarse seguidos para recuperar.
+    """
+
+    __slots__ = ("controlador", "fuente", "destino", "periodo", "objetivos", "indice", "ticks", "perdidos",
+                 "saltados", "completada", "detenido", "jitter", "computo", "ciclo")
+
+    def __init__(self, controlador, fuente, destino=None, periodo: float = 0.05, objetivos=None) -> None:
+        """
+        Args:
+            controlador: ExpertSystem, FuzzySystem o cualquier objeto con `tomarDecision`.
+            fuente: Objeto con `async leer()` que devuelve la pose del robot.
+            destino (opcional): Objeto con `async enviar(V, W)`. Por defecto, la propia fuente.
+            periodo (float): Periodo del bucle en segundos.
+            objetivos (list, opcional): Segmentos de la ruta. Si se indican, el bucle avanza de
+                segmento como el lanzador (`setObjetivo` al alcanzar cada uno) y termina al completarla.
+        """
+        self.controlador = controlador
+        self.fuente = fuente
+        self.destino = fuente if destino is None else destino
+        self.periodo: float = periodo
+        self.objetivos: list = objetivos
+        self.indice: int = 0                          # Segmento pasado con setObjetivo
+        self.ticks: int = 0                           # Ticks ejecutados
+        self.perdidos: int = 0                        # Ticks que terminaron después de su plazo
+        self.saltados: int = 0                        # Ticks no ejecutados por ir con más de un periodo de retraso
+        self.completada: bool = False                 # Si se completó la ruta de `objetivos`
+        self.detenido: bool = False
+        self.jitter: Histograma = Histograma()        # Retraso del inicio de cada tick sobre su instante programado (ns)
+        self.computo: Histograma = Histograma()       # Duración de tomarDecision (ns)
+        self.ciclo: Histograma = Histograma()         # Duración del tick completo: leer, decidir y enviar (ns)
+
+    def detener(self):
+        """
+        Termina el bucle al acabar el tick en curso.
+        """
+        self.detenido = True
+
+    def avanzar_objetivo(self):
+        """
+        Pasa al siguiente segmento como el lanzador y comprueba si se ha completado la ruta.
+        """
+        total = len(self.objetivos)
+        if self.controlador.segment_number >= total:
+            self.completada = True
+        elif self.controlador.esObjetivoAlcanzado() and self.indice + 1 < total:
+            self.indice += 1
+            self.controlador.setObjetivo(self.objetivos[self.indice])
+
+    async def ejecutar(self, ticks: int = None, duracion: float = None, desfase: float = 0.0):
+        """
+        Ejecuta el bucle hasta `ticks` ticks, `duracion` segundos, completar la ruta o `detener()`.
+
+        Args:
+            ticks (int, opcional): Número máximo de ticks.
+            duracion (float, opcional): Tiempo real máximo en segundos, desde el primer tick.
+            desfase (float): Retraso (s) del primer tick, para escalonar varios bucles.
+
+        Returns:
+            dict: Resultado de `resultado()`.
+
+        Detalles:
+        - Los instantes se programan de forma absoluta (`inicio + k·periodo`) con el reloj del
+        bucle de eventos, así que el retraso de un tick no se acumula en los siguientes.
+        - `tomarDecision` es síncrona: mientras se ejecuta, los demás bucles del mismo bucle de
+        eventos esperan, y su retraso aparece en su jitter.
+        """
+        reloj = asyncio.get_running_loop().time
+        if self.objetivos is not None:
+            self.controlador.setObjetivo(self.objetivos[self.indice])
+
+        programado = reloj() + desfase
+        fin = None if duracion is None else programado + duracion
+        await asyncio.sleep(desfase)
+        while not self.detenido and not self.completada and (ticks is None or self.ticks < ticks):
+            inicio = reloj()
+            self.jitter.registrar(max(inicio - programado, 0.0) * 1e9)
+
+            pose = await self.fuente.leer()
+            inicio_decision = time.perf_counter_ns()
+            V, W = self.controlador.tomarDecision(pose)
+            self.computo.registrar(time.perf_counter_ns() - inicio_decision)
+            await self.destino.enviar(V, W)
+            self.ticks += 1
+            if self.objetivos is not None:
+                self.avanzar_objetivo()
+
+            terminado = reloj()
+            self.ciclo.registrar((terminado - inicio) * 1e9)
+            programado += self.periodo
+            if terminado > programado:
+                self.perdidos += 1
+                atrasados = int((terminado - programado) // self.periodo)
+                self.saltados += atrasados
+                programado += atrasados * self.periodo
+            if fin is not None and programado >= fin:
+                break
+            await asyncio.sleep(programado - reloj())
+
+        return self.resultado()
+
+    def resultado(self):
+        """
+        Returns:
+            dict: Ticks, plazos incumplidos, ticks saltados, estado de la ruta y resúmenes (ns)
+            de los histogramas de jitter, cómputo y ciclo.
+        """
+        return {
+            "ticks": self.ticks,
+            "perdidos": self.perdidos,
+            "saltados": self.saltados,
+            "completada": self.completada,
+            "segmentos_completados": self.controlador.segment_number if self.objetivos is not None else None,
+            "jitter": self.jitter.resumen(),
+            "computo": self.computo.resumen(),
+            "ciclo": self.ciclo.resumen(),
+        }
+
+
+async def ejecutar_bucles(bucles, ticks: int = None, duracion: float = None, escalonar: bool = True):
+    """
+    Ejecuta varios bucles de control (p. ej. uno por robot) en el mismo bucle de eventos.
+
+    Args:
+        bucles (list): Bucles (`BucleControl`) a ejecutar.
+        ticks (int, opcional): Número máximo de ticks de cada bucle.
+        duracion (float, opcional): Tiempo real máximo de cada bucle.
+        escalonar (bool): Reparte el primer tick de los bucles a lo largo de un periodo, para que
+            sus decisiones no coincidan en el mismo instante.
+
+    Returns:
+        list: Resultado de cada bucle, en el mismo orden.
+    """
+    n = len(bucles)
+    return await asyncio.gather(*(
+        bucle.ejecutar(ticks, duracion, bucle.periodo * i / n if escalonar else 0.0) for i, bucle in enumerate(bucles)
+    ))
@@ -0,0 +1,29 @@
+'''
+ Configuración de los controladores
+ Los controladores guardan sus constantes de ajuste en una configuración
+ inmutable (`self.config`) y su estado en `__slots__`. Este decorador expone
+ además cada constante como atributo de solo lectura del controlador
+ (`controlador.STOP_DISTANCE`), como cuando eran atributos de la instancia.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from operator import attrgetter
+
+
+def constantes_de_solo_lectura(clase):
+    """
+    Añade a `clase` una propiedad de solo lectura por cada nombre de `clase.CONSTANTES_AJUSTE`
+    que no sea parte de su estado (`__slots__`), resuelta como `self.config.<nombre>`.
+
+    Detalles:
+    - Se usan propiedades y no `__getattr__`: definir `__getattr__` en la clase impide que el
+    intérprete especialice el acceso a los demás atributos y ralentiza todo `tomarDecision`.
+    - Asignar una constante en la instancia lanza `AttributeError`; para cambiarla se crea otra
+    configuración (`dataclasses.replace(controlador.config, ...)`) o se indica en el constructor.
+    """
+    for nombre in clase.CONSTANTES_AJUSTE:
+        if nombre not in clase.__slots__:
+            setattr(clase, nombre, property(attrgetter("config." + nombre), doc=f"Constante de ajuste `config.{nombre}`."))
+    return clase
@@ -0,0 +1,18 @@
+'''
+ Decisión de un controlador
+ Resultado de tomarDecision: una tupla con nombre, así que el lanzador puede
+ seguir desempaquetándola como (V, W) sin crear ningún objeto adicional.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from typing import NamedTuple
+
+
+class Decision(NamedTuple):
+    """
+    Velocidades que un controlador ordena al robot en un tick.
+    """
+    velocidad: float                                  # Velocidad lineal (m/s)
+    velocidad_angular: float                          # Velocidad angular (rad/s)
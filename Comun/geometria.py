@@ -0,0 +1,143 @@
+'''
+ Núcleo de geometría 2-D
+ Operaciones que usan ambos controladores para construir las trayectorias de los
+ segmentos triangulares. Trabajan con floats de Python (puntos como tuplas
+ (x, y)) en forma cerrada, sin crear arrays intermedios; solo la evaluación de
+ las curvas de Bézier escribe en un buffer de NumPy preasignado.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+def altura_relativa(A, B, C):
+    """
+    Altura del punto C sobre la recta AB dividida por (longitud de AB + 1).
+
+    Es el término que ambos controladores usan para calcular el offset de los puntos de control.
+    """
+    ax, ay = A
+    bx, by = B
+    longitud_base = math.hypot(bx - ax, by - ay)
+    altura = abs((by - ay) * C[0] - (bx - ax) * C[1] + bx * ay - by * ax) / longitud_base
+    return altura / (longitud_base + 1)
+
+
+def circuncentro(B, C, D, tolerancia=1e-12):
+    """
+    Circuncentro del triángulo BCD en forma cerrada.
+
+    Args:
+        B, C, D (tuple): Vértices del triángulo.
+        tolerancia (float): Área relativa por debajo de la cual los puntos se consideran alineados.
+
+    Returns:
+        tuple | None: Coordenadas (x, y) del circuncentro, o None si los puntos están (casi) alineados
+        y el circuncentro se va al infinito.
+    """
+    # Coordenadas relativas a D para reducir la cancelación numérica
+    bx, by = B[0] - D[0], B[1] - D[1]
+    cx, cy = C[0] - D[0], C[1] - D[1]
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+    det = 2.0 * (bx * cy - by * cx)
+    if abs(det) <= tolerancia * max(b2, c2, 1e-300):
+        return None
+    return D[0] + (cy * b2 - by * c2) / det, D[1] + (bx * c2 - cx * b2) / det
+
+
+def tangente_circunscrita(B, C, D):
+    """
+    Vector unitario perpendicular al radio de la circunferencia circunscrita a BCD en el punto D,
+    es decir, la perpendicular normalizada al vector (D - circuncentro).
+
+    Returns:
+        tuple: Componentes (x, y) del vector unitario; (0, 0) si los tres puntos coinciden.
+
+    Detalles:
+    - Se obtiene sin dividir por el determinante del triángulo: solo interviene su signo, así que
+    con puntos (casi) alineados el resultado es la dirección de la recta en vez de un error.
+    """
+    bx, by = B[0] - D[0], B[1] - D[1]
+    cx, cy = C[0] - D[0], C[1] - D[1]
+    b2 = bx * bx + by * by
+    c2 = cx * cx + cy * cy
+
+    # (circuncentro - D) * det = (cy*b2 - by*c2, bx*c2 - cx*b2); su perpendicular, cambiada de signo:
+    tx = bx * c2 - cx * b2
+    ty = by * c2 - cy * b2
+    norma = math.hypot(tx, ty)
+    if norma == 0.0:
+        return 0.0, 0.0
+    det = bx * cy - by * cx
+    if det == 0.0:
+        # Puntos alineados: de los dos límites posibles se toma el que apunta hacia B
+        signo = 1.0 if tx * bx + ty * by >= 0 else -1.0
+    else:
+        signo = 1.0 if det > 0 else -1.0
+    return signo * tx / norma, signo * ty / norma
+
+
+def normal_unitaria(A, B):
+    """
+    Vector unitario perpendicular a AB (AB girado 90° en sentido antihorario).
+    """
+    dx, dy = B[0] - A[0], B[1] - A[1]
+    norma = math.hypot(dx, dy)
+    return -dy / norma, dx / norma
+
+
+def desplazar_perpendicular(P, A, B, distancia):
+    """
+    Desplaza el punto P una `distancia` en la dirección perpendicular a AB (ver `normal_unitaria`).
+    """
+    nx, ny = normal_unitaria(A, B)
+    return P[0] + distancia * nx, P[1] + distancia * ny
+
+
+def puntos_control(B, C, D, constante, offset):
+    """
+    Puntos de control de las dos curvas B -> C y C -> D.
+
+    Args:
+        B, C, D (tuple): Puntos clave de la trayectoria.
+        constante (float): Fracción de cada tramo que avanza el punto de control.
+        offset (float): Desplazamiento del punto de control perpendicular a su tramo.
+
+    Returns:
+        tuple: CP1 = B + constante * BC + offset * n(BC) y CP2 = C + constante * CD + offset * n(CD),
+        como tuplas (x, y).
+    """
+    n1x, n1y = normal_unitaria(B, C)
+    n2x, n2y = normal_unitaria(C, D)
+    CP1 = (B[0] + constante * (C[0] - B[0]) + offset * n1x, B[1] + constante * (C[1] - B[1]) + offset * n1y)
+    CP2 = (C[0] + constante * (D[0] - C[0]) + offset * n2x, C[1] + constante * (D[1] - C[1]) + offset * n2y)
+    return CP1, CP2
+
+
+@lru_cache(maxsize=None)
+def matriz_bernstein(n_puntos):
+    """
+    Matriz (n_puntos, 4) de la base de Bernstein cúbica evaluada en `np.linspace(0, 1, n_puntos)`.
+
+    Multiplicada por los cuatro puntos de control (4, 2) devuelve de una vez todos los puntos
+    de la curva de Bézier. Se calcula una sola vez por cada número de puntos.
+    """
+    t = np.linspace(0, 1, n_puntos)
+    matriz = np.column_stack(((1 - t)**3, 3 * (1 - t)**2 * t, 3 * (1 - t) * t**2, t**3))
+    matriz.flags.writeable = False
+    return matriz
+
+
+def bezier_cubica(P0, P1, P2, P3, out):
+    """
+    Escribe en `out` (array (n, 2) preasignado) los n puntos equiespaciados en t de la curva de
+    Bézier cúbica con puntos de control P0, P1, P2 y P3.
+    """
+    np.matmul(matriz_bernstein(len(out)), np.array((P0, P1, P2, P3), dtype=np.float64), out=out)
+    return out
@@ -0,0 +1,106 @@
+'''
+ Histogramas de duraciones
+ Histograma con cubetas logarítmicas reservadas de antemano para registrar
+ latencias en nanosegundos sin reservar memoria en el bucle de control: cada
+ registro es una búsqueda binaria y un incremento. Los percentiles se estiman a
+ partir de las cubetas, con un error relativo acotado por su anchura.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from bisect import bisect_left
+
+import numpy as np
+
+
+class Histograma:
+    """
+    Histograma de duraciones (ns) con cubetas de anchura logarítmica.
+
+    La cubeta `i` cuenta los valores en `(limites[i - 1], limites[i]]`; la primera recoge también
+    los menores que `minimo_ns` y la última los mayores que `maximo_ns`.
+    """
+
+    __slots__ = ("limites", "cuentas", "total", "suma", "minimo", "maximo")
+
+    def __init__(self, minimo_ns: float = 100.0, maximo_ns: float = 1e9, cubetas_por_decada: int = 20) -> None:
+        """
+        Args:
+            minimo_ns (float): Límite superior de la primera cubeta.
+            maximo_ns (float): Límite superior de la última cubeta antes del desbordamiento.
+            cubetas_por_decada (int): Resolución; con 20, cada cubeta abarca un 12 % más que la anterior.
+        """
+        decadas = np.log10(maximo_ns / minimo_ns)
+        self.limites: list = np.geomspace(minimo_ns, maximo_ns, int(round(decadas * cubetas_por_decada)) + 1).tolist()
+        self.cuentas: list = [0] * (len(self.limites) + 1)  # La última cubeta recoge el desbordamiento
+        self.total: int = 0                           # Valores registrados
+        self.suma: float = 0.0                        # Suma de los valores (para la media)
+        self.minimo: float = float("inf")             # Valores extremos exactos
+        self.maximo: float = 0.0
+
+    def registrar(self, valor):
+        """
+        Añade una duración en nanosegundos.
+        """
+        self.cuentas[bisect_left(self.limites, valor)] += 1
+        self.total += 1
+        self.suma += valor
+        if valor < self.minimo:
+            self.minimo = valor
+        if valor > self.maximo:
+            self.maximo = valor
+
+    def combinar(self, otro):
+        """
+        Suma a este histograma los valores de `otro`, que debe tener las mismas cubetas.
+
+        Raises:
+            ValueError: Si las cubetas de los dos histogramas no coinciden.
+        """
+        if otro.limites != self.limites:
+            raise ValueError("Solo se pueden combinar histogramas con las mismas cubetas")
+        self.cuentas = [a + b for a, b in zip(self.cuentas, otro.cuentas)]
+        self.total += otro.total
+        self.suma += otro.suma
+        self.minimo = min(self.minimo, otro.minimo)
+        self.maximo = max(self.maximo, otro.maximo)
+
+    def vaciar(self):
+        self.cuentas = [0] * len(self.cuentas)
+        self.total, self.suma = 0, 0.0
+        self.minimo, self.maximo = float("inf"), 0.0
+
+    def percentil(self, p):
+        """
+        Estima el percentil `p` (0-100) como el límite superior de la cubeta que lo contiene,
+        acotado por los valores extremos registrados.
+
+        Returns:
+            float: Percentil en nanosegundos (0 si el histograma está vacío).
+        """
+        if not self.total:
+            return 0.0
+        objetivo = p / 100.0 * self.total
+        acumulado = 0
+        for indice, cuenta in enumerate(self.cuentas):
+            acumulado += cuenta
+            if acumulado >= objetivo and cuenta:
+                limite = self.limites[indice] if indice < len(self.limites) else self.maximo
+                return min(max(limite, self.minimo), self.maximo)
+        return self.maximo
+
+    def resumen(self):
+        """
+        Returns:
+            dict: Número de valores, media, mínimo, p50, p90, p99 y máximo (en ns).
+        """
+        return {
+            "n": self.total,
+            "media": self.suma / self.total if self.total else 0.0,
+            "minimo": self.minimo if self.total else 0.0,
+            "p50": self.percentil(50),
+            "p90": self.percentil(90),
+            "p99": self.percentil(99),
+            "maximo": self.maximo,
+        }
@@ -0,0 +1,78 @@
+'''
+ Muestreo adaptativo de trayectorias
+ Reparte los checkpoints de un tramo según su longitud y su curvatura en lugar
+ de usar un número fijo por tipo de segmento: las rectas largas reciben solo
+ los necesarios para no superar un espaciado máximo y las curvas cerradas los
+ suficientes para que la cuerda entre dos checkpoints consecutivos no se
+ separe de la curva más que una tolerancia.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+
+import numpy as np
+
+from geometria import bezier_cubica
+
+
+def divisiones_recta(A, B, espaciado):
+    """
+    Número de tramos iguales en que hay que dividir AB para que ninguno mida más de `espaciado`.
+
+    Args:
+        A, B (tuple): Extremos de la recta.
+        espaciado (float): Distancia máxima entre checkpoints consecutivos.
+
+    Returns:
+        int: Número de tramos (al menos 1); los checkpoints intermedios son uno menos.
+    """
+    return max(1, math.ceil(math.dist(A, B) / espaciado))
+
+
+def bezier_adaptativa(P0, P1, P2, P3, tolerancia, espaciado, densidad=64):
+    """
+    Puntos de la curva de Bézier cúbica (P0, P1, P2, P3) elegidos según su longitud y su curvatura.
+
+    Args:
+        P0, P1, P2, P3 (tuple): Puntos de control de la curva.
+        tolerancia (float): Distancia máxima entre la curva y la cuerda que une dos puntos consecutivos.
+        espaciado (float): Longitud de arco máxima entre dos puntos consecutivos.
+        densidad (int): Puntos de la muestra densa de la que se eligen los puntos.
+
+    Returns:
+        numpy.ndarray: Array (n, 2) de float64 con los puntos elegidos, incluidos P0 y P3.
+
+    Detalles:
+    - La curva se evalúa primero en `densidad` valores de t (`geometria.bezier_cubica`). Desde cada
+    punto elegido se avanza hasta el punto más lejano de la muestra cuya cuerda cumple los dos
+    límites, de modo que los tramos casi rectos quedan con pocos puntos y las curvas cerradas con más.
+    - Un robot que sigue las cuerdas se separa de la curva como mucho `tolerancia` (más el error de la
+    muestra densa, despreciable frente a ella).
+    """
+    densa = bezier_cubica(P0, P1, P2, P3, out=np.empty((densidad, 2), dtype=np.float64))
+    arco = np.concatenate(((0.0,), np.cumsum(np.hypot(*np.diff(densa, axis=0).T))))
+
+    # Candidatos posteriores a cada punto: solo los que están a menos de `espaciado` de arco
+    limites = np.searchsorted(arco, arco + espaciado, side="right")
+    anteriores = np.tri(densidad - 1, k=-1, dtype=bool)
+
+    elegidos = [0]
+    i = 0
+    while i < densidad - 1:
+        # Cuerdas desde el punto i hasta cada candidato k y separación de cada punto m < k a la cuerda k
+        cuerdas = densa[i + 1:max(limites[i], i + 2)] - densa[i]
+        n = len(cuerdas)
+        longitudes = np.maximum(np.hypot(cuerdas[:, 0], cuerdas[:, 1]), 1e-12)
+        separacion = np.abs(np.multiply.outer(cuerdas[:, 0], cuerdas[:, 1])
+                            - np.multiply.outer(cuerdas[:, 1], cuerdas[:, 0]))
+        separacion[~anteriores[:n, :n]] = 0.0
+        validos = separacion.max(axis=1) <= tolerancia * longitudes
+
+        # Se avanza hasta el último candidato antes del primero que se separa demasiado (al menos uno)
+        fallos = np.flatnonzero(~validos)
+        i += max(int(fallos[0]), 1) if len(fallos) else n
+        elegidos.append(i)
+
+    return densa[elegidos]
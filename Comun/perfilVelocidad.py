@@ -0,0 +1,93 @@
+'''
+ Perfil de velocidad de una ruta
+ Planifica, sobre la polilínea de toda la ruta compilada, la velocidad lineal
+ máxima en cada checkpoint que respeta la velocidad máxima del robot, su
+ velocidad angular máxima en las curvas y su aceleración, tanto al acelerar
+ como al frenar. El controlador la consulta después con un índice por tick.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+
+import numpy as np
+
+
+def curvatura_discreta(puntos, tolerancia=1e-9):
+    """
+    Curvatura de la polilínea en cada punto.
+
+    Args:
+        puntos (numpy.ndarray): Puntos de la polilínea, de forma (N, 2).
+        tolerancia (float): Distancia por debajo de la cual dos puntos consecutivos se consideran el mismo.
+
+    Returns:
+        numpy.ndarray: Curvatura (1/m) de cada punto; 0 en los extremos.
+
+    Detalles:
+    - En cada punto es el ángulo que gira la polilínea dividido por la media de las dos aristas que
+    lo tocan, de modo que una esquina cerrada entre checkpoints próximos da una curvatura alta.
+    - Los puntos repetidos (p. ej. el fin de un segmento y el inicio del siguiente) se tratan como
+    uno solo y comparten su curvatura.
+    """
+    puntos = np.asarray(puntos, dtype=np.float64)
+    curvatura = np.zeros(len(puntos))
+    if len(puntos) < 3:
+        return curvatura
+
+    distintos = np.ones(len(puntos), dtype=bool)
+    distintos[1:] = np.hypot(*np.diff(puntos, axis=0).T) > tolerancia
+    unicos = puntos[distintos]
+    if len(unicos) < 3:
+        return curvatura
+
+    a = unicos[1:-1] - unicos[:-2]
+    b = unicos[2:] - unicos[1:-1]
+    giro = np.abs(np.arctan2(a[:, 0] * b[:, 1] - a[:, 1] * b[:, 0], a[:, 0] * b[:, 0] + a[:, 1] * b[:, 1]))
+    curvatura_unicos = np.zeros(len(unicos))
+    curvatura_unicos[1:-1] = giro / (0.5 * (np.hypot(*a.T) + np.hypot(*b.T)))
+    return curvatura_unicos[np.cumsum(distintos) - 1]
+
+
+def perfil_velocidad(puntos, v_max, a_max, w_max, v_inicial=0.0, v_final=0.0):
+    """
+    Velocidad lineal máxima en cada punto de la polilínea.
+
+    Args:
+        puntos (numpy.ndarray): Puntos de la polilínea, de forma (N, 2).
+        v_max (float): Velocidad lineal máxima (m/s).
+        a_max (float): Aceleración lineal máxima (m/s²), al acelerar y al frenar.
+        w_max (float): Velocidad angular máxima (rad/s).
+        v_inicial (float): Velocidad en el primer punto.
+        v_final (float): Velocidad en el último punto.
+
+    Returns:
+        numpy.ndarray: Velocidad (m/s) de cada punto.
+
+    Detalles:
+    - El límite de cada punto es `min(v_max, w_max / curvatura)`: a esa velocidad el robot puede
+    girar lo que gira la trayectoria sin superar `w_max`.
+    - Una pasada hacia delante limita lo que se puede acelerar desde el punto anterior
+    (`v² <= v_anterior² + 2·a_max·ds`) y otra hacia atrás lo que hay que frenar antes del siguiente,
+    así que el perfil es el más rápido que cumple los tres límites.
+    """
+    puntos = np.asarray(puntos, dtype=np.float64)
+    if len(puntos) == 0:
+        return np.empty(0)
+
+    curvatura = curvatura_discreta(puntos)
+    limite = np.full(len(puntos), float(v_max))
+    curva = curvatura > 0
+    limite[curva] = np.minimum(v_max, w_max / curvatura[curva])
+    limite[0] = min(limite[0], v_inicial)
+    limite[-1] = min(limite[-1], v_final)
+
+    # --- Pasadas hacia delante y hacia atrás sobre listas de floats ---
+    v = limite.tolist()
+    incremento = (2 * a_max * np.hypot(*np.diff(puntos, axis=0).T)).tolist()
+    for i in range(1, len(v)):
+        v[i] = min(v[i], math.sqrt(v[i - 1] * v[i - 1] + incremento[i - 1]))
+    for i in range(len(v) - 2, -1, -1):
+        v[i] = min(v[i], math.sqrt(v[i + 1] * v[i + 1] + incremento[i]))
+    return np.array(v)
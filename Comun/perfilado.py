@@ -0,0 +1,186 @@
+'''
+ Perfilado por etapas de tomarDecision
+ Mide con perf_counter_ns la duración de cada etapa de la decisión de un
+ controlador (las de su ETAPAS_PERFILADO) y la acumula en histogramas reservados
+ de antemano. El perfilado se activa cambiando la clase de la instancia por una
+ subclase con las etapas cronometradas, así que un controlador sin perfilar
+ ejecuta exactamente el mismo código que antes, sin ninguna comprobación.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import time
+
+from histograma import Histograma
+
+# Etapa que sirve de referencia para el porcentaje de tiempo de las demás
+ETAPA_TOTAL: str = "tomarDecision"
+
+
+def _cronometrar(funcion, histograma):
+    """
+    Envuelve `funcion` para que añada a `histograma` la duración (ns) de cada llamada.
+    """
+    registrar = histograma.registrar
+    reloj = time.perf_counter_ns
+
+    def cronometrada(*args, **kwargs):
+        inicio = reloj()
+        resultado = funcion(*args, **kwargs)
+        registrar(reloj() - inicio)
+        return resultado
+
+    return cronometrada
+
+
+class Perfilador:
+    """
+    Histogramas de duración de las etapas de `tomarDecision` de un controlador.
+
+    Las etapas son los nombres de `ETAPAS_PERFILADO` de la clase del controlador: un método
+    (`calcular_angulo`) o el método de un atributo (`superficie.evaluar`). Las etapas pueden
+    anidarse (p. ej. `obtener_trayectoria` dentro de `obtener_coordenadas_objetivo`), así que sus
+    porcentajes no tienen por qué sumar 100.
+    """
+
+    __slots__ = ("controlador", "clase", "etapas", "histogramas", "atributos", "sobrecoste")
+
+    def __init__(self, controlador, etapas=None, **opciones_histograma) -> None:
+        """
+        Args:
+            controlador: ExpertSystem, FuzzySystem, ControlPredictivo o cualquier controlador con
+                `ETAPAS_PERFILADO`.
+            etapas (iterable, opcional): Etapas a medir. Por defecto, todas las del controlador.
+            **opciones_histograma: Opciones de cada `Histograma` (`minimo_ns`, `maximo_ns`, ...).
+        """
+        self.controlador = controlador
+        self.clase: type = type(controlador)          # Clase original, que se restaura al desactivar
+        self.etapas: tuple = (ETAPA_TOTAL, *(self.clase.ETAPAS_PERFILADO if etapas is None else etapas))
+        self.histogramas: dict = {etapa: Histograma(**opciones_histograma) for etapa in self.etapas}
+        self.atributos: dict = {}                     # Atributo -> objeto original mientras se perfila
+        self.sobrecoste: float = self.medir_sobrecoste()  # Coste (ns) de cronometrar una llamada
+
+    @property
+    def activo(self):
+        return type(self.controlador) is not self.clase
+
+    def activar(self):
+        """
+        Cambia la clase del controlador por una subclase con las etapas cronometradas.
+
+        Detalles:
+        - Los controladores usan `__slots__`, así que no se pueden sustituir los métodos en la
+        instancia; la subclase no añade atributos y comparte su disposición en memoria.
+        - Las etapas de un atributo (`superficie.evaluar`) se miden sustituyendo el atributo por
+        un envoltorio que delega en él; si el atributo es None, la etapa no se mide.
+        """
+        if self.activo:
+            return self
+        metodos = {"__slots__": ()}
+        for etapa in self.etapas:
+            atributo, _, metodo = etapa.rpartition(".")
+            if not atributo:
+                metodos[etapa] = _cronometrar(getattr(self.clase, etapa), self.histogramas[etapa])
+                continue
+            objeto = getattr(self.controlador, atributo)
+            if objeto is not None:
+                self.atributos[atributo] = objeto
+                setattr(self.controlador, atributo, _Envoltorio(objeto, metodo, self.histogramas[etapa]))
+
+        self.controlador.__class__ = type(self.clase.__name__, (self.clase,), metodos)
+        return self
+
+    def desactivar(self):
+        """
+        Restaura la clase y los atributos originales del controlador; los histogramas se conservan.
+        """
+        if self.activo:
+            self.controlador.__class__ = self.clase
+            for atributo, objeto in self.atributos.items():
+                setattr(self.controlador, atributo, objeto)
+            self.atributos.clear()
+        return self
+
+    def __enter__(self):
+        return self.activar()
+
+    def __exit__(self, *excepcion):
+        self.desactivar()
+
+    def vaciar(self):
+        for histograma in self.histogramas.values():
+            histograma.vaciar()
+
+    @staticmethod
+    def medir_sobrecoste(repeticiones: int = 2000):
+        """
+        Tiempo (ns) que añade cronometrar una llamada: diferencia entre las medianas de llamar a
+        una función vacía con y sin cronometrar.
+        """
+        vacia = lambda: None
+        reloj = time.perf_counter_ns
+        medianas = []
+        for funcion in (vacia, _cronometrar(vacia, Histograma())):
+            tiempos = []
+            for _ in range(repeticiones):
+                inicio = reloj()
+                funcion()
+                tiempos.append(reloj() - inicio)
+            medianas.append(sorted(tiempos)[len(tiempos) // 2])
+        return float(max(medianas[1] - medianas[0], 0))
+
+    def informe(self):
+        """
+        Resumen de cada etapa medida.
+
+        Returns:
+            dict: Etapa -> tiempo total (ns), porcentaje del tiempo de `tomarDecision` y
+            resumen del histograma (llamadas `n`, media, p50, p90, p99, máximo, en ns). Solo incluye las etapas
+            que se han llamado.
+        """
+        total = self.histogramas[ETAPA_TOTAL].suma
+        informe = {}
+        for etapa, histograma in self.histogramas.items():
+            if histograma.total:
+                informe[etapa] = {
+                    "total": histograma.suma,
+                    "porcentaje": 100.0 * histograma.suma / total if total else 0.0,
+                    **histograma.resumen(),
+                }
+        return informe
+
+    def texto(self):
+        """
+        Informe como tabla de texto, con los tiempos en microsegundos.
+        """
+        lineas = [f"{'etapa':34s}{'llamadas':>10s}{'total (ms)':>12s}{'%':>7s}{'media':>9s}{'p50':>9s}{'p99':>9s}{'máximo':>10s}"]
+        for etapa, datos in self.informe().items():
+            lineas.append(f"{etapa:34s}{datos['n']:>10d}{datos['total'] / 1e6:>12.2f}{datos['porcentaje']:>7.1f}"
+                          f"{datos['media'] / 1e3:>9.2f}{datos['p50'] / 1e3:>9.2f}{datos['p99'] / 1e3:>9.2f}"
+                          f"{datos['maximo'] / 1e3:>10.1f}")
+        lineas.append(f"(µs; cronometrar una etapa añade ~{self.sobrecoste:.0f} ns al tiempo de las etapas que la contienen)")
+        return "\n".join(lineas)
+
+
+class _Envoltorio:
+    """
+    Delegado de un atributo del controlador con uno de sus métodos cronometrado.
+    """
+
+    def __init__(self, objeto, metodo, histograma) -> None:
+        self.objeto = objeto
+        setattr(self, metodo, _cronometrar(getattr(objeto, metodo), histograma))
+
+    def __getattr__(self, nombre):
+        return getattr(self.objeto, nombre)
+
+
+def perfilar(controlador, etapas=None, **opciones_histograma):
+    """
+    Crea un `Perfilador` para `controlador` y lo activa.
+
+    Returns:
+        Perfilador: Perfilador activo; `desactivar()` devuelve el controlador a su clase original.
+    """
+    return Perfilador(controlador, etapas, **opciones_histograma).activar()
@@ -0,0 +1,52 @@
+'''
+ Avance de checkpoints por proyección
+ Proyecta la posición del robot sobre la polilínea de la trayectoria, buscando
+ solo en una ventana a partir del checkpoint actual, y devuelve el checkpoint
+ que queda justo por delante de la proyección.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+
+def checkpoint_adelantado(trayectoria, x, y, check_point, ventana):
+    """
+    Checkpoint siguiente a la proyección de (x, y) sobre la polilínea de `trayectoria`.
+
+    Args:
+        trayectoria (numpy.ndarray): Checkpoints de la trayectoria, de forma (K, 2).
+        x (float): Coordenada x del robot.
+        y (float): Coordenada y del robot.
+        check_point (int): Checkpoint objetivo actual.
+        ventana (int): Número de aristas en las que se busca, empezando por la que termina en `check_point`.
+
+    Returns:
+        int: Nuevo checkpoint objetivo, nunca anterior a `check_point` ni posterior al último.
+
+    Detalles:
+    - La arista i une los checkpoints i e i + 1. Se elige la arista más cercana al robot dentro de
+    la ventana y se devuelve su extremo final, que es el primer checkpoint por delante del robot.
+    - Como la ventana empieza en el checkpoint actual y este nunca retrocede, el coste por tick es
+    constante: no depende de cuántos checkpoints tenga la trayectoria.
+    """
+    ultimo = len(trayectoria) - 1
+    primera = max(check_point - 1, 0)
+    final = min(primera + ventana, ultimo)
+    if final <= primera:
+        return check_point
+
+    puntos = trayectoria[primera:final + 1].tolist()
+    mejor_distancia = float("inf")
+    mejor_arista = primera
+    for i in range(final - primera):
+        (ax, ay), (bx, by) = puntos[i], puntos[i + 1]
+        dx, dy = bx - ax, by - ay
+        longitud = dx * dx + dy * dy
+        t = ((x - ax) * dx + (y - ay) * dy) / longitud if longitud > 0 else 0.0
+        t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+        ex, ey = ax + t * dx - x, ay + t * dy - y
+        distancia = ex * ex + ey * ey
+        if distancia < mejor_distancia:
+            mejor_distancia, mejor_arista = distancia, primera + i
+
+    return max(check_point, min(mejor_arista + 1, ultimo))
@@ -0,0 +1,133 @@
+'''
+ Ruta compilada
+ Trayectorias de todos los segmentos de una ruta, generadas una sola vez y
+ guardadas en un único array contiguo con el desplazamiento de cada segmento.
+ Puede persistirse en disco para reutilizarla en ejecuciones posteriores; los
+ ficheros se mapean en memoria al cargarlos, así que varios procesos que usan la
+ misma ruta comparten sus páginas en lugar de copiarla cada uno.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import hashlib
+import os
+import shutil
+
+import numpy as np
+
+VERSION_FORMATO: int = 2                              # Cambia si cambia el contenido de los ficheros de caché
+
+
+class RutaCompilada:
+    """
+    Trayectorias precalculadas de una ruta.
+
+    Los puntos del segmento i son `puntos[offsets[i]:offsets[i + 1]]` y su tipo (1 lineal,
+    2 triangular) es `tipos[i]`.
+    """
+
+    def __init__(self, tipos, puntos, offsets) -> None:
+        self.tipos: np.ndarray = np.asarray(tipos, dtype=np.int64)
+        self.puntos: np.ndarray = np.asarray(puntos, dtype=np.float64)
+        self.offsets: np.ndarray = np.asarray(offsets, dtype=np.int64)
+        self.longitudes: np.ndarray = np.diff(self.offsets)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def trayectoria(self, indice):
+        """
+        Devuelve (sin copiar) la trayectoria del segmento `indice`.
+        """
+        return self.puntos[self.offsets[indice]:self.offsets[indice + 1]]
+
+    @classmethod
+    def compilar(cls, objetivos, generar):
+        """
+        Genera la trayectoria de cada segmento de la ruta.
+
+        Args:
+            objetivos (iterable): Segmentos de la ruta.
+            generar (callable): Función `generar(indice, segmento)` que devuelve la trayectoria del segmento.
+
+        Returns:
+            RutaCompilada: Ruta con todas las trayectorias concatenadas.
+        """
+        tipos, trayectorias = [], []
+        for indice, segmento in enumerate(objetivos):
+            tipos.append(segmento.getType())
+            trayectorias.append(np.asarray(generar(indice, segmento), dtype=np.float64))
+
+        offsets = np.zeros(len(trayectorias) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(t) for t in trayectorias])
+        puntos = np.concatenate(trayectorias) if trayectorias else np.empty((0, 2))
+        return cls(tipos, puntos, offsets)
+
+    @staticmethod
+    def clave(objetivos, parametros):
+        """
+        Huella de la ruta y de los parámetros de generación, usada como nombre del fichero de caché.
+
+        Args:
+            objetivos (iterable): Segmentos de la ruta.
+            parametros (dict): Constantes del controlador que intervienen en la generación.
+        """
+        huella = hashlib.sha1(f"v{VERSION_FORMATO};{sorted(parametros.items())!r}".encode())
+        for segmento in objetivos:
+            medio = segmento.getMedio() if segmento.getType() != 1 else (0.0, 0.0)
+            coordenadas = (segmento.getType(), *segmento.getInicio(), *medio, *segmento.getFin())
+            huella.update(np.asarray(coordenadas, dtype=np.float64).tobytes())
+        return huella.hexdigest()
+
+    def guardar(self, directorio):
+        """
+        Guarda la ruta en `directorio`, un `.npy` por array (`tipos`, `puntos`, `offsets`).
+
+        Detalles:
+        - Los arrays se escriben en un directorio temporal que después se renombra, así que otro
+        proceso nunca lee una ruta a medias. Si otro proceso ya la ha guardado, se conserva la suya.
+        """
+        temporal = f"{directorio}.{os.getpid()}.tmp"
+        os.makedirs(temporal, exist_ok=True)
+        for nombre in ("tipos", "puntos", "offsets"):
+            np.save(os.path.join(temporal, f"{nombre}.npy"), getattr(self, nombre))
+        try:
+            os.rename(temporal, directorio)
+        except OSError:
+            if not os.path.isdir(directorio):
+                raise
+            shutil.rmtree(temporal, ignore_errors=True)
+
+    @classmethod
+    def cargar(cls, directorio, mapear: bool = True):
+        """
+        Carga una ruta guardada con `guardar`.
+
+        Args:
+            directorio (str): Directorio de la ruta.
+            mapear (bool): Mapea los arrays en memoria (de solo lectura) en lugar de leerlos.
+
+        Detalles:
+        - Con `mapear`, solo se leen del disco las páginas que se consultan y los procesos que
+        cargan la misma ruta comparten esas páginas a través de la caché del sistema operativo.
+        """
+        modo = "r" if mapear else None
+        return cls(*(np.load(os.path.join(directorio, f"{nombre}.npy"), mmap_mode=modo)
+                     for nombre in ("tipos", "puntos", "offsets")))
+
+    @classmethod
+    def desde_cache(cls, directorio, objetivos, parametros, generar):
+        """
+        Carga (mapeada) la ruta de `directorio` si ya se compiló con los mismos segmentos y
+        parámetros; si no, la compila y la guarda allí.
+        """
+        objetivos = list(objetivos)
+        destino = os.path.join(directorio, f"ruta_{cls.clave(objetivos, parametros)}")
+        if os.path.isdir(destino):
+            return cls.cargar(destino)
+
+        ruta = cls.compilar(objetivos, generar)
+        os.makedirs(directorio, exist_ok=True)
+        ruta.guardar(destino)
+        return ruta
@@ -0,0 +1,32 @@
+'''
+ Ruta por defecto del lanzador
+ Los controladores toman por defecto la ruta `objectiveSet` del lanzador de la
+ práctica (P1Launcher). Importarlo desde el constructor tiene un coste oculto:
+ cuando el lanzador se ejecuta como script su módulo es `__main__`, así que
+ `import P1Launcher` lo vuelve a ejecutar entero (con sus importaciones y su
+ ruta) en cada proceso. Aquí se reutiliza el módulo ya cargado si lo hay.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import sys
+
+
+def objetivos_lanzador():
+    """
+    Devuelve `objectiveSet` del lanzador.
+
+    Returns:
+        list: Segmentos de la ruta del lanzador.
+
+    Detalles:
+    - Busca primero el módulo `P1Launcher` ya importado y después el script en ejecución
+    (`__main__`) si define `objectiveSet`; solo si no está en ninguno importa `P1Launcher`.
+    """
+    for nombre in ("P1Launcher", "__main__"):
+        modulo = sys.modules.get(nombre)
+        if modulo is not None and hasattr(modulo, "objectiveSet"):
+            return modulo.objectiveSet
+    from P1Launcher import objectiveSet  # Importación de los objetivos del trayecto
+    return objectiveSet
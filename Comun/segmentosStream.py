@@ -0,0 +1,241 @@
+'''
+ Ingesta de segmentos en flujo
+ Permite recorrer rutas que no caben en memoria: los segmentos se leen de un
+ iterador o generador (o de un fichero de segmentos mapeado en memoria) a medida
+ que el robot avanza, con una ventana de segmentos por delante del actual. Solo
+ se conservan los segmentos de la ventana y, opcionalmente, sus trayectorias, así
+ que la memoria no depende de la longitud de la ruta y el controlador arranca sin
+ tener que leerla entera.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+import os
+import shutil
+from collections import deque
+
+import numpy as np
+
+# Formato de cada segmento en un fichero de segmentos (.npy de registros)
+SEGMENTO_FICHERO = np.dtype([
+    ("tipo", "<i4"),                                  # 1 lineal, 2 triangular
+    ("inicio", "<f8", (2,)),
+    ("medio", "<f8", (2,)),                           # (0, 0) en los segmentos lineales
+    ("fin", "<f8", (2,)),
+])
+
+
+class SegmentoLeido:
+    """
+    Segmento leído de un fichero de segmentos, con la misma interfaz que `Segmento`.
+    """
+
+    __slots__ = ("tipo", "inicio", "medio", "fin")
+
+    def __init__(self, tipo, inicio, medio, fin) -> None:
+        self.tipo: int = tipo
+        self.inicio: tuple = inicio
+        self.medio: tuple = medio
+        self.fin: tuple = fin
+
+    def getType(self):
+        return self.tipo
+
+    def getInicio(self):
+        return self.inicio
+
+    def getMedio(self):
+        return self.medio
+
+    def getFin(self):
+        return self.fin
+
+
+class SegmentosMapeados:
+    """
+    Secuencia de solo lectura sobre un fichero de segmentos mapeado en memoria.
+
+    Solo se leen del disco las páginas de los segmentos consultados, así que abrir un fichero
+    de millones de segmentos es instantáneo y su número (`len`) se conoce desde el principio.
+    """
+
+    def __init__(self, fichero) -> None:
+        self.fichero: str = fichero
+        self.registros: np.memmap = np.load(fichero, mmap_mode="r")
+        if self.registros.dtype != SEGMENTO_FICHERO:
+            raise ValueError(f"{fichero!r} no es un fichero de segmentos")
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __getitem__(self, indice):
+        registro = self.registros[indice]
+        tipo = int(registro["tipo"])
+        medio = tuple(registro["medio"].tolist()) if tipo != 1 else None
+        return SegmentoLeido(tipo, tuple(registro["inicio"].tolist()), medio, tuple(registro["fin"].tolist()))
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+
+def guardar_segmentos(objetivos, fichero, bloque: int = 65536):
+    """
+    Guarda los segmentos de `objetivos` en un fichero de segmentos `.npy`.
+
+    Args:
+        objetivos (iterable): Segmentos (o generador de segmentos) de la ruta.
+        fichero (str): Fichero de destino.
+        bloque (int): Segmentos que se convierten y escriben de una vez.
+
+    Returns:
+        int: Número de segmentos guardados.
+
+    Detalles:
+    - Los segmentos se escriben por bloques en un fichero temporal y después se copian tras la
+    cabecera `.npy`, que necesita conocer su número; así un generador de millones de segmentos
+    se guarda sin tenerlo entero en memoria.
+    """
+    temporal = f"{fichero}.{os.getpid()}.tmp"
+    total = 0
+    registros = np.zeros(bloque, dtype=SEGMENTO_FICHERO)
+    try:
+        with open(temporal, "wb") as f:
+            n = 0
+            for segmento in objetivos:
+                tipo = segmento.getType()
+                registros[n] = (tipo, segmento.getInicio(), segmento.getMedio() if tipo != 1 else (0.0, 0.0), segmento.getFin())
+                n += 1
+                if n == bloque:
+                    f.write(registros.tobytes())
+                    total, n = total + n, 0
+            f.write(registros[:n].tobytes())
+            total += n
+
+        with open(fichero, "wb") as destino, open(temporal, "rb") as origen:
+            np.lib.format.write_array_header_1_0(destino, {"descr": np.lib.format.dtype_to_descr(SEGMENTO_FICHERO),
+                                                           "fortran_order": False, "shape": (total,)})
+            shutil.copyfileobj(origen, destino)
+    finally:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return total
+
+
+class FlujoSegmentos:
+    """
+    Ventana deslizante sobre una fuente de segmentos que se lee a medida que se necesita.
+
+    Guarda los segmentos desde el actual hasta `ventana` segmentos por delante; los anteriores
+    al actual se descartan. Mientras la fuente no se agota, `total` vale `math.inf`; al agotarse
+    pasa a ser el número de segmentos de la ruta. Gracias a la lectura por delante, el total ya
+    se conoce cuando el robot empieza el último segmento.
+    """
+
+    def __init__(self, fuente, ventana: int = 8) -> None:
+        """
+        Args:
+            fuente (iterable | str): Iterador, generador o secuencia de segmentos, o un fichero de
+                segmentos (ver `guardar_segmentos`), que se abre mapeado en memoria.
+            ventana (int): Segmentos que se leen por delante del actual (al menos 1).
+        """
+        if isinstance(fuente, (str, os.PathLike)):
+            fuente = SegmentosMapeados(fuente)
+        self.ventana: int = max(1, ventana)
+        self.total: float = len(fuente) if hasattr(fuente, "__len__") else math.inf # Segmentos de la ruta, si ya se conocen
+        self.base: int = 0                            # Índice del primer segmento guardado
+        self.leidos: int = 0                          # Segmentos leídos de la fuente
+        self.segmentos: deque = deque()               # Segmentos [base, leidos)
+        self._iterador = iter(fuente)
+
+    def _leer_hasta(self, indice):
+        """
+        Lee de la fuente hasta tener el segmento `indice` o agotarla.
+        """
+        while self.leidos <= indice and self.leidos < self.total:
+            try:
+                self.segmentos.append(next(self._iterador))
+            except StopIteration:
+                self.total = self.leidos
+                break
+            self.leidos += 1
+
+    def avanzar(self, indice):
+        """
+        Descarta los segmentos anteriores a `indice` y lee hasta `ventana` segmentos por delante.
+        """
+        while self.base < indice and self.segmentos:
+            self.segmentos.popleft()
+            self.base += 1
+        self._leer_hasta(indice + self.ventana)
+
+    def __getitem__(self, indice):
+        """
+        Segmento número `indice`, leyendo de la fuente si todavía no se había leído.
+
+        Raises:
+            IndexError: Si el segmento ya se descartó o la ruta tiene menos segmentos.
+        """
+        if indice < self.base:
+            raise IndexError(f"El segmento {indice} ya se descartó (ventana desde {self.base})")
+        self._leer_hasta(indice)
+        if indice >= self.leidos:
+            raise IndexError(f"La ruta solo tiene {self.leidos} segmentos")
+        return self.segmentos[indice - self.base]
+
+
+def abrir_flujo(objetivos, ventana):
+    """
+    Flujo de segmentos para la ruta `objetivos` de un controlador.
+
+    Returns:
+        FlujoSegmentos | None: None si `objetivos` es una lista o tupla (ruta completa en memoria);
+        el propio `objetivos` si ya es un flujo (p. ej. compartido con el lanzador); si no, un flujo
+        nuevo sobre el iterador, generador o fichero de segmentos.
+    """
+    if isinstance(objetivos, (list, tuple)):
+        return None
+    if isinstance(objetivos, FlujoSegmentos):
+        return objetivos
+    return FlujoSegmentos(objetivos, ventana)
+
+
+class RutaVentana:
+    """
+    Trayectorias de los segmentos de la ventana de un `FlujoSegmentos`, generadas por delante.
+
+    Equivale a `RutaCompilada` para rutas en flujo: al pedir la trayectoria de un segmento se
+    generan las de los segmentos de la ventana que aún no la tenían y se descartan las anteriores.
+    """
+
+    def __init__(self, flujo, generar) -> None:
+        """
+        Args:
+            flujo (FlujoSegmentos): Flujo de segmentos de la ruta.
+            generar (callable): Función `generar(indice, segmento)` que devuelve la trayectoria del segmento.
+        """
+        self.flujo: FlujoSegmentos = flujo
+        self.generar = generar
+        self.base: int = 0                            # Índice de la primera trayectoria guardada
+        self.trayectorias: deque = deque()            # Trayectorias [base, base + len)
+
+    def __len__(self):
+        return self.flujo.leidos
+
+    def trayectoria(self, indice):
+        """
+        Devuelve la trayectoria del segmento `indice`, generando antes las que falten en la ventana.
+        """
+        while self.base < indice and self.trayectorias:
+            self.trayectorias.popleft()
+            self.base += 1
+        if not self.trayectorias:
+            self.base = indice
+
+        self.flujo.avanzar(indice)
+        fin = min(indice + self.flujo.ventana, self.flujo.leidos)
+        for numero in range(self.base + len(self.trayectorias), fin):
+            self.trayectorias.append(np.asarray(self.generar(numero, self.flujo[numero]), dtype=np.float64))
+        return self.trayectorias[indice - self.base]
@@ -0,0 +1,152 @@
+'''
+ Seguimiento continuo de trayectorias
+ Leyes de seguimiento (pure pursuit y Stanley) sobre la polilínea de checkpoints
+ ya generada para un segmento. Al empezar cada segmento se precalculan las
+ aristas, su longitud acumulada, su orientación y el perfil de velocidad de la
+ polilínea; en cada tick solo se avanzan dos índices que nunca retroceden, así
+ que el coste por decisión es un número constante de operaciones con floats.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+
+import numpy as np
+
+from perfilVelocidad import perfil_velocidad
+
+# Leyes de seguimiento disponibles ("checkpoints" son las reglas originales de cada controlador)
+LEYES_SEGUIMIENTO: tuple = ("checkpoints", "pure_pursuit", "stanley")
+
+
+class SeguidorTrayectoria:
+    """
+    Proyección de la pose sobre la trayectoria del segmento actual y consultas a lo largo de ella.
+
+    La polilínea cargada es la trayectoria del segmento actual seguida de la del siguiente (si se
+    conoce), de modo que el punto anticipado y el perfil de velocidad no se detienen en la unión.
+    La proyección, en cambio, se limita a las aristas del segmento actual: así se sabe cuándo
+    termina y el controlador puede cambiar de segmento.
+    """
+
+    __slots__ = ("numero", "xs", "ys", "s", "ux", "uy", "longitud", "angulo", "velocidades",
+                 "ultima_arista", "longitud_segmento", "fin", "a_max", "arista", "arista_anticipada")
+
+    def __init__(self) -> None:
+        self.numero: int = -1                         # Segmento cargado (-1 si ninguno)
+        self.xs: list = []                            # Puntos de la polilínea, sin repetidos consecutivos
+        self.ys: list = []
+        self.s: list = []                             # Longitud acumulada hasta cada punto (m)
+        self.ux: list = []                            # Vector unitario de cada arista
+        self.uy: list = []
+        self.longitud: list = []                      # Longitud de cada arista (m)
+        self.angulo: list = []                        # Orientación de cada arista (grados)
+        self.velocidades: list = []                   # Perfil de velocidad en cada punto (m/s)
+        self.ultima_arista: int = 0                   # Última arista del segmento actual
+        self.longitud_segmento: float = 0.0           # Longitud acumulada al final del segmento actual
+        self.fin: tuple = (0.0, 0.0)                  # Último punto del segmento actual
+        self.a_max: float = 0.0                       # Aceleración del perfil de velocidad
+        self.arista: int = 0                          # Arista de la proyección (nunca retrocede)
+        self.arista_anticipada: int = 0               # Arista del último punto anticipado (nunca retrocede)
+
+    def cargar(self, numero, trayectoria, siguiente, v_max, a_max, w_max):
+        """
+        Prepara el seguimiento de un segmento.
+
+        Args:
+            numero (int): Número del segmento.
+            trayectoria (numpy.ndarray): Checkpoints del segmento, de forma (K, 2).
+            siguiente (numpy.ndarray | None): Checkpoints del segmento siguiente, o None si es el último.
+            v_max (float): Velocidad lineal máxima del perfil (m/s).
+            a_max (float): Aceleración lineal máxima del perfil (m/s²).
+            w_max (float): Velocidad angular máxima del perfil (rad/s).
+
+        Detalles:
+        - El perfil de velocidad (`perfil_velocidad`) se calcula sobre la polilínea cargada y acaba
+        en reposo al final del segmento siguiente, o del actual si es el último.
+        """
+        trayectoria = np.asarray(trayectoria, dtype=np.float64)
+        partes = [trayectoria] if siguiente is None else [trayectoria, np.asarray(siguiente, dtype=np.float64)]
+        puntos = np.concatenate(partes)
+        distintos = np.ones(len(puntos), dtype=bool)
+        distintos[1:] = np.hypot(*np.diff(puntos, axis=0).T) > 1e-9
+        ultimo_actual = int(np.count_nonzero(distintos[:len(trayectoria)])) - 1
+        puntos = puntos[distintos]
+        if len(puntos) < 2:
+            # Trayectoria de un solo punto: una arista nula hasta él mismo
+            puntos = np.vstack([puntos, puntos])
+
+        diferencias = np.diff(puntos, axis=0)
+        longitud = np.hypot(*diferencias.T)
+        longitud_segura = np.where(longitud > 0, longitud, 1.0)
+        self.numero = numero
+        self.xs, self.ys = puntos[:, 0].tolist(), puntos[:, 1].tolist()
+        self.s = np.concatenate([[0.0], np.cumsum(longitud)]).tolist()
+        self.ux, self.uy = (diferencias[:, 0] / longitud_segura).tolist(), (diferencias[:, 1] / longitud_segura).tolist()
+        self.longitud = longitud.tolist()
+        self.angulo = np.degrees(np.arctan2(diferencias[:, 1], diferencias[:, 0])).tolist()
+        self.velocidades = perfil_velocidad(puntos, v_max, a_max, w_max, v_inicial=v_max).tolist()
+        self.ultima_arista = max(ultimo_actual - 1, 0)
+        self.longitud_segmento = self.s[self.ultima_arista + 1]
+        self.fin = (self.xs[self.ultima_arista + 1], self.ys[self.ultima_arista + 1])
+        self.a_max = a_max
+        self.arista = 0
+        self.arista_anticipada = 0
+
+    def proyectar(self, x, y):
+        """
+        Proyecta (x, y) sobre las aristas del segmento actual.
+
+        Returns:
+            tuple: (longitud recorrida hasta la proyección, error transversal con signo: positivo
+            a la izquierda de la trayectoria).
+
+        Detalles:
+        - La arista solo avanza mientras el robot ha rebasado el inicio de la siguiente, así que el
+        coste total por segmento es lineal en sus aristas y constante por tick amortizado.
+        """
+        i = self.arista
+        xs, ys, ux, uy = self.xs, self.ys, self.ux, self.uy
+        while i < self.ultima_arista and (x - xs[i + 1]) * ux[i + 1] + (y - ys[i + 1]) * uy[i + 1] >= 0.0:
+            i += 1
+        self.arista = i
+
+        dx, dy = x - xs[i], y - ys[i]
+        t = dx * ux[i] + dy * uy[i]
+        t = 0.0 if t < 0.0 else self.longitud[i] if t > self.longitud[i] else t
+        return self.s[i] + t, ux[i] * dy - uy[i] * dx
+
+    def punto(self, s):
+        """
+        Punto de la polilínea a la longitud acumulada `s` (limitada a la polilínea cargada).
+
+        Las consultas deben hacerse con `s` no decreciente dentro de un segmento, como el punto
+        anticipado de pure pursuit.
+        """
+        j = max(self.arista_anticipada, self.arista)
+        ultima = len(self.longitud) - 1
+        while j < ultima and self.s[j + 1] < s:
+            j += 1
+        self.arista_anticipada = j
+
+        t = s - self.s[j]
+        t = 0.0 if t < 0.0 else self.longitud[j] if t > self.longitud[j] else t
+        return self.xs[j] + t * self.ux[j], self.ys[j] + t * self.uy[j]
+
+    def velocidad(self, s):
+        """
+        Velocidad máxima a la longitud `s` desde la que aún se puede frenar hasta la del perfil en
+        el final de la arista actual (`sqrt(v² + 2·a·d)`).
+        """
+        siguiente = self.arista + 1
+        v = self.velocidades[siguiente]
+        restante = self.s[siguiente] - s
+        return math.sqrt(v * v + 2.0 * self.a_max * max(restante, 0.0))
+
+    def rebasado_fin(self, x, y):
+        """
+        Indica si (x, y) ha rebasado el final del segmento actual (la perpendicular por su último punto).
+        """
+        i = self.ultima_arista
+        return self.arista == i and (x - self.fin[0]) * self.ux[i] + (y - self.fin[1]) * self.uy[i] >= 0.0
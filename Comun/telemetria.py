@@ -0,0 +1,146 @@
+'''
+ Telemetría de los controladores
+ Registro por tick (pose, objetivo, checkpoint, V, W, reversa, FRENAR) en un
+ buffer circular preasignado, volcable a fichero binario (.npy), columnar
+ (.npz) o de texto (.csv), opcionalmente en un hilo aparte.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+# Formato de cada registro del buffer (un tick de un controlador)
+REGISTRO_TICK = np.dtype([
+    ("tick", np.int64),                               # Número de tick desde que se creó la telemetría
+    ("tiempo", np.float64),                           # Instante del registro (time.perf_counter)
+    ("x", np.float64),                                # Pose del robot
+    ("y", np.float64),
+    ("angulo", np.float64),
+    ("x_objetivo", np.float64),                       # Checkpoint objetivo del tick
+    ("y_objetivo", np.float64),
+    ("segmento", np.int32),                           # segment_number tras la decisión
+    ("check_point", np.int32),                        # Checkpoint activo tras la decisión
+    ("V", np.float64),                                # Velocidades devueltas
+    ("W", np.float64),
+    ("reverse", np.bool_),
+    ("frenar", np.bool_),
+])
+
+
+def obtener_logger(nombre):
+    """
+    Logger de un controlador. Sin configuración, solo emite avisos y errores; los mensajes de
+    depuración (p. ej. los offsets de las curvas) se activan con `logging.getLogger(nombre).setLevel(logging.DEBUG)`.
+    """
+    return logging.getLogger(nombre)
+
+
+class Telemetria:
+    """
+    Buffer circular de registros `REGISTRO_TICK`.
+
+    El buffer se reserva una sola vez; al llenarse, los registros nuevos sobrescriben a los
+    más antiguos. Un controlador sin telemetría (`telemetria = None`) no paga ningún coste
+    salvo la comprobación de ese atributo.
+    """
+
+    def __init__(self, capacidad: int = 65536) -> None:
+        """
+        Args:
+            capacidad (int): Número máximo de registros que se conservan.
+        """
+        self.capacidad: int = capacidad
+        self.buffer: np.ndarray = np.zeros(capacidad, dtype=REGISTRO_TICK)
+        self.total: int = 0                           # Registros escritos desde el inicio (incluidos los sobrescritos)
+        self._volcados: list = []                     # Hilos de volcado asíncrono en curso
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def registrar(self, pose, objetivo, segmento, check_point, V, W, reverse, frenar):
+        """
+        Añade el registro de un tick.
+
+        Args:
+            pose (tuple): Pose del robot (x, y, ángulo, ...).
+            objetivo (tuple): Coordenadas (x, y) del checkpoint objetivo.
+            segmento (int): Número de segmento actual.
+            check_point (int): Índice del checkpoint actual.
+            V (float): Velocidad lineal devuelta.
+            W (float): Velocidad angular devuelta.
+            reverse (bool): Modo reversa.
+            frenar (bool | None): Estado de `FRENAR` (`None` se guarda como False).
+        """
+        self.buffer[self.total % self.capacidad] = (
+            self.total, time.perf_counter(), pose[0], pose[1], pose[2], objetivo[0], objetivo[1],
+            segmento, check_point, V, W, reverse, bool(frenar)
+        )
+        self.total += 1
+
+    def registros(self):
+        """
+        Devuelve una copia de los registros conservados, del más antiguo al más reciente.
+        """
+        if self.total <= self.capacidad:
+            return self.buffer[:self.total].copy()
+        inicio = self.total % self.capacidad
+        return np.concatenate((self.buffer[inicio:], self.buffer[:inicio]))
+
+    def vaciar(self):
+        self.total = 0
+
+    @staticmethod
+    def escribir(registros, fichero):
+        """
+        Escribe `registros` según la extensión de `fichero`:
+        - `.npy`: array estructurado binario (un registro por fila).
+        - `.npz`: formato columnar, un array por campo.
+        - `.csv`: texto con cabecera, un registro por línea.
+
+        Raises:
+            ValueError: Si la extensión no es ninguna de las anteriores.
+        """
+        extension = os.path.splitext(fichero)[1].lower()
+        if extension == ".npy":
+            np.save(fichero, registros)
+        elif extension == ".npz":
+            np.savez(fichero, **{campo: registros[campo] for campo in REGISTRO_TICK.names})
+        elif extension == ".csv":
+            formatos = ["%d" if REGISTRO_TICK[campo].kind in "iub" else "%.9g" for campo in REGISTRO_TICK.names]
+            columnas = np.column_stack([registros[campo].astype(np.float64) for campo in REGISTRO_TICK.names])
+            np.savetxt(fichero, columnas, fmt=formatos, delimiter=",", header=",".join(REGISTRO_TICK.names), comments="")
+        else:
+            raise ValueError(f"Formato de volcado no soportado: {extension!r} (use .npy, .npz o .csv)")
+
+    def volcar(self, fichero):
+        """
+        Escribe los registros conservados en `fichero` (ver `escribir`).
+        """
+        self.escribir(self.registros(), fichero)
+
+    def volcar_async(self, fichero):
+        """
+        Copia los registros conservados y los escribe en `fichero` desde un hilo aparte, de modo
+        que el bucle de control solo paga la copia del buffer.
+
+        Returns:
+            threading.Thread: Hilo de escritura (ya iniciado).
+        """
+        hilo = threading.Thread(target=self.escribir, args=(self.registros(), fichero), daemon=True)
+        hilo.start()
+        self._volcados = [h for h in self._volcados if h.is_alive()] + [hilo]
+        return hilo
+
+    def esperar_volcados(self):
+        """
+        Espera a que terminen todos los volcados asíncronos pendientes.
+        """
+        for hilo in self._volcados:
+            hilo.join()
+        self._volcados = []
@@ -0,0 +1,243 @@
+'''
+ Trazas de grabación y reproducción de los controladores
+ Graba cada llamada a tomarDecision (pose de entrada, (V, W) devueltas y estado
+ interno tras la decisión) en un fichero binario de registros de tamaño fijo,
+ escrito a través de un mapa de memoria, y reproduce una traza sobre un
+ controlador nuevo sin simulador, comprobando que toma las mismas decisiones.
+
+ Formato del fichero:
+     cabecera (64 bytes): MAGIA_TRAZA, versión (uint32), número de segmentos de la
+                          ruta (uint32) y número de registros (uint64)
+     registros:           array de REGISTRO_TRAZA, uno por tick
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+import time
+
+import numpy as np
+
+# Identificación del formato
+MAGIA_TRAZA: bytes = b"TRAZACTL"
+VERSION_TRAZA: int = 1
+CABECERA_TRAZA = np.dtype([
+    ("magia", "S8"),
+    ("version", "<u4"),
+    ("segmentos", "<u4"),                             # Segmentos de la ruta grabada
+    ("registros", "<u8"),                             # Registros válidos tras la cabecera
+])
+TAMANO_CABECERA: int = 64                             # La cabecera se rellena hasta 64 bytes
+
+# Formato de cada registro (un tick de un controlador), sin relleno y en little-endian
+REGISTRO_TRAZA = np.dtype([
+    ("objetivo", "<i4"),                              # Índice del segmento pasado a setObjetivo
+    ("x", "<f8"),                                     # Pose de entrada (x, y, ángulo, v, w)
+    ("y", "<f8"),
+    ("angulo", "<f8"),
+    ("v", "<f8"),
+    ("w", "<f8"),
+    ("V", "<f8"),                                     # Velocidades devueltas
+    ("W", "<f8"),
+    ("segmento", "<i4"),                              # segment_number tras la decisión
+    ("check_point_segmento", "<i4"),                  # Checkpoints tras la decisión
+    ("check_point_triangulo", "<i4"),
+    ("reverse", "u1"),
+    ("frenar", "i1"),                                 # FRENAR: 0/1, o -1 si es None
+    ("alcanzado", "u1"),                              # objetivoAlcanzado tras la decisión
+])
+
+# Campos de estado que se comparan al reproducir
+CAMPOS_ESTADO: tuple = ("segmento", "check_point_segmento", "check_point_triangulo", "reverse", "frenar", "alcanzado")
+
+
+class GrabadorTraza:
+    """
+    Graba los ticks de un controlador en un fichero de traza.
+
+    El fichero se reserva por bloques y se escribe a través de un `numpy.memmap`, así que grabar
+    un tick es copiar un registro en memoria; el sistema operativo vuelca las páginas a disco.
+    Al llenarse, el fichero se amplía al doble y se vuelve a mapear. `cerrar` lo recorta a los
+    registros escritos y actualiza la cabecera.
+    """
+
+    def __init__(self, fichero, segmentos: int, capacidad: int = 65536) -> None:
+        """
+        Args:
+            fichero (str): Ruta del fichero de traza; se sobrescribe si existe.
+            segmentos (int): Número de segmentos de la ruta (se comprueba al reproducir).
+            capacidad (int): Registros reservados inicialmente.
+        """
+        self.fichero: str = fichero
+        self.segmentos: int = segmentos
+        self.total: int = 0                           # Registros escritos
+        self.capacidad: int = 0                       # Registros que caben en el mapa actual
+        self.registros: np.memmap = None
+
+        # --- Seguimiento de setObjetivo: el índice cambia cada vez que cambia el segmento objetivo ---
+        self._segmento_objetivo: object = None
+        self._indice_objetivo: int = -1
+
+        with open(fichero, "wb") as f:
+            f.write(self._cabecera(0))
+        self._mapear(capacidad)
+
+    def _cabecera(self, registros):
+        cabecera = np.zeros(1, dtype=CABECERA_TRAZA)
+        cabecera[0] = (MAGIA_TRAZA, VERSION_TRAZA, self.segmentos, registros)
+        return cabecera.tobytes().ljust(TAMANO_CABECERA, b"\0")
+
+    def _mapear(self, capacidad):
+        """
+        Amplía el fichero hasta `capacidad` registros y lo vuelve a mapear.
+        """
+        if self.registros is not None:
+            self.registros.flush()
+            self.registros = None
+        with open(self.fichero, "r+b") as f:
+            f.truncate(TAMANO_CABECERA + capacidad * REGISTRO_TRAZA.itemsize)
+        self.registros = np.memmap(self.fichero, dtype=REGISTRO_TRAZA, mode="r+", offset=TAMANO_CABECERA,
+                                   shape=(capacidad,))
+        self.capacidad = capacidad
+
+    def registrar(self, controlador, pose, V, W):
+        """
+        Añade el registro de un tick, leyendo el estado del controlador tras la decisión.
+
+        Args:
+            controlador: ExpertSystem o FuzzySystem que acaba de decidir.
+            pose (tuple): Pose de entrada (x, y, ángulo, v, w).
+            V (float): Velocidad lineal devuelta.
+            W (float): Velocidad angular devuelta.
+        """
+        if controlador.segmentoObjetivo is not self._segmento_objetivo:
+            self._segmento_objetivo = controlador.segmentoObjetivo
+            self._indice_objetivo += 1
+        if self.total == self.capacidad:
+            self._mapear(2 * self.capacidad)
+
+        frenar = controlador.FRENAR
+        self.registros[self.total] = (
+            self._indice_objetivo, pose[0], pose[1], pose[2], pose[3], pose[4], V, W,
+            controlador.segment_number, controlador.check_point_segmento, controlador.check_point_triangulo,
+            controlador.reverse, -1 if frenar is None else frenar, controlador.objetivoAlcanzado
+        )
+        self.total += 1
+
+    def cerrar(self):
+        """
+        Vuelca los registros, recorta el fichero a los registros escritos y escribe la cabecera.
+        """
+        if self.registros is None:
+            return
+        self.registros.flush()
+        self.registros = None
+        with open(self.fichero, "r+b") as f:
+            f.write(self._cabecera(self.total))
+            f.truncate(TAMANO_CABECERA + self.total * REGISTRO_TRAZA.itemsize)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+
+def leer_traza(fichero):
+    """
+    Abre una traza en modo solo lectura, sin cargarla en memoria.
+
+    Returns:
+        tuple: (segmentos de la ruta, registros), con los registros como `numpy.memmap` de `REGISTRO_TRAZA`.
+
+    Raises:
+        ValueError: Si el fichero no es una traza o es de otra versión.
+    """
+    cabecera = np.fromfile(fichero, dtype=CABECERA_TRAZA, count=1)
+    if len(cabecera) == 0 or cabecera[0]["magia"] != MAGIA_TRAZA:
+        raise ValueError(f"{fichero!r} no es un fichero de traza")
+    if cabecera[0]["version"] != VERSION_TRAZA:
+        raise ValueError(f"Versión de traza {cabecera[0]['version']} no soportada (se espera {VERSION_TRAZA})")
+
+    total = int(cabecera[0]["registros"])
+    if total == 0:
+        return int(cabecera[0]["segmentos"]), np.zeros(0, dtype=REGISTRO_TRAZA)
+    registros = np.memmap(fichero, dtype=REGISTRO_TRAZA, mode="r", offset=TAMANO_CABECERA, shape=(total,))
+    return int(cabecera[0]["segmentos"]), registros
+
+
+def reproducir(controlador, registros, objetivos, tolerancia: float = 0.0, detener: bool = False):
+    """
+    Reproduce una traza sobre un controlador recién construido para la misma ruta.
+
+    Args:
+        controlador: ExpertSystem o FuzzySystem construido con `objetivos`.
+        registros (numpy.ndarray): Registros `REGISTRO_TRAZA` (ver `leer_traza`).
+        objetivos (list): Segmentos de la ruta grabada.
+        tolerancia (float): Diferencia máxima admitida en V y W; 0 exige las mismas decisiones.
+        detener (bool): Detiene la reproducción en la primera divergencia.
+
+    Returns:
+        dict: Resultado de la reproducción:
+        - `ticks`: Ticks reproducidos.
+        - `divergencias`: Ticks cuya decisión o estado difiere de la traza.
+        - `primera_divergencia`: Índice del primer tick divergente (None si no hay).
+        - `error_V`, `error_W`: Diferencia máxima en las velocidades.
+        - `V`, `W`: Velocidades obtenidas en cada tick reproducido.
+        - `tiempo_real`, `ticks_por_segundo`: Coste real de las decisiones reproducidas.
+
+    Detalles:
+    - Se llama a `setObjetivo` cada vez que cambia el índice de objetivo de la traza, igual que
+    hizo el lanzador durante la grabación, y se pasa a `tomarDecision` la pose grabada, así que
+    la reproducción no depende de que el controlador siga tomando las mismas decisiones.
+    - El estado comparado es el de `CAMPOS_ESTADO` (segmento, checkpoints, reversa, FRENAR y
+    objetivo alcanzado).
+    """
+    n = len(registros)
+    objetivo = registros["objetivo"].tolist()
+    poses = np.column_stack([registros[campo] for campo in ("x", "y", "angulo", "v", "w")]).tolist()
+    V = np.empty(n, dtype=np.float64)
+    W = np.empty(n, dtype=np.float64)
+    estado = np.empty(n, dtype=np.dtype([(campo, REGISTRO_TRAZA[campo]) for campo in CAMPOS_ESTADO]))
+
+    indice = -1
+    inicio = time.perf_counter()
+    for tick in range(n):
+        if objetivo[tick] != indice:
+            indice = objetivo[tick]
+            controlador.setObjetivo(objetivos[indice])
+        V[tick], W[tick] = controlador.tomarDecision(tuple(poses[tick]))
+        frenar = controlador.FRENAR
+        estado[tick] = (controlador.segment_number, controlador.check_point_segmento,
+                        controlador.check_point_triangulo, controlador.reverse,
+                        -1 if frenar is None else frenar, controlador.objetivoAlcanzado)
+        if detener and not _coincide(registros[tick], V[tick], W[tick], estado[tick], tolerancia):
+            n = tick + 1
+            break
+    tiempo_real = time.perf_counter() - inicio
+
+    V, W, estado = V[:n], W[:n], estado[:n]
+    error_V = np.abs(V - registros["V"][:n])
+    error_W = np.abs(W - registros["W"][:n])
+    divergentes = (error_V > tolerancia) | (error_W > tolerancia)
+    for campo in CAMPOS_ESTADO:
+        divergentes |= estado[campo] != registros[campo][:n]
+    primera = np.flatnonzero(divergentes)
+
+    return {
+        "ticks": n,
+        "divergencias": int(np.count_nonzero(divergentes)),
+        "primera_divergencia": int(primera[0]) if len(primera) else None,
+        "error_V": float(error_V.max()) if n else 0.0,
+        "error_W": float(error_W.max()) if n else 0.0,
+        "V": V,
+        "W": W,
+        "tiempo_real": tiempo_real,
+        "ticks_por_segundo": n / tiempo_real if tiempo_real > 0 else math.inf,
+    }
+
+
+def _coincide(registro, V, W, estado, tolerancia):
+    return (abs(V - registro["V"]) <= tolerancia and abs(W - registro["W"]) <= tolerancia
+            and all(estado[campo] == registro[campo] for campo in CAMPOS_ESTADO))
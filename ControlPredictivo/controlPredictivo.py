@@ -0,0 +1,439 @@
+'''
+ Control predictivo de horizonte corto para el guiado de un robot
+ Tercer controlador, junto a ExpertSystem y FuzzySystem. En cada tick prueba un
+ lote de pares (V, W) candidatos: los simula a la vez durante un horizonte corto
+ con un modelo de uniciclo vectorizado en NumPy, que respeta VMAX/WMAX/VACC/WACC,
+ puntúa cada despliegue sobre la trayectoria precalculada de checkpoints y aplica
+ el mejor. El tamaño del lote es fijo o, si se pide, se ajusta a un presupuesto
+ de latencia por tick medido en la máquina.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
+
+import numpy as np
+
+from segmento import *
+from robot import WACC, WMAX, VACC, VMAX
+from expertSystem import ConfiguracionExperto, ExpertSystem
+from rutaCompilada import RutaCompilada
+from rutaLanzador import objetivos_lanzador
+from seguimiento import SeguidorTrayectoria
+from telemetria import Telemetria, obtener_logger
+from trazas import GrabadorTraza
+from decision import Decision
+from configuracion import constantes_de_solo_lectura
+
+logger = obtener_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfiguracionPredictiva:
+    """
+    Constantes de ajuste del ControlPredictivo.
+
+    Es inmutable, así que una misma configuración puede compartirse entre todos los controladores
+    que la usen (p. ej. `ControlPredictivo(configuracion=config)` para cada robot de una flota).
+    """
+
+    # --- Trayecto ---
+    DISTANCIA_LLEGADA: float = 0.5                    # Distancia al final del segmento para darlo por recorrido
+
+    # --- Horizonte ---
+    HORIZONTE: float = 2.0                            # Tiempo simulado por cada candidato (s)
+    PASOS_HORIZONTE: int = 10                         # Pasos de integración del horizonte
+    ARISTAS_HORIZONTE: int = 24                       # Aristas de la trayectoria, desde la proyección, con las que se puntúa
+
+    # --- Lote de candidatos ---
+    TAMANO_LOTE: int = 32                             # Pares (V, W) por tick; 0 lo calibra con PRESUPUESTO_LATENCIA_US
+    PRESUPUESTO_LATENCIA_US: float = 500.0            # Latencia máxima de tomarDecision al calibrar el lote (µs)
+
+    # --- Pesos de la puntuación ---
+    PESO_PROGRESO: float = 1.0                        # Por metro recorrido a lo largo de la trayectoria
+    PESO_ERROR: float = 4.0                           # Por m²·s de error transversal
+    PESO_EXCESO_VELOCIDAD: float = 4.0                # Por (m/s)²·s por encima del perfil de velocidad
+    PESO_ORIENTACION: float = 2.0                     # Por (1 - cos) del error de orientación al final del horizonte
+    PESO_SUAVIDAD: float = 0.1                        # Por (rad/s)² de cambio de W respecto al tick anterior
+    PESO_CONTINUIDAD: float = 0.5                     # Penaliza proyectar lejos de la longitud recorrida esperada (1/m²)
+    PESO_LLEGADA: float = 20.0                        # Por m² que se aleja del final del segmento más allá de TOLERANCIA_LLEGADA
+    TOLERANCIA_LLEGADA: float = 0.25                  # Distancia al final del segmento con la que debe pasar un candidato que lo alcanza (m)
+
+
+_CONFIGURACION_POR_DEFECTO = ConfiguracionPredictiva()
+
+
+def rejilla_candidatos(tamano_lote):
+    """
+    Pares (V, W) candidatos de un lote: una rejilla sobre [0, VMAX] x [-WMAX, WMAX].
+
+    Args:
+        tamano_lote (int): Número aproximado de candidatos.
+
+    Returns:
+        tuple: Arrays (V, W) con los candidatos, con un hueco más al final para el mejor par del
+        tick anterior.
+
+    Detalles:
+    - Hay unas dos velocidades angulares por cada lineal, en número impar para incluir W = 0.
+    - No hay velocidades negativas: el controlador no usa marcha atrás.
+    """
+    n_v = max(2, int(round(math.sqrt(tamano_lote / 2))))
+    n_w = max(3, tamano_lote // n_v)
+    n_w -= 1 - n_w % 2
+    V, W = np.meshgrid(np.linspace(0.0, VMAX, n_v), np.linspace(-WMAX, WMAX, n_w), indexing="ij")
+    return np.append(V.ravel(), 0.0), np.append(W.ravel(), 0.0)
+
+
+@lru_cache(maxsize=None)
+def calibrar_lote(config):
+    """
+    Mayor tamaño de lote (potencia de dos entre 16 y 4096) cuyo `tomarDecision` no supera
+    `PRESUPUESTO_LATENCIA_US`, medido en esta máquina.
+
+    Args:
+        config (ConfiguracionPredictiva): Configuración del controlador; se calibra una vez por configuración.
+
+    Returns:
+        int: Tamaño del lote.
+
+    Detalles:
+    - Se mide la mediana de la latencia sobre una ruta recta corta, con la ventana de
+    `ARISTAS_HORIZONTE` aristas llena, que es el caso más costoso.
+    - Si ni el lote más pequeño cabe en el presupuesto, se usa ese y se emite un aviso.
+    - El resultado depende de la máquina y de su carga, así que solo se calibra con
+    `TAMANO_LOTE=0`; el lote elegido se registra en el log y queda en `tamano_lote`.
+    """
+    longitud = 0.25 * (ConfiguracionExperto().LINE_CHECKPOINTS + 1)
+    objetivos = [Segmento((0.0, 0.0), (longitud, 0.0)), Segmento((longitud, 0.0), (2 * longitud, 0.0))]
+    pose = (0.5, 0.01, 0.0, 1.0, 0.0)
+
+    elegido = 16
+    for tamano in (16, 32, 64, 128, 256, 512, 1024, 2048, 4096):
+        controlador = ControlPredictivo(objetivos=objetivos, configuracion=replace(config, TAMANO_LOTE=tamano))
+        controlador.setObjetivo(objetivos[0])
+        latencias = []
+        for _ in range(25):
+            inicio = time.perf_counter()
+            controlador.tomarDecision(pose)
+            latencias.append(time.perf_counter() - inicio)
+        if sorted(latencias)[len(latencias) // 2] * 1e6 > config.PRESUPUESTO_LATENCIA_US:
+            if tamano == 16:
+                logger.warning("Ningún lote cabe en %.0f µs por tick; se usan %d candidatos",
+                               config.PRESUPUESTO_LATENCIA_US, tamano)
+            break
+        elegido = tamano
+    logger.info("Lote calibrado para %.0f µs por tick: %d candidatos", config.PRESUPUESTO_LATENCIA_US, elegido)
+    return elegido
+
+
+@constantes_de_solo_lectura
+class ControlPredictivo:
+
+    # Constantes de ajuste que pueden indicarse en el constructor (p. ej. ControlPredictivo(HORIZONTE=1.5))
+    CONSTANTES_AJUSTE: tuple = tuple(campo.name for campo in fields(ConfiguracionPredictiva))
+
+    # Etapas de tomarDecision que mide el perfilado (ver Comun/perfilado.py)
+    ETAPAS_PERFILADO: tuple = ("cargar_segmento", "desplegar", "puntuar")
+
+    FIRST_SEGMENT_INDEX: int = 0                      # Índice del primer segmento
+
+    # Estado mutable del controlador; las constantes de ajuste viven en `config`
+    __slots__ = (
+        "config", "objetivoAlcanzado", "segmentoObjetivo", "FRENAR",
+        "velocidad", "velocidad_angular", "reverse", "distance",
+        "check_point_segmento", "check_point_triangulo", "segment_number", "TOTAL_SEGMENT_NUMBER",
+        "plantilla", "ruta", "seguidor", "tamano_lote", "candidatos_v", "candidatos_w", "tiempos",
+        "aristas", "perfil_s", "perfil_v",
+        "telemetria", "traza",
+    )
+
+    def __init__(self, objetivos=None, directorio_cache: str = None,
+                 configuracion: ConfiguracionPredictiva = None,
+                 configuracion_trayectoria: ConfiguracionExperto = None, **constantes) -> None:
+        """
+        Args:
+            objetivos (list, opcional): Segmentos de la ruta. Por defecto, `P1Launcher.objectiveSet`.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+            configuracion (ConfiguracionPredictiva, opcional): Constantes de ajuste, compartidas con otros
+                controladores. Por defecto, las de `ConfiguracionPredictiva()`.
+            configuracion_trayectoria (ConfiguracionExperto, opcional): Constantes con las que el
+                `ExpertSystem` de plantilla genera las trayectorias de checkpoints.
+            **constantes: Valores para cualquiera de las `CONSTANTES_AJUSTE`, que sustituyen a los de `configuracion`.
+
+        Raises:
+            TypeError: Si alguna constante indicada no está en `CONSTANTES_AJUSTE`.
+            ValueError: Si la ruta no es una lista o tupla: los candidatos se puntúan sobre la
+                ruta compilada completa, no sobre un flujo de segmentos.
+        """
+
+        # --- Constantes de ajuste ---
+        for nombre in constantes:
+            if nombre not in self.CONSTANTES_AJUSTE:
+                raise TypeError(f"ControlPredictivo() got an unexpected keyword argument {nombre!r}")
+        config = configuracion if configuracion is not None else _CONFIGURACION_POR_DEFECTO
+        self.config: ConfiguracionPredictiva = replace(config, **constantes) if constantes else config
+
+        # --- Ruta completa ---
+        if objetivos is None:
+            objetivos = objetivos_lanzador()
+        if not isinstance(objetivos, (list, tuple)):
+            raise ValueError("ControlPredictivo necesita la ruta completa, no un flujo de segmentos")
+
+        # --- Flags y estados del trayecto ---
+        self.objetivoAlcanzado: bool = False           # Indica si el robot ha alcanzado su objetivo final
+        self.segmentoObjetivo: object = None           # Segmento actual del trayecto
+        self.FRENAR: bool = None                       # Indica si el segmento actual es el último de la ruta
+        self.segment_number: int = 0                   # Número del segmento actual
+        self.TOTAL_SEGMENT_NUMBER: int = len(objetivos) # Total de segmentos
+
+        # --- Decisión ---
+        self.velocidad: float = 0.0                    # Velocidad lineal del mejor candidato (m/s)
+        self.velocidad_angular: float = 0.0            # Velocidad angular del mejor candidato (rad/s)
+        self.reverse: bool = False                     # Siempre False: no se usa marcha atrás
+        self.distance: float = 0.0                     # Distancia al final del segmento actual
+        self.check_point_segmento: int = 0             # Arista de la proyección en un segmento lineal
+        self.check_point_triangulo: int = 0            # Arista de la proyección en un segmento triangular
+
+        # --- Trayectorias de checkpoints, generadas por un ExpertSystem de plantilla ---
+        self.plantilla: ExpertSystem = ExpertSystem(objetivos=list(objetivos), configuracion=configuracion_trayectoria)
+        self.ruta: RutaCompilada = self.compilar_ruta(objetivos, directorio_cache)
+        self.seguidor: SeguidorTrayectoria = SeguidorTrayectoria()  # Proyección sobre el segmento actual y el siguiente
+
+        # --- Aristas y perfil de velocidad del segmento cargado, como arrays ---
+        self.aristas: tuple = None                     # (x, y, ux, uy, longitud, s, ángulo) de cada arista
+        self.perfil_s: np.ndarray = None               # Longitud acumulada de cada punto (m)
+        self.perfil_v: np.ndarray = None               # Velocidad planificada en cada punto (m/s)
+
+        # --- Lote de candidatos y horizonte ---
+        self.tamano_lote: int = self.config.TAMANO_LOTE or calibrar_lote(self.config)
+        self.candidatos_v, self.candidatos_w = rejilla_candidatos(self.tamano_lote)
+        self.tiempos: np.ndarray = np.arange(1, self.config.PASOS_HORIZONTE + 1) * (self.config.HORIZONTE / self.config.PASOS_HORIZONTE)
+
+        # --- Telemetría (opcional) ---
+        self.telemetria: Telemetria = None            # Registro por tick; None la desactiva sin coste
+
+        # --- Grabación de trazas (opcional) ---
+        self.traza: GrabadorTraza = None              # Grabador de ticks para reproducirlos; None lo desactiva
+
+    # función setObjetivo
+    #   Especifica un segmento como objetivo para el recorrido del robot
+    #   Este método NO debería ser modificado
+    def setObjetivo(self, segmento):
+        self.objetivoAlcanzado = False
+        self.segmentoObjetivo = segmento
+
+    def compilar_ruta(self, objetivos, directorio_cache=None):
+        """
+        Genera de una vez las trayectorias de todos los segmentos con el `ExpertSystem` de plantilla
+        (ver `ExpertSystem.compilar_ruta`).
+        """
+        return self.plantilla.compilar_ruta(list(objetivos), directorio_cache)
+
+    def cargar_segmento(self):
+        """
+        Carga en el `SeguidorTrayectoria` la trayectoria del segmento actual y la del siguiente, y
+        copia sus aristas y su perfil de velocidad a arrays para puntuar los despliegues.
+        """
+        seguidor = self.seguidor
+        siguiente = self.segment_number + 1
+        proxima = self.ruta.trayectoria(siguiente) if siguiente < self.TOTAL_SEGMENT_NUMBER else None
+        seguidor.cargar(self.segment_number, self.ruta.trayectoria(self.segment_number), proxima, VMAX, VACC, WMAX)
+        self.FRENAR = proxima is None
+
+        s = np.array(seguidor.s)
+        self.aristas = (np.array(seguidor.xs[:-1]), np.array(seguidor.ys[:-1]), np.array(seguidor.ux),
+                        np.array(seguidor.uy), np.array(seguidor.longitud), s[:-1], np.radians(seguidor.angulo))
+        self.perfil_s, self.perfil_v = s, np.array(seguidor.velocidades)
+
+    def desplegar(self, x, y, angulo, v, w):
+        """
+        Simula todos los candidatos durante el horizonte con un modelo de uniciclo vectorizado.
+
+        Args:
+            x, y (float): Posición del robot.
+            angulo (float): Orientación del robot en radianes.
+            v, w (float): Velocidades actuales del robot.
+
+        Returns:
+            tuple: Arrays (lote, pasos) con las posiciones x e y, la orientación y la velocidad
+            lineal de cada candidato al final de cada paso.
+
+        Detalles:
+        - Cada candidato mantiene su (V, W) durante todo el horizonte. Las velocidades del robot se
+        acercan a él como mucho a `VACC` y `WACC` y se saturan en ±VMAX y ±WMAX, igual que el robot,
+        así que en forma cerrada valen `clip(V, v - VACC·t, v + VACC·t)`.
+        - La posición se integra con la orientación en el punto medio de cada paso.
+        """
+        paso = self.tiempos[0]
+        vs = np.clip(self.candidatos_v[:, None], v - VACC * self.tiempos, v + VACC * self.tiempos)
+        np.clip(vs, -VMAX, VMAX, out=vs)
+        ws = np.clip(self.candidatos_w[:, None], w - WACC * self.tiempos, w + WACC * self.tiempos)
+        np.clip(ws, -WMAX, WMAX, out=ws)
+
+        orientacion = angulo + np.cumsum(ws, axis=1) * paso
+        medio = orientacion - 0.5 * paso * ws
+        xs = x + np.cumsum(vs * np.cos(medio), axis=1) * paso
+        ys = y + np.cumsum(vs * np.sin(medio), axis=1) * paso
+        return xs, ys, orientacion, vs
+
+    def puntuar(self, xs, ys, orientacion, vs, recorrido, inicio, fin, volver):
+        """
+        Coste de cada despliegue respecto a las aristas `inicio`..`fin` (sin incluir) de la trayectoria cargada.
+
+        Args:
+            xs, ys, orientacion, vs (numpy.ndarray): Despliegues de `desplegar`.
+            recorrido (float): Longitud recorrida hasta la proyección del robot.
+            inicio, fin (int): Ventana de aristas.
+            volver (bool): El robot ha rebasado el final del segmento lejos de él y debe volver.
+
+        Returns:
+            numpy.ndarray: Coste de cada candidato (menor es mejor).
+
+        Detalles:
+        - Cada punto se proyecta sobre la arista que minimiza su distancia más
+        `PESO_CONTINUIDAD·(s - s_esperada)²`, donde `s_esperada` es `recorrido` más lo que ha
+        avanzado el candidato. Así, en las uniones en horquilla, donde el segmento siguiente
+        vuelve sobre el actual, un punto no se proyecta sobre el tramo de vuelta.
+        - El coste premia la longitud recorrida al final del horizonte y penaliza el error
+        transversal, la velocidad por encima del perfil, el error de orientación final y el
+        cambio de W respecto al tick anterior.
+        - El segmento solo se completa pasando cerca de su final, así que los candidatos que lo
+        alcanzan dentro del horizonte pagan lo que su paso más cercano se aleja de él más allá de
+        `TOLERANCIA_LLEGADA`; si hay que volver, solo cuentan esa distancia y la suavidad.
+        - Los pasos posteriores a la llegada (a `DISTANCIA_LLEGADA` del final) no suman error ni
+        exceso de velocidad: con el segmento recorrido, el robot puede reorientarse hacia el
+        siguiente sin que un candidato que llega parezca peor que uno detenido.
+        """
+        c = self.config
+        paso = self.tiempos[0]
+        x_fin, y_fin = self.seguidor.fin
+        distancia_fin = np.sqrt((xs - x_fin) ** 2 + (ys - y_fin) ** 2)
+        llegada = np.maximum(np.min(distancia_fin, axis=1) - c.TOLERANCIA_LLEGADA, 0.0) ** 2
+        suavidad = c.PESO_SUAVIDAD * (self.candidatos_w - self.velocidad_angular) ** 2
+        if volver:
+            return c.PESO_LLEGADA * llegada + suavidad
+        ax, ay, ux, uy, longitud, s0, angulo = (arista[inicio:fin] for arista in self.aristas)
+
+        dx = xs[..., None] - ax
+        dy = ys[..., None] - ay
+        t = np.clip(dx * ux + dy * uy, 0.0, longitud)
+        ex = dx - t * ux
+        ey = dy - t * uy
+        error2 = ex * ex + ey * ey
+        s = s0 + t
+        esperada = recorrido + np.cumsum(np.abs(vs), axis=1) * paso
+        indice = np.argmin(error2 + c.PESO_CONTINUIDAD * (s - esperada[..., None]) ** 2, axis=2)[..., None]
+        error2 = np.take_along_axis(error2, indice, axis=2)[..., 0]
+        s = np.take_along_axis(s, indice, axis=2)[..., 0]
+
+        # El perfil acaba en reposo: a menos de DISTANCIA_LLEGADA de su final el segmento ya está recorrido
+        exceso = np.maximum(vs - np.interp(s, self.perfil_s, self.perfil_v), 0.0)
+        exceso[s >= self.perfil_s[-1] - c.DISTANCIA_LLEGADA] = 0.0
+
+        # Tras llegar al final del segmento, este queda recorrido: los pasos siguientes no se penalizan
+        recorrido_segmento = np.cumsum(distancia_fin <= c.DISTANCIA_LLEGADA, axis=1) > 0
+        error2[recorrido_segmento] = 0.0
+        exceso[recorrido_segmento] = 0.0
+        orientacion_final = orientacion[:, -1] - angulo[indice[:, -1, 0]]
+        alcanza = s[:, -1] >= self.seguidor.longitud_segmento
+        return (-c.PESO_PROGRESO * s[:, -1]
+                + c.PESO_ERROR * paso * np.sum(error2, axis=1)
+                + c.PESO_EXCESO_VELOCIDAD * paso * np.sum(exceso * exceso, axis=1)
+                + c.PESO_ORIENTACION * (1.0 - np.cos(orientacion_final))
+                + c.PESO_LLEGADA * llegada * alcanza
+                + suavidad)
+
+    def tomarDecision(self, poseRobot):
+        """
+        Toma una decisión de movimiento para el robot: el par (V, W) candidato cuyo despliegue
+        sobre el horizonte obtiene el menor coste.
+
+        Args:
+            poseRobot (tuple): Pose del robot (x, y, ángulo en grados, v, w).
+
+        Returns:
+            Decision: Tupla con nombre con las velocidades lineal y angular del mejor candidato.
+
+        Detalles:
+        - El mejor par del tick anterior es siempre uno de los candidatos, así que una decisión
+        solo cambia si otra puntúa mejor.
+        - La ventana de aristas empieza en la proyección del robot y llega hasta donde se puede
+        llegar a `VMAX` en el horizonte, sin pasar de `ARISTAS_HORIZONTE` ni del segmento
+        siguiente; si el robot ha rebasado el final del segmento sin pasar a menos de
+        `DISTANCIA_LLEGADA` de él, se limita al segmento actual para que vuelva.
+        - El segmento termina cuando el robot está a `DISTANCIA_LLEGADA` de su final.
+        - Completada la ruta (`segment_number == TOTAL_SEGMENT_NUMBER`) no queda trayectoria que
+        seguir: el robot se detiene y el objetivo queda alcanzado, aunque la plantilla tenga
+        `VOLVER_AL_INICIO`, para que el lanzador deje de pedir decisiones.
+        """
+        x_robot, y_robot, current_angle, v_robot, w_robot = poseRobot
+        seguidor = self.seguidor
+
+        # --- RUTA COMPLETADA ---
+        if self.segment_number >= self.TOTAL_SEGMENT_NUMBER:
+            self.velocidad = self.velocidad_angular = 0.0
+            self.objetivoAlcanzado = True
+            if self.traza is not None:
+                self.traza.registrar(self, poseRobot, self.velocidad, self.velocidad_angular)
+            return Decision(self.velocidad, self.velocidad_angular)
+
+        # --- CARGA DEL SEGMENTO (una vez por segmento) ---
+        if seguidor.numero != self.segment_number:
+            self.cargar_segmento()
+
+        # --- PROYECCIÓN DEL ROBOT ---
+        recorrido, _ = seguidor.proyectar(x_robot, y_robot)
+        x_fin, y_fin = seguidor.fin
+        self.distance = math.sqrt((x_fin - x_robot) ** 2 + (y_fin - y_robot) ** 2)
+        volver = seguidor.rebasado_fin(x_robot, y_robot) and self.distance > self.config.DISTANCIA_LLEGADA
+        ultima = seguidor.ultima_arista if volver else len(seguidor.longitud) - 1
+        inicio = seguidor.arista
+        alcance = bisect_left(seguidor.s, recorrido + VMAX * self.config.HORIZONTE)  # Aristas al alcance en el horizonte
+        fin = max(inicio + 1, min(inicio + self.config.ARISTAS_HORIZONTE, ultima + 1, alcance))
+
+        # --- DESPLIEGUE Y PUNTUACIÓN DEL LOTE ---
+        self.candidatos_v[-1], self.candidatos_w[-1] = self.velocidad, self.velocidad_angular
+        despliegue = self.desplegar(x_robot, y_robot, math.radians(current_angle), v_robot, w_robot)
+        mejor = int(np.argmin(self.puntuar(*despliegue, recorrido, inicio, fin, volver)))
+        self.velocidad = float(self.candidatos_v[mejor])
+        self.velocidad_angular = float(self.candidatos_w[mejor])
+
+        # --- PROGRESO DEL SEGMENTO ---
+        check_point = seguidor.arista + 1
+        if self.distance <= self.config.DISTANCIA_LLEGADA:
+            self.segment_number += 1
+            self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.plantilla.config.VOLVER_AL_INICIO else True
+            check_point = 0
+        if self.segmentoObjetivo.getType() == 1:
+            self.check_point_segmento = check_point
+        else:
+            self.check_point_triangulo = check_point
+
+        # --- TELEMETRÍA ---
+        if self.telemetria is not None:
+            self.telemetria.registrar(poseRobot, seguidor.punto(recorrido), self.segment_number, check_point,
+                                      self.velocidad, self.velocidad_angular, self.reverse, self.FRENAR)
+
+        # --- GRABACIÓN DE LA TRAZA ---
+        if self.traza is not None:
+            self.traza.registrar(self, poseRobot, self.velocidad, self.velocidad_angular)
+
+        return Decision(self.velocidad, self.velocidad_angular)
+
+    # función esObjetivoAlcanzado
+    #   Devuelve True cuando el punto final del objetivo ha sido alcanzado.
+    #   Este método NO debería ser modificado
+    def esObjetivoAlcanzado(self):
+        return self.objetivoAlcanzado
+
+    # función hayParteOptativa
+    #   Devuelve True cuando se ha implementado la parte optativa.
+    #   Este método NO debería ser modificado
+    def hayParteOptativa(self):
+        return False
@@ -0,0 +1,172 @@
+'''
+ Caché de la inferencia difusa con entradas cuantizadas
+ Memoriza la salida (linear_velocity, angular_velocity) de la inferencia para
+ las entradas (distance, angle) redondeadas a una resolución fija: ticks
+ consecutivos con entradas casi iguales reutilizan el mismo resultado en lugar
+ de volver a fuzzificar, inferir y defuzzificar. El tamaño está acotado con
+ expulsión LRU y el error que introduce la cuantización se estima al construirla.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from functools import lru_cache
+
+import numpy as np
+
+from fuzzySurface import nodos_rejilla, puntos_de_quiebre
+
+
+class CacheInferencia:
+    """
+    Caché LRU (distance, angle) -> (V, W) sobre entradas cuantizadas.
+
+    Cada entrada se redondea al múltiplo más cercano de su resolución y la inferencia se evalúa en
+    ese punto, de modo que el resultado de una celda no depende de qué entrada la llenó primero.
+    Las filas (distancias) y columnas (ángulos) de celdas donde la salida salta más que la
+    tolerancia se resuelven siempre con la inferencia exacta; `error_maximo` guarda una estimación
+    del error en el resto de celdas, medida junto a los nodos de validación. No es una cota: las
+    celdas alejadas de los nodos se memorizan sin medirlas.
+    """
+
+    def __init__(self, inferir, resolucion_distancia, resolucion_angulo, capacidad, tolerancia,
+                 nodos_distancia=None, nodos_angulo=None) -> None:
+        """
+        Args:
+            inferir (callable): Función `inferir(distance, angle) -> (V, W)` de la inferencia exacta;
+                debe aceptar tanto escalares como arrays de entradas.
+            resolucion_distancia (float): Tamaño de la celda en el eje de la distancia.
+            resolucion_angulo (float): Tamaño de la celda en el eje del ángulo, en grados.
+            capacidad (int): Número máximo de celdas guardadas; al superarlo se expulsa la usada hace más tiempo.
+            tolerancia (float): Error absoluto máximo admitido en una celda de la caché.
+            nodos_distancia, nodos_angulo (array-like, opcional): Entradas en torno a las que se mide
+                el error. Sin ellas no se mide (`error_maximo` es None) y todas las celdas se memorizan.
+        """
+        self.inferir = inferir
+        self.resolucion_distancia: float = resolucion_distancia
+        self.resolucion_angulo: float = resolucion_angulo
+        self.capacidad: int = capacidad
+        self.tolerancia: float = tolerancia
+
+        # --- Caché de celdas, indexada por los índices enteros de la celda ---
+        self._celda = lru_cache(maxsize=capacidad)(self._inferir_celda)
+        self.consultas_exactas: int = 0               # Consultas resueltas sin la caché
+
+        # --- Validación de la cuantización ---
+        self.filas_exactas: frozenset = frozenset()    # Índices de distancia que no se memorizan
+        self.columnas_exactas: frozenset = frozenset() # Índices de ángulo que no se memorizan
+        self.error_maximo: dict = None                # Error estimado de V y W en las celdas memorizadas
+        if nodos_distancia is not None and nodos_angulo is not None:
+            self.error_maximo = self.validar(nodos_distancia, nodos_angulo)
+
+    @classmethod
+    def desde_variables(cls, inferir, variables, resolucion_distancia, resolucion_angulo, capacidad, tolerancia):
+        """
+        Construye la caché midiendo el error junto a los puntos de quiebre de las variables de
+        entrada `distance` y `angle`, donde la salida cambia más deprisa.
+        """
+        nodos_distancia = nodos_rejilla(puntos_de_quiebre(variables["distance"]), 2, 4)
+        nodos_angulo = nodos_rejilla(puntos_de_quiebre(variables["angle"]), 2, 4)
+        return cls(inferir, resolucion_distancia, resolucion_angulo, capacidad, tolerancia, nodos_distancia, nodos_angulo)
+
+    def _inferir_celda(self, i, j):
+        V, W = self.inferir(i * self.resolucion_distancia, j * self.resolucion_angulo)
+        return float(V), float(W)
+
+    def evaluar(self, distancia, angulo):
+        """
+        Devuelve (V, W) para una entrada escalar: el de su celda, calculado solo si no está en la
+        caché, o el exacto si la celda cae en una fila o columna marcada durante la validación.
+        """
+        i = round(distancia / self.resolucion_distancia)
+        j = round(angulo / self.resolucion_angulo)
+        if i in self.filas_exactas or j in self.columnas_exactas:
+            self.consultas_exactas += 1
+            V, W = self.inferir(distancia, angulo)
+            return float(V), float(W)
+        return self._celda(i, j)
+
+    def validar(self, nodos_distancia, nodos_angulo):
+        """
+        Mide el error de la cuantización en las celdas que contienen los nodos y marca como exactas
+        las filas y columnas donde supera la tolerancia.
+
+        Returns:
+            dict: Error absoluto estimado de `linear_velocity` y `angular_velocity` en las celdas
+            memorizadas, junto con el número de filas y columnas exactas.
+
+        Detalles:
+        - En cada celda se mide por separado lo que cambia la salida del centro a los bordes en
+        distancia y en ángulo, y del centro a las cuatro esquinas. El error estimado de la celda es
+        la suma de los dos primeros o, si es mayor, el de la peor esquina.
+        - Un salto de la salida en una distancia (p. ej. cuando empieza a activarse un término) afecta
+        a todos los ángulos, así que se marca la fila entera si el error en distancia supera la mitad
+        de la tolerancia en alguna celda, y lo mismo con las columnas.
+        - Es una estimación, no una cota: solo se miden las celdas que contienen algún nodo (los
+        nodos se concentran donde la salida cambia más deprisa), no se mide el interior de las
+        celdas y una salida no monótona puede superar la suma de los cambios hacia los bordes.
+        - Todo se evalúa en cuatro llamadas vectorizadas a la inferencia.
+        """
+        nodos_distancia = np.asarray(nodos_distancia, dtype=np.float64)
+        nodos_angulo = np.asarray(nodos_angulo, dtype=np.float64)
+        celdas_d = np.unique(np.round(nodos_distancia / self.resolucion_distancia))
+        celdas_a = np.unique(np.round(nodos_angulo / self.resolucion_angulo))
+        centros_d = celdas_d * self.resolucion_distancia
+        centros_a = celdas_a * self.resolucion_angulo
+
+        # Bordes de cada celda, algo hacia dentro para que sigan perteneciendo a ella y recortados al
+        # rango de los nodos (p. ej. la celda 0 no tiene distancias negativas)
+        borde = 0.5 - 1e-6
+        bordes_d = np.clip((celdas_d[:, None] + (-borde, borde)) * self.resolucion_distancia,
+                           nodos_distancia.min(), nodos_distancia.max())
+        bordes_a = np.clip((celdas_a[:, None] + (-borde, borde)) * self.resolucion_angulo,
+                           nodos_angulo.min(), nodos_angulo.max())
+
+        def salida(distancias, angulos):
+            return np.stack(self.inferir(*np.meshgrid(distancias, angulos, indexing="ij")))
+
+        centro = salida(centros_d, centros_a)                                  # (2, d, a)
+        en_d = salida(bordes_d.ravel(), centros_a).reshape(2, len(celdas_d), 2, len(celdas_a))
+        en_a = salida(centros_d, bordes_a.ravel()).reshape(2, len(celdas_d), len(celdas_a), 2)
+        esquinas = np.stack(self.inferir(bordes_d[:, :, None, None], bordes_a[None, None, :, :]))  # (2, d, 2, a, 2)
+        error_d = np.abs(en_d - centro[:, :, None, :]).max(axis=2)             # (2, d, a)
+        error_a = np.abs(en_a - centro[:, :, :, None]).max(axis=3)
+        error_esquinas = np.abs(esquinas - centro[:, :, None, :, None]).max(axis=(2, 4))
+
+        filas = (error_d > self.tolerancia / 2).any(axis=(0, 2))
+        columnas = (error_a > self.tolerancia / 2).any(axis=(0, 1))
+        self.filas_exactas = frozenset(celdas_d[filas].astype(int).tolist())
+        self.columnas_exactas = frozenset(celdas_a[columnas].astype(int).tolist())
+
+        memorizadas = ~filas[:, None] & ~columnas[None, :]
+        error = np.maximum(error_d + error_a, error_esquinas)
+        return {
+            "linear_velocity": float(np.max(error[0], where=memorizadas, initial=0.0)),
+            "angular_velocity": float(np.max(error[1], where=memorizadas, initial=0.0)),
+            "filas_exactas": len(self.filas_exactas),
+            "columnas_exactas": len(self.columnas_exactas),
+        }
+
+    def estadisticas(self):
+        """
+        Aciertos, fallos, expulsiones y ocupación de la caché, junto con el error estimado.
+        """
+        info = self._celda.cache_info()
+        consultas = info.hits + info.misses + self.consultas_exactas
+        return {
+            "aciertos": info.hits,
+            "fallos": info.misses,
+            "exactas": self.consultas_exactas,
+            "tasa_aciertos": info.hits / consultas if consultas else 0.0,
+            "expulsiones": info.misses - info.currsize,
+            "celdas": info.currsize,
+            "capacidad": self.capacidad,
+            "error_maximo": self.error_maximo,
+        }
+
+    def vaciar(self):
+        """
+        Vacía la caché y reinicia sus contadores.
+        """
+        self._celda.cache_clear()
+        self.consultas_exactas = 0
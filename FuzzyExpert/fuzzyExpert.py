@@ -1,20 +1,146 @@
 import numpy as np
 import math
-from fuzzy_expert.variable import FuzzyVariable
-from fuzzy_expert.rule import FuzzyRule
-from fuzzy_expert.inference import DecompositionalInference
+from dataclasses import dataclass, fields, replace
+from functools import lru_cache
 from robot import WACC, WMAX, VACC, VMAX
-import matplotlib.pyplot as plt
 from segmento import *
-
+from fuzzySurface import SuperficieControl
+from fuzzyCache import CacheInferencia
+from fuzzyInference import MotorMamdani
+from fuzzySparse import MotorDisperso
+from fuzzyRules import FICHERO_BASE_CONOCIMIENTO, a_fuzzy_expert, cargar_base_conocimiento
+from rutaCompilada import RutaCompilada
+from rutaLanzador import objetivos_lanzador
+from segmentosStream import FlujoSegmentos, RutaVentana, abrir_flujo
+from proyeccion import checkpoint_adelantado
+from telemetria import Telemetria, obtener_logger
+from trazas import GrabadorTraza
+from decision import Decision
+from configuracion import constantes_de_solo_lectura
+from geometria import altura_relativa, bezier_cubica, puntos_control
+from muestreoAdaptativo import bezier_adaptativa, divisiones_recta
+
+logger = obtener_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfiguracionDifusa:
+    """
+    Constantes de ajuste del FuzzySystem.
+
+    Es inmutable, así que una misma configuración puede compartirse entre todos los controladores
+    que la usen (p. ej. `FuzzySystem(configuracion=config)` para cada robot de una flota).
+    """
+
+    # --- Trayecto ---
+    VOLVER_AL_INICIO: bool = True                     # Indica si el robot debe regresar al inicio
+
+    # --- Trayectoria lineal ---
+    LINE_CHECKPOINTS: int = 20                        # Total de puntos de control en trayectoria lineal
+    STOP_DISTANCE: float = 0.5                        # Distancia para detenerse al final del segmento
+    CHECKPOINT_DISTANCE_ACTIVATOR: float = 4.25       # Distancia que activa cambio de punto de control
+    CONSTANTE_AUMENTAR_VELOCIDAD: float = 1.5         # Constante para aumentar velocidad
+
+    # --- Trayectoria triangular ---
+    TRIANGLE_CHECKPOINTS: int = 5                     # Total de puntos de control en trayectoria triangular
+    CONTROL_POINT_CONSTANT: float = 0.7               # Constante para ajustar los puntos de control
+    MINIMUM_DISTANCE_TRIANGLE_CP: int = 4             # Distancia mínima para activar puntos de control
+
+    # --- Muestreo adaptativo ---
+    MUESTREO_ADAPTATIVO: bool = False                 # Reparte los checkpoints según la longitud y la curvatura de cada tramo
+    ESPACIADO_MAXIMO: float = 2.0                     # Longitud máxima entre checkpoints consecutivos (m)
+    TOLERANCIA_MUESTREO: float = 0.05                 # Separación máxima entre la curva y la cuerda entre checkpoints (m)
+
+    # --- Avance de checkpoints ---
+    AVANCE_POR_PROYECCION: bool = False               # Adelanta el checkpoint proyectando la pose sobre la trayectoria
+    VENTANA_PROYECCION: int = 8                       # Aristas de la trayectoria en las que se busca la proyección
+
+    # --- Superficie de control ---
+    TOLERANCIA_SUPERFICIE: float = 0.01               # Error máximo admitido en una celda interpolada
+    SUBDIVISIONES_SUPERFICIE: int = 2                 # Intervalos iguales por tramo lineal de los términos
+    MUESTRAS_VALIDACION_SUPERFICIE: int = 4           # Intervalos por eje de cada celda al validar la superficie
+
+    # --- Caché de inferencia ---
+    RESOLUCION_CACHE_DISTANCIA: float = 0.05          # Tamaño de la celda de la caché en distancia (m)
+    RESOLUCION_CACHE_ANGULO: float = 0.5              # Tamaño de la celda de la caché en ángulo (grados)
+    CAPACIDAD_CACHE: int = 4096                       # Celdas guardadas como máximo (expulsión LRU)
+    TOLERANCIA_CACHE: float = 0.05                    # Error máximo admitido en las celdas validadas de la caché
+
+
+_CONFIGURACION_POR_DEFECTO = ConfiguracionDifusa()
+
+
+@constantes_de_solo_lectura
 class FuzzySystem:
-    def __init__(self) -> None:
-        from P1Launcher import objectiveSet  # Importación de los objetivos del trayecto
-        
+
+    # Constantes de ajuste que pueden indicarse en el constructor (p. ej. FuzzySystem(STOP_DISTANCE=0.3))
+    CONSTANTES_AJUSTE: tuple = tuple(campo.name for campo in fields(ConfiguracionDifusa))
+
+    # Etapas de tomarDecision que mide el perfilado (ver Comun/perfilado.py): objetivo, inferencia y proximidad
+    ETAPAS_PERFILADO: tuple = (
+        "obtener_coordenadas_objetivo", "obtener_trayectoria", "calcular_angulo",
+        "superficie.evaluar", "cache_inferencia.evaluar", "inferencia_dispersa", "inferencia_exacta",
+        "verificar_proximidad_objetivo",
+    )
+
+    FIRST_SEGMENT_INDEX: int = 0                      # Índice del primer segmento
+
+    # Estado mutable del controlador; las constantes de ajuste viven en `config`
+    __slots__ = (
+        "config", "objetivoAlcanzado", "segmentoObjetivo", "FRENAR",
+        "velocidad", "velocidad_angular", "reverse", "distance",
+        "check_point_segmento", "line_trayectory", "start_point", "segment_number", "TOTAL_SEGMENT_NUMBER",
+        "check_point_triangulo", "triangle_trayectory",
+        "fichero_reglas", "variables", "rules", "tabla_reglas", "motor_inferencia", "motor_disperso",
+        "superficie", "cache_inferencia",
+        "flujo", "ruta", "telemetria", "traza",
+    )
+
+    def __init__(self, usar_superficie: bool = False, niveles_superficie: int = 8,
+                 usar_ruta_compilada: bool = False, directorio_cache: str = None,
+                 usar_cache_inferencia: bool = False,
+                 fichero_reglas: str = None, activacion_dispersa: bool = False,
+                 objetivos=None, ventana_segmentos: int = 8, configuracion: ConfiguracionDifusa = None, **constantes) -> None:
+        """
+        Args:
+            usar_superficie (bool): Usa una superficie de control precompilada en lugar de la inferencia exacta.
+            niveles_superficie (int): Densificación de la rejilla de la superficie junto a los puntos de quiebre.
+            usar_ruta_compilada (bool): Precalcula las trayectorias de toda la ruta al construir.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+            usar_cache_inferencia (bool): Memoriza la inferencia exacta sobre entradas cuantizadas.
+            fichero_reglas (str, opcional): Base de conocimiento en TOML. Por defecto, `baseConocimiento.toml`.
+            activacion_dispersa (bool): Evalúa en cada decisión solo las reglas que se disparan (`MotorDisperso`).
+            objetivos (list | iterable | str, opcional): Segmentos de la ruta. Una lista o tupla se usa
+                entera; un iterador, generador, `FlujoSegmentos` o fichero de segmentos se lee a medida
+                que se avanza (ver `segmentosStream.py`). Por defecto, `P1Launcher.objectiveSet`.
+            ventana_segmentos (int): Segmentos que se leen (y, con ruta compilada, se generan) por
+                delante del actual cuando la ruta es un flujo.
+            configuracion (ConfiguracionDifusa, opcional): Constantes de ajuste, compartidas con otros
+                controladores. Por defecto, las de `ConfiguracionDifusa()`.
+            **constantes: Valores para cualquiera de las `CONSTANTES_AJUSTE`, que sustituyen a los de `configuracion`.
+
+        Raises:
+            TypeError: Si alguna constante indicada no está en `CONSTANTES_AJUSTE`.
+            ValueError: Si la ruta es un flujo y se pide `directorio_cache`, que necesita la ruta completa.
+        """
+
+        # --- Constantes de ajuste ---
+        for nombre in constantes:
+            if nombre not in self.CONSTANTES_AJUSTE:
+                raise TypeError(f"FuzzySystem() got an unexpected keyword argument {nombre!r}")
+        config = configuracion if configuracion is not None else _CONFIGURACION_POR_DEFECTO
+        self.config: ConfiguracionDifusa = replace(config, **constantes) if constantes else config
+
+        # --- Ruta: lista completa o flujo de segmentos leído por delante ---
+        if objetivos is None:
+            objetivos = objetivos_lanzador()
+        self.flujo: FlujoSegmentos = abrir_flujo(objetivos, ventana_segmentos) # None si la ruta es una lista
+        if self.flujo is not None and directorio_cache is not None:
+            raise ValueError("directorio_cache necesita la ruta completa, no un flujo de segmentos")
+
         # --- Estados generales ---
         self.objetivoAlcanzado: bool = False          # Indica si el robot alcanzó su objetivo
         self.segmentoObjetivo: object = None          # Segmento objetivo actual
-        self.VOLVER_AL_INICIO: bool = True            # Indica si el robot debe regresar al inicio
         self.FRENAR: bool = None                      # Indica si el robot debe frenar
 
         # --- Velocidades y movimiento ---
@@ -23,193 +149,94 @@ class FuzzySystem:
         self.reverse: bool = False                    # Indica si el robot está en modo reversa
         self.distance: float = 0.0                    # Distancia al objetivo actual
 
-        # --- Parámetros de trayectoria lineal ---
+        # --- Estado de la trayectoria lineal ---
         self.check_point_segmento: int = 0            # Índice del punto de control actual
-        self.LINE_CHECKPOINTS: int = 20               # Total de puntos de control en trayectoria lineal
         self.line_trayectory = None                   # Coordenadas de la trayectoria lineal
         self.start_point: tuple = None                # Punto de inicio de la trayectoria
         self.segment_number: int = 0                  # Número del segmento actual
-        self.STOP_DISTANCE: float = 0.5               # Distancia para detenerse al final del segmento
-        self.CHECKPOINT_DISTANCE_ACTIVATOR: float = 4.25 # Distancia que activa cambio de punto de control
-        self.CONSTANTE_AUMENTAR_VELOCIDAD: float = 1.5 # Constante para aumentar velocidad
-        self.FIRST_SEGMENT_INDEX: int = 0             # Índice del primer segmento
-        self.TOTAL_SEGMENT_NUMBER: int = len(objectiveSet) # Número total de segmentos
+        self.TOTAL_SEGMENT_NUMBER: int = len(objetivos) if self.flujo is None else self.flujo.total # Total de segmentos (inf hasta agotar el flujo)
 
-        # --- Parámetros de trayectoria triangular ---
+        # --- Estado de la trayectoria triangular ---
         self.check_point_triangulo: int = 0           # Índice del punto de control actual en trayectoria triangular
-        self.TRIANGLE_CHECKPOINTS: int = 5            # Total de puntos de control en trayectoria triangular
         self.triangle_trayectory = None               # Coordenadas de la trayectoria triangular
-        self.CONTROL_POINT_CONSTANT: float = 0.7      # Constante para ajustar los puntos de control
-        self.MINIMUM_DISTANCE_TRIANGLE_CP: int = 4    # Distancia mínima para activar puntos de control
-
-
-        self.variables = {
-            "distance": FuzzyVariable(
-                universe_range=(0, 120),
-                terms={
-                    "super_close": [(0, 1), (0.6, 0)],
-                    "close": [(0.5, 0), (1, 1), (2, 0)],
-                    "far": [(1.5, 0), (8, 1), (100, 1), (120, 1)],
-                }
-            ),
-            
-            "angle": FuzzyVariable(
-                universe_range=(0, 180),
-                terms={
-                    "super_small": [(0, 1), (0.25, 1), (1, 0)],
-                    "small": [(0, 0), (0.5, 1), (5, 1), (10, 0)],
-                    "medium": [(5, 0), (20, 1), (45, 1), (60, 0)],
-                    "large": [(50, 0), (170, 1), (180, 1)]
-                }
-            ),
-
-            "linear_velocity": FuzzyVariable(
-                universe_range=(0, 3),
-                terms={
-                    "super_slow": [(0, 1), (0.01, 0)],
-                    "slow": [(0.1, 1), (2.5, 0)],
-                    "super_fast": [(2.99, 0), (3, 1)]
-                }
-            ),
-            "angular_velocity": FuzzyVariable(
-            universe_range=(0, 1),
-            terms={
-                "super_slow": [(0, 1), (0.01, 0)],
-                "slow": [(0.005, 0), (0.1, 1), (0.2, 0)],
-                "medium": [(0.3, 0), (0.6, 1), (0.61, 0)],
-                "fast": [(0.99, 0), (1, 1)]
-            }
-        )             
-}
-        self.rules = [
-        
-            # --- SUPER CLOSE ---
-        FuzzyRule(
-            premise=[
-                ("distance", "super_close"),
-                ("AND", "angle", "super_small")
-            ],
-            consequence=[
-                ("linear_velocity", "super_slow"),
-                ("angular_velocity", "super_slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "super_close"),
-                ("AND", "angle", "small")
-            ],
-            consequence=[
-                ("linear_velocity", "super_slow"),
-                ("angular_velocity", "slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "super_close"),
-                ("AND", "angle", "medium")
-            ],
-            consequence=[
-                ("linear_velocity", "super_slow"),
-                ("angular_velocity", "medium")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "super_close"),
-                ("AND", "angle", "large")
-            ],
-            consequence=[
-                ("linear_velocity", "super_slow"),
-                ("angular_velocity", "fast")
-            ]
-        ),
-
-        # ---CLOSE---        
-        FuzzyRule(
-            premise=[
-                ("distance", "close"),
-                ("AND", "angle", "super_small")
-            ],
-            consequence=[
-                ("linear_velocity", "slow"),
-                ("angular_velocity", "super_slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "close"),
-                ("AND", "angle", "small")
-            ],
-            consequence=[
-                ("linear_velocity", "slow"),
-                ("angular_velocity", "slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "close"),
-                ("AND", "angle", "medium")
-            ],
-            consequence=[
-                ("linear_velocity", "slow"),
-                ("angular_velocity", "medium")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "close"),
-                ("AND", "angle", "large")
-            ],
-            consequence=[
-                ("linear_velocity", "slow"),
-                ("angular_velocity", "fast")
-            ]
-        ),
-
-        # --- FAR ---
-        FuzzyRule(
-            premise=[
-                ("distance", "far"),
-                ("AND", "angle", "super_small")
-            ],
-            consequence=[
-                ("linear_velocity", "super_fast"),
-                ("angular_velocity", "super_slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "far"),
-                ("AND", "angle", "small")
-            ],
-            consequence=[
-                ("linear_velocity", "super_fast"),
-                ("angular_velocity", "slow")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "far"),
-                ("AND", "angle", "medium")
-            ],
-            consequence=[
-                ("linear_velocity", "super_fast"),
-                ("angular_velocity", "medium")
-            ]
-        ),
-        FuzzyRule(
-            premise=[
-                ("distance", "far"),
-                ("AND", "angle", "large")
-            ],
-            consequence=[
-                ("linear_velocity", "super_fast"),
-                ("angular_velocity", "fast")
-            ]
-        ),
-    ]
-        self.inference_system = DecompositionalInference(
+
+        # --- Base de conocimiento, compartida por todas las instancias ---
+        self.fichero_reglas: str = fichero_reglas or FICHERO_BASE_CONOCIMIENTO
+        (self.variables, self.rules, self.tabla_reglas,
+         self.motor_inferencia) = self.base_conocimiento(self.fichero_reglas)
+
+        # --- Inferencia por activación dispersa (opcional) ---
+        self.motor_disperso: MotorDisperso = None     # Evalúa solo las reglas que se disparan
+        if activacion_dispersa:
+            self.motor_disperso = MotorDisperso(self.motor_inferencia, self.tabla_reglas, self.variables)
+
+        # --- Superficie de control precompilada (opcional) ---
+        self.superficie: SuperficieControl = None     # Tabla (distance, angle) -> (V, W)
+        if usar_superficie:
+            self.superficie = self.compilar_superficie(niveles_superficie)
+
+        # --- Caché de la inferencia exacta (opcional) ---
+        self.cache_inferencia: CacheInferencia = None # Celdas (distance, angle) cuantizadas -> (V, W)
+        if usar_cache_inferencia:
+            self.cache_inferencia = self.crear_cache_inferencia()
+
+        # --- Ruta compilada (opcional) ---
+        self.ruta: RutaCompilada = None               # Trayectorias de todos los segmentos, precalculadas
+        if usar_ruta_compilada:
+            self.ruta = self.compilar_ruta(objetivos, directorio_cache) if self.flujo is None else \
+                RutaVentana(self.flujo, self.trayectoria_segmento)
+
+        # --- Telemetría (opcional) ---
+        self.telemetria: Telemetria = None            # Registro por tick; None la desactiva sin coste
+
+        # --- Grabación de trazas (opcional) ---
+        self.traza: GrabadorTraza = None              # Grabador de ticks para reproducirlos; None lo desactiva
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def base_conocimiento(fichero_reglas=FICHERO_BASE_CONOCIMIENTO):
+        """
+        Variables, reglas y motores de inferencia del controlador.
+
+        Args:
+            fichero_reglas (str): Fichero TOML con las variables y la tabla de reglas (ver `fuzzyRules.py`).
+
+        Returns:
+            tuple: (variables, rules, tabla_reglas, motor_inferencia).
+
+        Detalles:
+        - Las reglas se declaran como una tabla de consecuencias por par de términos (distance, angle)
+        en `baseConocimiento.toml` y se compilan a una lista de `ReglaDifusa`.
+        - No importa fuzzy_expert (ni matplotlib): las variables y reglas son las de `fuzzyRules.py` y
+        la inferencia la hace el motor nativo. fuzzy_expert solo se carga en `sistema_referencia`.
+        - Se construyen una sola vez por fichero y todas las instancias comparten los mismos objetos,
+        así que no deben modificarse desde un controlador.
+        """
+        variables, tabla_reglas = cargar_base_conocimiento(fichero_reglas)
+        rules = tabla_reglas.reglas()
+
+        # --- Motor de inferencia nativo (mismos resultados que fuzzy_expert, vectorizado) ---
+        motor_inferencia = MotorMamdani(variables, rules)
+        return variables, rules, tabla_reglas, motor_inferencia
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def sistema_referencia(fichero_reglas=FICHERO_BASE_CONOCIMIENTO):
+        """
+        Inferencia de referencia con fuzzy_expert para la base de conocimiento `fichero_reglas`.
+
+        Returns:
+            tuple: (variables `FuzzyVariable`, reglas `FuzzyRule`, `DecompositionalInference`).
+
+        Detalles:
+        - fuzzy_expert (que importa matplotlib e ipywidgets) se importa aquí, la primera vez que se
+        pide la referencia, y no al importar el módulo ni al construir un controlador.
+        - Se comprueba que los operadores son los que reproduce `MotorMamdani`.
+        """
+        from fuzzy_expert.inference import DecompositionalInference
+
+        variables, rules, _, _ = FuzzySystem.base_conocimiento(fichero_reglas)
+        inference_system = DecompositionalInference(
             and_operator="min",
             or_operator="max",
             implication_operator="Rc",
@@ -217,6 +244,15 @@ class FuzzySystem:
             production_link="max",
             defuzzification_operator="cog",
         )
+        MotorMamdani.desde_inferencia(inference_system, variables, rules)
+        return (*a_fuzzy_expert(variables, rules), inference_system)
+
+    @property
+    def inference_system(self):
+        """
+        `DecompositionalInference` de fuzzy_expert, creado (e importado) la primera vez que se usa.
+        """
+        return self.sistema_referencia(self.fichero_reglas)[2]
 
    # #######################
     # ---- LINE CONTROLL ----
@@ -231,12 +267,13 @@ class FuzzySystem:
             B (tuple): Coordenadas del punto final (x2, y2).
 
         Returns:
-            list: Lista de puntos (x, y) que forman la trayectoria lineal desde A hasta B.
+            numpy.ndarray: Array (n, 2) de float64 con los puntos que forman la trayectoria lineal desde A hasta B.
 
         Detalles:
         1. Calcula las coordenadas de los puntos intermedios dividiendo el segmento entre A y B en 
-        `LINE_CHECKPOINTS + 1` partes.
-        2. Añade el punto inicial (A) y el punto final (B) a la lista de resultados.
+        `LINE_CHECKPOINTS + 1` partes (con `MUESTREO_ADAPTATIVO`, en las justas para que ninguna supere
+        `ESPACIADO_MAXIMO`), todas a la vez sobre un array preasignado.
+        2. Añade el punto inicial (A) y el punto final (B).
         3. Redondea las coordenadas de los puntos intermedios a 6 decimales para mejorar la precisión.
         """
 
@@ -246,21 +283,26 @@ class FuzzySystem:
         # Coordenadas del punto B
         x2, y2 = float(B[0]), float(B[1])
         
-        # Crear una lista vacía y agregar el punto A al inicio
-        points = [A]
+        # Puntos intermedios: LINE_CHECKPOINTS, o los justos para no superar ESPACIADO_MAXIMO
+        n = self.config.LINE_CHECKPOINTS
+        if self.config.MUESTREO_ADAPTATIVO:
+            n = divisiones_recta((x1, y1), (x2, y2), self.config.ESPACIADO_MAXIMO) - 1
+
+        # Reservar la trayectoria completa y colocar el punto A al inicio
+        points = np.empty((n + 2, 2), dtype=np.float64)
+        points[0] = x1, y1
         
         # Calcular el paso entre puntos en los ejes x e y
-        dx = (x2 - x1) / (self.LINE_CHECKPOINTS + 1)
-        dy = (y2 - y1) / (self.LINE_CHECKPOINTS + 1)
+        dx = (x2 - x1) / (n + 1)
+        dy = (y2 - y1) / (n + 1)
         
-        # Agregar puntos intermedios con precisión de float
-        for i in range(1, self.LINE_CHECKPOINTS + 1):
-            x = round(x1 + i * dx, 6)
-            y = round(y1 + i * dy, 6)
-            points.append((x, y))
+        # Agregar de una vez los puntos intermedios con precisión de float
+        i = np.arange(1, n + 1)
+        np.round(x1 + i * dx, 6, out=points[1:-1, 0])
+        np.round(y1 + i * dy, 6, out=points[1:-1, 1])
         
-        # Agregar el punto B al final de la lista
-        points.append(B)
+        # Agregar el punto B al final
+        points[-1] = x2, y2
         
         return points
     
@@ -310,19 +352,13 @@ class FuzzySystem:
         4. Asegura que el offset esté dentro del rango especificado [0.5, 5].
         """
 
-        # Calcula la longitud de la base AB
-        longitud_base = math.dist(A, B)
-        
-        # Calcula la altura desde el punto C hasta la línea AB
-        altura = abs((B[1] - A[1]) * C[0] - (B[0] - A[0]) * C[1] + B[0] * A[1] - B[1] * A[0]) / longitud_base
-        
-        # Calcula el offset, normalizando el valor
-        offset = 1.5 + (0.5 * (altura / (longitud_base + 1)))
+        # Calcula el offset a partir de la altura de C sobre la base AB, normalizada por su longitud
+        offset = 1.5 + 0.5 * altura_relativa(A, B, C)
         
         # Limita el offset entre 0.5 y 1.5
         offset = max(0.5, min(offset, 5))
 
-        print(offset)
+        logger.debug("Offset de los puntos de control: %s", offset)
         
         return offset
 
@@ -337,31 +373,15 @@ class FuzzySystem:
 
         Returns:
             tuple: 
-                - CP1 (numpy.ndarray): Primer punto de control calculado.
-                - CP2 (numpy.ndarray): Segundo punto de control calculado.
+                - CP1 (tuple): Primer punto de control calculado (x, y).
+                - CP2 (tuple): Segundo punto de control calculado (x, y).
 
         Detalles:
-        1. Calcula los vectores de dirección entre los puntos B → C y C → D.
-        2. Normaliza estos vectores para obtener direcciones perpendiculares.
-        3. Calcula un offset dinámico utilizando el método `calcular_offset`, que ajusta el desplazamiento de los puntos de control.
-        4. Determina las posiciones de CP1 y CP2 sumando los desplazamientos proporcionales al vector de dirección y al offset.
+        1. Calcula un offset dinámico utilizando el método `calcular_offset`, que ajusta el desplazamiento de los puntos de control.
+        2. Determina las posiciones de CP1 y CP2 avanzando `CONTROL_POINT_CONSTANT` de cada tramo (B → C y C → D)
+        y desplazándolas el offset en perpendicular al tramo (`geometria.puntos_control`).
         """
-
-        # Vectores de dirección de B a C y de C a D
-        vBC = np.array(C) - np.array(B)
-        vCD = np.array(D) - np.array(C)
-
-        # Normalización para obtener la dirección perpendicular
-        norm_vBC = np.array([-vBC[1], vBC[0]]) / np.linalg.norm(vBC)
-        norm_vCD = np.array([-vCD[1], vCD[0]]) / np.linalg.norm(vCD)
-        
-        offset = self.calcular_offset(B,D,C)
-
-        # Desplazamiento de los puntos de control según el offset
-        CP1 = np.array(B) + self.CONTROL_POINT_CONSTANT * vBC + offset * norm_vBC  # Desplazamiento de CP1
-        CP2 = np.array(C) + self.CONTROL_POINT_CONSTANT * vCD + offset * norm_vCD  # Desplazamiento de CP2
-
-        return CP1, CP2
+        return puntos_control(B, C, D, self.config.CONTROL_POINT_CONSTANT, self.calcular_offset(B, D, C))
     
     def generate_curved_path(self, B, C, D, CP1, CP2):
         """
@@ -371,8 +391,8 @@ class FuzzySystem:
             B (tuple): Coordenadas del primer punto de la trayectoria (x1, y1).
             C (tuple): Coordenadas del punto intermedio de la trayectoria (x2, y2).
             D (tuple): Coordenadas del punto final de la trayectoria (x3, y3).
-            CP1 (numpy.ndarray): Primer punto de control para la curva de B a C.
-            CP2 (numpy.ndarray): Segundo punto de control para la curva de C a D.
+            CP1 (tuple): Primer punto de control para la curva de B a C.
+            CP2 (tuple): Segundo punto de control para la curva de C a D.
 
         Returns:
             numpy.ndarray: Array de puntos que forman la trayectoria curva completa.
@@ -381,25 +401,205 @@ class FuzzySystem:
         1. Divide la trayectoria en dos partes:
             - Primera curva Bézier cúbica desde B a C, usando `CP1` como punto de control.
             - Segunda curva Bézier cúbica desde C a D, usando `CP2` como punto de control.
-        2. Calcula los puntos de la curva para cada sección utilizando el método `cubic_bezier`.
+        2. Calcula todos los puntos de cada sección con un único producto entre la base de Bernstein
+        y sus cuatro puntos de control (`geometria.bezier_cubica`).
         3. Genera un conjunto de puntos equidistantes a lo largo de cada sección con `TRIANGLE_CHECKPOINTS`.
-        4. Combina ambas secciones para formar la trayectoria completa.
+        4. Escribe ambas secciones en un único array preasignado.
+        - Con `MUESTREO_ADAPTATIVO`, cada sección recibe los puntos justos para que la cuerda entre dos
+        consecutivos no se separe de la curva más de `TOLERANCIA_MUESTREO` ni mida más de `ESPACIADO_MAXIMO`
+        (`muestreoAdaptativo.bezier_adaptativa`), y C no se repite.
         """
 
-        trajectory = []
+        if self.config.MUESTREO_ADAPTATIVO:
+            tolerancia, espaciado = self.config.TOLERANCIA_MUESTREO, self.config.ESPACIADO_MAXIMO
+            return np.concatenate((bezier_adaptativa(B, CP1, CP1, C, tolerancia, espaciado),
+                                   bezier_adaptativa(C, CP2, CP2, D, tolerancia, espaciado)[1:]))
+
+        n = self.config.TRIANGLE_CHECKPOINTS
+        trajectory = np.empty((2 * n, 2), dtype=np.float64)
 
         # Primera parte: curva Bézier cúbica de B a C, con CP1 como punto de control
-        for t in np.linspace(0, 1, self.TRIANGLE_CHECKPOINTS):
-            point = self.cubic_bezier(t, np.array(B), np.array(CP1), np.array(CP1), np.array(C))
-            trajectory.append(point)
+        bezier_cubica(B, CP1, CP1, C, out=trajectory[:n])
 
         # Segunda parte: curva Bézier cúbica de C a D, con CP2 como punto de control
-        for t in np.linspace(0, 1, self.TRIANGLE_CHECKPOINTS):
-            point = self.cubic_bezier(t, np.array(C), np.array(CP2), np.array(CP2), np.array(D))
-            trajectory.append(point)
+        bezier_cubica(C, CP2, CP2, D, out=trajectory[n:])
+
+        return trajectory
+
+
+    # ###############################
+    # ---- SUPERFICIE DE CONTROL ----
+    # ###############################
+
+    def inferencia_exacta(self, distance, angle):
+        """
+        Ejecuta la inferencia difusa completa con el motor nativo `MotorMamdani`.
+
+        Args:
+            distance (float | numpy.ndarray): Distancia(s) al objetivo.
+            angle (float | numpy.ndarray): Valor(es) absoluto(s) del ángulo de giro en grados.
+
+        Returns:
+            tuple: Velocidades (V, W) resultantes de la defuzzificación, escalares o arrays
+            según sean las entradas.
+        """
+        result, confidence = self.motor_inferencia(distance=distance, angle=angle)
+        return result.get("linear_velocity", 0), result.get("angular_velocity", 0)
+
+    def inferencia_dispersa(self, distance, angle):
+        """
+        Ejecuta la inferencia de una sola entrada evaluando únicamente las reglas que se disparan.
+
+        Args:
+            distance (float): Distancia al objetivo.
+            angle (float): Valor absoluto del ángulo de giro en grados.
+
+        Returns:
+            tuple: Velocidades (V, W), iguales a las de `inferencia_exacta`.
+
+        Detalles:
+        - Los términos activos de cada entrada se buscan por bisección entre los puntos de quiebre de
+        sus términos, así que solo se recortan y agregan las consecuencias de las reglas con
+        activación no nula (4 de 12 como mucho con la base actual). El coste no crece con el número
+        de reglas de la tabla.
+        """
+        result, confidence = self.motor_disperso(distance=distance, angle=angle)
+        return result.get("linear_velocity", 0), result.get("angular_velocity", 0)
+
+    def inferencia_referencia(self, distance, angle):
+        """
+        Ejecuta la inferencia con `fuzzy_expert` (DecompositionalInference), que sirve de
+        referencia para comprobar el motor nativo. La primera llamada importa fuzzy_expert.
+
+        Returns:
+            tuple: Velocidades (V, W) resultantes de la defuzzificación.
+        """
+        variables, rules, inference_system = self.sistema_referencia(self.fichero_reglas)
+        result, confidence = inference_system(
+            variables=variables,
+            rules=rules,
+            distance=distance,
+            angle=angle
+        )
+        return result.get("linear_velocity", 0), result.get("angular_velocity", 0)
+
+    def compilar_superficie(self, niveles):
+        """
+        Precalcula la superficie de control (distance, angle) -> (V, W) sobre una rejilla.
+
+        Args:
+            niveles (int): Nodos adicionales junto a cada punto de quiebre de los términos de entrada.
+
+        Returns:
+            SuperficieControl: Superficie tabulada junto con la cota de su error (`error_maximo`).
 
-        return np.array(trajectory)
+        Detalles:
+        - La rejilla parte de los puntos de quiebre de `distance` y `angle`, divididos en
+        `SUBDIVISIONES_SUPERFICIE` tramos y densificados `niveles` veces hacia cada quiebre.
+        - Cada celda se valida en una subrejilla de `MUESTRAS_VALIDACION_SUPERFICIE` intervalos por
+        eje, aristas incluidas, de la que se deriva una cota del error en toda la celda (ver
+        `SuperficieControl.validar`). Las celdas cuya cota supera `TOLERANCIA_SUPERFICIE` se
+        resuelven con la inferencia exacta, así que toda decisión interpolada queda dentro de la
+        tolerancia mientras la superficie no cambie bruscamente dentro de una subcelda.
+        - La rejilla completa se evalúa en una sola llamada vectorizada al motor nativo.
+        """
+        return SuperficieControl.desde_variables(
+            self.inferencia_exacta,
+            self.variables,
+            self.config.TOLERANCIA_SUPERFICIE,
+            self.config.SUBDIVISIONES_SUPERFICIE,
+            niveles,
+            self.config.MUESTRAS_VALIDACION_SUPERFICIE
+        )
 
+    def crear_cache_inferencia(self):
+        """
+        Crea la caché LRU de la inferencia exacta sobre entradas cuantizadas.
+
+        Returns:
+            CacheInferencia: Caché vacía junto con el error estimado de la cuantización (`error_maximo`).
+
+        Detalles:
+        - `distance` se redondea a `RESOLUCION_CACHE_DISTANCIA` y `angle` a `RESOLUCION_CACHE_ANGULO`; la
+        inferencia se evalúa en el centro de la celda, así que resoluciones más gruesas dan más aciertos
+        a cambio de más error.
+        - Las distancias y ángulos donde la salida salta más que `TOLERANCIA_CACHE` dentro de una celda se
+        resuelven siempre con la inferencia exacta. Los saltos solo se buscan en las celdas junto a
+        los puntos de quiebre de los términos, así que `error_maximo` es una estimación medida, no
+        una cota del error en todas las celdas.
+        - Guarda como mucho `CAPACIDAD_CACHE` celdas y expulsa la usada hace más tiempo.
+        - Las estadísticas de aciertos y fallos se consultan con `cache_inferencia.estadisticas()`.
+        """
+        return CacheInferencia.desde_variables(
+            self.inferencia_exacta,
+            self.variables,
+            self.config.RESOLUCION_CACHE_DISTANCIA,
+            self.config.RESOLUCION_CACHE_ANGULO,
+            self.config.CAPACIDAD_CACHE,
+            self.config.TOLERANCIA_CACHE
+        )
+
+    # ########################
+    # ---- RUTA COMPILADA ----
+    # ########################
+
+    def parametros_trayectoria(self):
+        """
+        Constantes que intervienen en la generación de trayectorias; forman parte de la clave de la caché.
+        """
+        return {
+            "LINE_CHECKPOINTS": self.config.LINE_CHECKPOINTS,
+            "TRIANGLE_CHECKPOINTS": self.config.TRIANGLE_CHECKPOINTS,
+            "CONTROL_POINT_CONSTANT": self.config.CONTROL_POINT_CONSTANT,
+            "MUESTREO_ADAPTATIVO": self.config.MUESTREO_ADAPTATIVO,
+            "ESPACIADO_MAXIMO": self.config.ESPACIADO_MAXIMO,
+            "TOLERANCIA_MUESTREO": self.config.TOLERANCIA_MUESTREO,
+        }
+
+    def trayectoria_segmento(self, numero, segmento):
+        """
+        Genera la trayectoria de `segmento`, calculando antes sus puntos de control si es triangular.
+
+        Args:
+            numero (int): Número de segmento (no influye en la trayectoria de este controlador).
+            segmento (Segmento): Segmento de la ruta.
+
+        Returns:
+            numpy.array: Trayectoria del segmento.
+        """
+        if segmento.getType() == 1:
+            return self.generate_linear_path(segmento.getInicio(), segmento.getFin())
+        CP1, CP2 = self.calculate_control_points(segmento.getInicio(), segmento.getMedio(), segmento.getFin())
+        return self.generate_curved_path(segmento.getInicio(), segmento.getMedio(), segmento.getFin(), CP1, CP2)
+
+    def compilar_ruta(self, objetivos, directorio_cache=None):
+        """
+        Genera de una vez las trayectorias de todos los segmentos de la ruta.
+
+        Args:
+            objetivos (list): Segmentos de la ruta, en orden.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+
+        Returns:
+            RutaCompilada: Trayectorias de la ruta en un único array con desplazamientos por segmento.
+        """
+        if directorio_cache is None:
+            return RutaCompilada.compilar(objetivos, self.trayectoria_segmento)
+        return RutaCompilada.desde_cache(directorio_cache, objetivos, self.parametros_trayectoria(), self.trayectoria_segmento)
+
+    def obtener_trayectoria(self):
+        """
+        Trayectoria del segmento actual: la precalculada si hay ruta compilada, o generada en el momento.
+
+        Si la ruta es un flujo, antes lee los segmentos de la ventana por delante del actual y
+        actualiza `TOTAL_SEGMENT_NUMBER` (conocido en cuanto el flujo se agota).
+        """
+        if self.flujo is not None:
+            self.flujo.avanzar(self.segment_number)
+            self.TOTAL_SEGMENT_NUMBER = self.flujo.total
+        if self.ruta is not None and self.segment_number < len(self.ruta):
+            return self.ruta.trayectoria(self.segment_number)
+        return self.trayectoria_segmento(self.segment_number, self.segmentoObjetivo)
 
     # ########################
     # ---- CODIGO GENERAL ----
@@ -417,7 +617,7 @@ class FuzzySystem:
             poseRobot (tuple): Pose actual del robot, que incluye las coordenadas (x, y), el ángulo actual y otros datos adicionales.
 
         Returns:
-            tuple: Una tupla con las velocidades calculadas:
+            Decision: Tupla con nombre con las velocidades calculadas:
                 - Velocidad lineal (V)
                 - Velocidad angular (W)
 
@@ -427,7 +627,7 @@ class FuzzySystem:
         Este método realiza los siguientes pasos:
         1. Extrae las coordenadas actuales y el ángulo del robot.
         2. Calcula la distancia y el ángulo hacia el objetivo.
-        3. Utiliza un sistema de inferencia difusa para determinar las velocidades óptimas.
+        3. Utiliza un sistema de inferencia difusa (o la superficie precompilada, la caché de inferencia o la activación dispersa, si están activas) para determinar las velocidades óptimas.
         4. Verifica la proximidad al objetivo para detener el movimiento cuando sea necesario.
         """
 
@@ -436,6 +636,10 @@ class FuzzySystem:
         
         # Obtener las coordenadas del objetivo
         x_target, y_target = self.obtener_coordenadas_objetivo()
+
+        # Adelantar el checkpoint proyectando la pose sobre la trayectoria (opcional)
+        if self.config.AVANCE_POR_PROYECCION:
+            x_target, y_target = self.avanzar_checkpoint_por_proyeccion(x_robot, y_robot, x_target, y_target)
         
         # Calcular la distancia entre el robot y el objetivo
         self.distance = math.sqrt((x_target - x_robot) ** 2 + (y_target - y_robot) ** 2)
@@ -443,22 +647,23 @@ class FuzzySystem:
         # Calcular el ángulo hacia el objetivo
         angle = self.calcular_angulo(x_target, y_target, x_robot, y_robot, current_angle)
         
-        try:
-            # Realizar la inferencia difusa para determinar las velocidades
-            result, confidence = self.inference_system(
-                variables=self.variables,
-                rules=self.rules,
-                distance=self.distance,
-                angle=abs(angle)
-            )
-        except KeyError as e:
-            # Manejo de errores en caso de que falten variables o reglas
-            print(f"KeyError occurred: {e}. Verifique las definiciones de las variables y reglas.")
-            raise
-        
-        # Obtener la velocidad lineal y angular del resultado de la inferencia
-        V = result.get("linear_velocity", 0)  # Velocidad lineal
-        W = result.get("angular_velocity", 0)  # Velocidad angular
+        if self.superficie is not None:
+            # Consultar la superficie de control precompilada
+            V, W = self.superficie.evaluar(self.distance, abs(angle))
+        elif self.cache_inferencia is not None:
+            # Reutilizar la inferencia de la celda cuantizada si ya está en la caché
+            V, W = self.cache_inferencia.evaluar(self.distance, abs(angle))
+        elif self.motor_disperso is not None:
+            # Evaluar solo las reglas que se disparan
+            V, W = self.inferencia_dispersa(self.distance, abs(angle))
+        else:
+            try:
+                # Realizar la inferencia difusa para determinar las velocidades
+                V, W = self.inferencia_exacta(self.distance, abs(angle))
+            except KeyError as e:
+                # Manejo de errores en caso de que falten variables o reglas
+                logger.error("KeyError occurred: %s. Verifique las definiciones de las variables y reglas.", e)
+                raise
 
         # Si el ángulo es negativo, invertir la velocidad angular
         if angle < 0:
@@ -467,8 +672,18 @@ class FuzzySystem:
         # Verificar la proximidad al objetivo para detenerse si es necesario
         self.verificar_proximidad_objetivo(self.distance)
 
+        # Registrar el tick si la telemetría está activa
+        if self.telemetria is not None:
+            check_point = self.check_point_segmento if self.segmentoObjetivo.getType() == 1 else self.check_point_triangulo
+            self.telemetria.registrar(poseRobot, (x_target, y_target), self.segment_number, check_point,
+                                      V, W, self.reverse, self.FRENAR)
+
+        # Grabar el tick si hay una traza abierta
+        if self.traza is not None:
+            self.traza.registrar(self, poseRobot, V, W)
+
         # Retornar las velocidades calculadas
-        return (V, W)
+        return Decision(V, W)
     
     def obtener_coordenadas_objetivo(self):
         """
@@ -494,15 +709,15 @@ class FuzzySystem:
 
         if self.segmentoObjetivo.getType() == 1:
             # Guardar datos del primer punto del primer segmento
-            if self.VOLVER_AL_INICIO and self.segment_number == self.FIRST_SEGMENT_INDEX:
+            if self.config.VOLVER_AL_INICIO and self.segment_number == self.FIRST_SEGMENT_INDEX:
                 self.start_point = self.segmentoObjetivo.getInicio()
 
             # Obtener las coordenadas del objetivo
-            if self.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER:
+            if self.config.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER:
                 x_target, y_target = self.start_point
             else:
                 if self.check_point_segmento == 0:
-                    self.line_trayectory = self.generate_linear_path(self.segmentoObjetivo.getInicio(), self.segmentoObjetivo.getFin())
+                    self.line_trayectory = self.obtener_trayectoria()
                     x_target, y_target = self.line_trayectory[self.check_point_segmento]
                     self.FRENAR = False
                 elif self.check_point_segmento == len(self.line_trayectory)-1:
@@ -513,16 +728,14 @@ class FuzzySystem:
                     self.FRENAR = False
         else:
             # Obtener las coordenadas del objetivo
-            if self.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER:
+            if self.config.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER:
                 x_target, y_target = self.start_point
             else:
                 if self.check_point_triangulo == 0:
-                    CP1, CP2 = self.calculate_control_points(self.segmentoObjetivo.getInicio(), self.segmentoObjetivo.getMedio(), self.segmentoObjetivo.getFin())
-
-                    self.triangle_trayectory = self.generate_curved_path(self.segmentoObjetivo.getInicio(), self.segmentoObjetivo.getMedio(), self.segmentoObjetivo.getFin(), CP1, CP2)
+                    self.triangle_trayectory = self.obtener_trayectoria()
                     x_target, y_target = self.triangle_trayectory[self.check_point_triangulo]
                     self.FRENAR = False
-                elif self.check_point_triangulo == (self.TRIANGLE_CHECKPOINTS*2)-1:
+                elif self.check_point_triangulo == len(self.triangle_trayectory)-1:
                     x_target, y_target = self.triangle_trayectory[self.check_point_triangulo]
                     if self.segment_number == self.TOTAL_SEGMENT_NUMBER-1:
                         self.FRENAR = False
@@ -533,6 +746,37 @@ class FuzzySystem:
                     self.FRENAR = False
         return x_target, y_target
 
+    def avanzar_checkpoint_por_proyeccion(self, x_robot, y_robot, x_target, y_target):
+        """
+        Adelanta el checkpoint actual hasta el primero que queda por delante de la proyección del
+        robot sobre la trayectoria (ver `proyeccion.checkpoint_adelantado`).
+
+        Args:
+            x_robot (float): Coordenada X actual del robot.
+            y_robot (float): Coordenada Y actual del robot.
+            x_target (float): Coordenada X del objetivo elegido por `obtener_coordenadas_objetivo`.
+            y_target (float): Coordenada Y del objetivo elegido por `obtener_coordenadas_objetivo`.
+
+        Returns:
+            tuple: Coordenadas del objetivo tras el avance (x_target, y_target).
+        """
+        # En el regreso al inicio el objetivo es el punto inicial, no un checkpoint
+        if self.config.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER:
+            return x_target, y_target
+
+        if self.segmentoObjetivo.getType() == 1:
+            nuevo = checkpoint_adelantado(self.line_trayectory, x_robot, y_robot, self.check_point_segmento, self.config.VENTANA_PROYECCION)
+            if nuevo == self.check_point_segmento:
+                return x_target, y_target
+            self.check_point_segmento = nuevo
+            return tuple(self.line_trayectory[nuevo])
+
+        nuevo = checkpoint_adelantado(self.triangle_trayectory, x_robot, y_robot, self.check_point_triangulo, self.config.VENTANA_PROYECCION)
+        if nuevo == self.check_point_triangulo:
+            return x_target, y_target
+        self.check_point_triangulo = nuevo
+        return tuple(self.triangle_trayectory[nuevo])
+
     def calcular_angulo(self, x_target, y_target, x_robot, y_robot, current_angle):
         """
         Calcula el ángulo de giro necesario para que el robot apunte hacia un objetivo.
@@ -600,26 +844,26 @@ class FuzzySystem:
 
         if self.segmentoObjetivo.getType() == 1:
             # Si la distancia al objetivo es menor o igual a STOP_DISTANCE, detenerse completamente
-            if distance <= self.STOP_DISTANCE and self.check_point_segmento == len(self.line_trayectory)-1:
+            if distance <= self.config.STOP_DISTANCE and self.check_point_segmento == len(self.line_trayectory)-1:
                 self.objetivoAlcanzado = True  # Marcar el objetivo como alcanzado
                 self.segment_number += 1        # Pasar al siguiente segmento
 
                 # Control de lógica para volver al inicio
-                self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.VOLVER_AL_INICIO else True
+                self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.config.VOLVER_AL_INICIO else True
 
                 # Reiniciar el checkpoint
                 self.check_point_segmento = 0
 
             # --- ACTIVACIÓN DEL CHECKPOINT ---
-            elif distance < self.CHECKPOINT_DISTANCE_ACTIVATOR and self.check_point_segmento < len(self.line_trayectory)-1:
+            elif distance < self.config.CHECKPOINT_DISTANCE_ACTIVATOR and self.check_point_segmento < len(self.line_trayectory)-1:
                 self.check_point_segmento += 1
         else:
-            if distance <= 0.5 and self.check_point_triangulo == (self.TRIANGLE_CHECKPOINTS*2)-1:
+            if distance <= 0.5 and self.check_point_triangulo == len(self.triangle_trayectory)-1:
                 self.objetivoAlcanzado = True
                 self.check_point_triangulo = 0
                 self.segment_number += 1 
 
-            elif distance <= self.MINIMUM_DISTANCE_TRIANGLE_CP and self.check_point_triangulo <= (self.TRIANGLE_CHECKPOINTS*2)-2:
+            elif distance <= self.config.MINIMUM_DISTANCE_TRIANGLE_CP and self.check_point_triangulo <= len(self.triangle_trayectory)-2:
                 self.check_point_triangulo += 1
 
     def esObjetivoAlcanzado(self):
@@ -0,0 +1,162 @@
+'''
+ Controlador de flota para el FuzzySystem
+ Aplica la lógica de FuzzySystem a N robots a la vez, guardando el estado de
+ cada robot en arrays y resolviendo la inferencia de toda la flota en una sola
+ llamada al motor nativo.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import numpy as np
+from fuzzyExpert import ConfiguracionDifusa, FuzzySystem
+from rutaCompilada import RutaCompilada
+from rutaLanzador import objetivos_lanzador
+
+
+class FlotaFuzzySystem:
+    """
+    Versión vectorizada de `FuzzySystem.tomarDecision` para una flota de robots sobre la misma ruta.
+
+    Cada robot tiene como objetivo un segmento de la ruta (`indice_objetivo`), que asigna el
+    lanzador con `setObjetivo`. Las trayectorias de todos los segmentos se generan una sola vez
+    con un `FuzzySystem` de plantilla, cuyo `motor_inferencia` se usa para toda la flota.
+    """
+
+    def __init__(self, numero_robots: int, objetivos=None, directorio_cache: str = None,
+                 configuracion: ConfiguracionDifusa = None, **constantes) -> None:
+        """
+        Args:
+            numero_robots (int): Número de robots de la flota.
+            objetivos (list, opcional): Segmentos de la ruta. Por defecto `P1Launcher.objectiveSet`.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+            configuracion (ConfiguracionDifusa, opcional): Constantes de ajuste de la plantilla.
+            **constantes: Constantes de ajuste de la plantilla (ver `FuzzySystem.CONSTANTES_AJUSTE`).
+
+        Raises:
+            ValueError: Si la plantilla usa `AVANCE_POR_PROYECCION`; la flota solo avanza los
+                checkpoints por proximidad.
+        """
+        if objetivos is None:
+            objetivos = objetivos_lanzador()
+
+        # --- Plantilla con las constantes, los generadores y el motor de inferencia ---
+        self.objetivos: list = list(objetivos)
+        self.plantilla: FuzzySystem = FuzzySystem(objetivos=self.objetivos, configuracion=configuracion, **constantes)
+        self.TOTAL_SEGMENT_NUMBER: int = len(self.objetivos)
+        if self.plantilla.config.AVANCE_POR_PROYECCION:
+            raise ValueError("FlotaFuzzySystem no admite AVANCE_POR_PROYECCION")
+
+        # --- Trayectorias de la ruta: puntos contiguos y desplazamiento de cada segmento ---
+        self.ruta: RutaCompilada = self.plantilla.compilar_ruta(self.objetivos, directorio_cache)
+        self.tipos, self.puntos, self.offsets = self.ruta.tipos, self.ruta.puntos, self.ruta.offsets
+        self.longitudes: np.ndarray = self.ruta.longitudes
+
+        # --- Estado por robot (estructura de arrays) ---
+        n = numero_robots
+        self.indice_objetivo: np.ndarray = np.zeros(n, dtype=np.int64)          # Segmento objetivo de cada robot
+        self.objetivoAlcanzado: np.ndarray = np.zeros(n, dtype=bool)
+        self.segment_number: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.check_point_segmento: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.check_point_triangulo: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.start_point: np.ndarray = np.zeros((n, 2))                         # Punto al que volver al final
+        self.distance: np.ndarray = np.zeros(n)
+
+    def setObjetivo(self, indice_segmento, robots=None):
+        """
+        Asigna a los robots indicados (todos por defecto) el segmento `indice_segmento` de la ruta.
+        """
+        robots = slice(None) if robots is None else robots
+        self.objetivoAlcanzado[robots] = False
+        self.indice_objetivo[robots] = indice_segmento
+
+    def esObjetivoAlcanzado(self):
+        return self.objetivoAlcanzado
+
+    def normalize_angle(self, angle):
+        return (angle + 180) % 360 - 180
+
+    def calcular_angulo(self, x_target, y_target, x_robot, y_robot, current_angle):
+        """
+        Diferencia angular, en grados, entre la dirección hacia cada objetivo y la orientación de cada robot.
+        """
+        goal_angle_degrees = self.normalize_angle(np.degrees(np.arctan2(y_target - y_robot, x_target - x_robot)))
+        current_angle = self.normalize_angle(current_angle)
+        return self.normalize_angle(goal_angle_degrees - current_angle)
+
+    def obtener_coordenadas_objetivo(self, linea):
+        """
+        Selecciona el checkpoint objetivo de cada robot, o el punto inicial si ya ha completado la ruta.
+
+        Args:
+            linea (numpy.ndarray): Máscara de los robots cuyo segmento objetivo es lineal.
+        """
+        p = self.plantilla.config
+        if p.VOLVER_AL_INICIO:
+            # Guardar el primer punto del primer segmento
+            en_primero = linea & (self.segment_number == FuzzySystem.FIRST_SEGMENT_INDEX)
+            self.start_point[en_primero] = self.puntos[self.offsets[self.indice_objetivo[en_primero]]]
+
+        check_point = np.where(linea, self.check_point_segmento, self.check_point_triangulo)
+        objetivo = self.puntos[self.offsets[self.indice_objetivo] + check_point]
+
+        if p.VOLVER_AL_INICIO:
+            volviendo = self.segment_number == self.TOTAL_SEGMENT_NUMBER
+            objetivo[volviendo] = self.start_point[volviendo]
+
+        return objetivo[:, 0], objetivo[:, 1]
+
+    def verificar_proximidad_objetivo(self, linea, distance):
+        """
+        Transiciones de checkpoint y segmento de `FuzzySystem.verificar_proximidad_objetivo`.
+        """
+        p = self.plantilla.config
+        ultimo = self.longitudes[self.indice_objetivo] - 1
+        triangulo = ~linea
+
+        # --- Segmentos lineales ---
+        fin_linea = linea & (distance <= p.STOP_DISTANCE) & (self.check_point_segmento == ultimo)
+        siguiente_linea = linea & ~fin_linea & (distance < p.CHECKPOINT_DISTANCE_ACTIVATOR) & (self.check_point_segmento < ultimo)
+
+        self.segment_number[fin_linea] += 1
+        if p.VOLVER_AL_INICIO:
+            self.objetivoAlcanzado[fin_linea] = self.segment_number[fin_linea] != self.TOTAL_SEGMENT_NUMBER
+        else:
+            self.objetivoAlcanzado[fin_linea] = True
+        self.check_point_segmento[fin_linea] = 0
+        self.check_point_segmento[siguiente_linea] += 1
+
+        # --- Segmentos triangulares ---
+        fin_triangulo = triangulo & (distance <= 0.5) & (self.check_point_triangulo == ultimo)
+        siguiente_triangulo = triangulo & ~fin_triangulo & (distance <= p.MINIMUM_DISTANCE_TRIANGLE_CP) & (self.check_point_triangulo <= ultimo - 1)
+
+        self.objetivoAlcanzado[fin_triangulo] = True
+        self.check_point_triangulo[fin_triangulo] = 0
+        self.segment_number[fin_triangulo] += 1
+        self.check_point_triangulo[siguiente_triangulo] += 1
+
+    def tomarDecision(self, posesRobots):
+        """
+        Calcula las velocidades de todos los robots de la flota en una sola llamada.
+
+        Args:
+            posesRobots (numpy.ndarray): Array (N, >=3) con (x_robot, y_robot, current_angle) de cada robot.
+
+        Returns:
+            tuple: Arrays (V, W) de velocidades lineales y angulares, de longitud N.
+        """
+        poses = np.asarray(posesRobots, dtype=np.float64)
+        x_robot, y_robot, current_angle = poses[:, 0], poses[:, 1], poses[:, 2]
+        linea = self.tipos[self.indice_objetivo] == 1
+
+        x_target, y_target = self.obtener_coordenadas_objetivo(linea)
+        self.distance = np.sqrt((x_target - x_robot) ** 2 + (y_target - y_robot) ** 2)
+        angle = self.calcular_angulo(x_target, y_target, x_robot, y_robot, current_angle)
+
+        # Inferencia de toda la flota en una sola llamada vectorizada
+        V, W = self.plantilla.inferencia_exacta(self.distance, np.abs(angle))
+        W = np.where(angle < 0, -W, W)
+
+        self.verificar_proximidad_objetivo(linea, self.distance)
+
+        return V, W
@@ -0,0 +1,225 @@
+'''
+ Motor de inferencia Mamdani vectorizado
+ Reproduce con NumPy la inferencia DecompositionalInference de fuzzy_expert
+ (min / max / Rc / max-min / cog) para entradas nítidas, evaluando miles de
+ entradas en una sola llamada.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import numpy as np
+
+
+class MotorMamdani:
+    """
+    Motor de inferencia Mamdani compilado a partir de variables y reglas con la interfaz de `fuzzy_expert`.
+
+    Las variables y reglas se convierten una sola vez en matrices de pertenencia:
+    - Entradas: una matriz (términos x universo) por variable, evaluada por interpolación.
+    - Reglas: índices de variable y término de cada premisa y consecuencia.
+    - Salidas: una matriz (términos x universo) por variable, sobre el mismo universo que usa
+    `fuzzy_expert`, para que la defuzzificación dé los mismos números.
+
+    Detalles:
+    - Con una entrada nítida, la composición max-min de la implicación Rc se reduce a
+    `min(pertenencia de la premisa en la entrada, consecuencia)`, que es lo que se calcula aquí.
+    - Como en `fuzzy_expert`, una entrada fuera del universo de su variable no activa ningún término.
+    """
+
+    OPERADORES_SOPORTADOS = {
+        "and_operator": ("min",),
+        "or_operator": ("max",),
+        "implication_operator": ("Rc",),
+        "composition_operator": ("max-min",),
+        "production_link": ("max",),
+        "defuzzification_operator": ("cog",),
+    }
+
+    def __init__(self, variables, rules) -> None:
+        """
+        Args:
+            variables (dict): Variables difusas (`VariableDifusa` o `FuzzyVariable`) indexadas por nombre.
+            rules (list): Reglas difusas (`ReglaDifusa` o `FuzzyRule`).
+
+        Raises:
+            ValueError: Si alguna proposición usa modificadores, que este motor no implementa.
+        """
+        # --- Variables de entrada y salida ---
+        self.entradas: dict = {}                      # nombre -> (universo, nombres de términos, matriz de pertenencia)
+        self.salidas: dict = {}                       # nombre -> (universo, nombres de términos, matriz de pertenencia)
+
+        # --- Reglas compiladas ---
+        self.premisas: list = []                      # Por regla: [(operador, variable, índice de término), ...]
+        self.consecuencias: list = []                 # Por regla: [(variable, índice de término), ...]
+
+        for rule in rules:
+            premisa = []
+            for i_proposicion, proposicion in enumerate(rule.premise):
+                operador = None if i_proposicion == 0 else proposicion[0]
+                proposicion = proposicion if i_proposicion == 0 else proposicion[1:]
+                if len(proposicion) != 2:
+                    raise ValueError(f"Modificadores no soportados en la premisa {proposicion}")
+                nombre, termino = proposicion
+                premisa.append((operador, nombre, self._indice_termino(self.entradas, variables, nombre, termino)))
+
+            consecuencia = []
+            for proposicion in rule.consequence:
+                if len(proposicion) != 2:
+                    raise ValueError(f"Modificadores no soportados en la consecuencia {proposicion}")
+                nombre, termino = proposicion
+                consecuencia.append((nombre, self._indice_termino(self.salidas, variables, nombre, termino)))
+
+            self.premisas.append(premisa)
+            self.consecuencias.append(consecuencia)
+
+        # --- Factores de certeza (constantes para entradas nítidas) ---
+        self.reglas_activas: list = [rule.rule_cf >= rule.threshold_cf for rule in rules]
+        self.factor_certeza: float = max(rule.rule_cf for rule in rules)
+
+    @classmethod
+    def desde_inferencia(cls, inference_system, variables, rules):
+        """
+        Compila el motor comprobando antes que la configuración de `inference_system` es la que reproduce.
+
+        Raises:
+            ValueError: Si algún operador de `inference_system` no está soportado.
+        """
+        for atributo, soportados in cls.OPERADORES_SOPORTADOS.items():
+            if getattr(inference_system, atributo) not in soportados:
+                raise ValueError(f"{atributo}={getattr(inference_system, atributo)!r} no soportado por MotorMamdani")
+        return cls(variables, rules)
+
+    @staticmethod
+    def _indice_termino(destino, variables, nombre, termino):
+        """
+        Registra la variable `nombre` en `destino` (si no lo estaba) y devuelve el índice de `termino`.
+        """
+        if nombre not in destino:
+            variable = variables[nombre]
+            terminos = list(variable.terms.keys())
+            matriz = np.array([variable.terms[t] for t in terminos], dtype=np.float64)
+            destino[nombre] = (np.array(variable.universe, dtype=np.float64), terminos, matriz)
+        return destino[nombre][1].index(termino)
+
+    def fuzzificar(self, nombre, valores):
+        """
+        Calcula la pertenencia de cada valor a todos los términos de una variable de entrada.
+
+        Args:
+            nombre (str): Nombre de la variable de entrada.
+            valores (numpy.ndarray): Valores nítidos, de forma (N,).
+
+        Returns:
+            numpy.ndarray: Pertenencias de forma (N, términos).
+        """
+        universo, _, matriz = self.entradas[nombre]
+        pertenencia = np.empty((len(valores), len(matriz)), dtype=np.float64)
+        for i_termino, termino in enumerate(matriz):
+            pertenencia[:, i_termino] = np.interp(valores, universo, termino)
+
+        # Fuera del universo el hecho no coincide con ningún punto y no activa nada
+        fuera = (valores < universo[0]) | (valores > universo[-1])
+        pertenencia[fuera] = 0.0
+        return pertenencia
+
+    def grados_activacion(self, pertenencias):
+        """
+        Combina las premisas de cada regla con los operadores AND (min) y OR (max).
+
+        Returns:
+            numpy.ndarray: Grado de activación de cada regla, de forma (N, reglas).
+        """
+        n = len(next(iter(pertenencias.values())))
+        activacion = np.empty((n, len(self.premisas)), dtype=np.float64)
+
+        for i_regla, premisa in enumerate(self.premisas):
+            grado = None
+            for operador, nombre, i_termino in premisa:
+                valor = pertenencias[nombre][:, i_termino]
+                if grado is None:
+                    grado = valor
+                elif operador == "AND":
+                    grado = np.minimum(grado, valor)
+                else:
+                    grado = np.maximum(grado, valor)
+            activacion[:, i_regla] = grado
+
+        return activacion
+
+    def agregar(self, activacion):
+        """
+        Recorta la consecuencia de cada regla con su activación (Rc) y agrega con el máximo.
+        Las reglas que no se disparan en ninguna entrada no aportan nada al máximo y se saltan.
+
+        Returns:
+            dict: Por variable de salida, la pertenencia agregada de forma (N, universo).
+        """
+        agregadas = {nombre: np.zeros((len(activacion), len(universo)), dtype=np.float64)
+                     for nombre, (universo, _, _) in self.salidas.items()}
+
+        for i_regla, consecuencia in enumerate(self.consecuencias):
+            grado = activacion[:, i_regla, None]
+            if not self.reglas_activas[i_regla] or not grado.any():
+                continue
+            for nombre, i_termino in consecuencia:
+                recorte = np.minimum(grado, self.salidas[nombre][2][i_termino])
+                np.maximum(agregadas[nombre], recorte, out=agregadas[nombre])
+
+        return agregadas
+
+    @staticmethod
+    def centro_de_gravedad(universo, pertenencia):
+        """
+        Defuzzificación por centro de gravedad, con la misma descomposición en rectángulos
+        y triángulos que `fuzzy_expert.operators.defuzzificate`.
+
+        Args:
+            universo (numpy.ndarray): Universo de la variable, de forma (U,).
+            pertenencia (numpy.ndarray): Pertenencias agregadas, de forma (N, U).
+
+        Returns:
+            numpy.ndarray: Valor nítido de cada fila, de forma (N,).
+        """
+        base = np.diff(universo)
+        izquierda = pertenencia[:, :-1]
+        derecha = pertenencia[:, 1:]
+
+        area_rect = np.minimum(izquierda, derecha) * base
+        centro_rect = universo[:-1] + base / 2.0
+
+        area_tri = base * np.abs(derecha - izquierda) / 2.0
+        centro_tri = np.where(derecha > izquierda, universo[:-1] + 2.0 / 3.0 * base, universo[:-1] + 1.0 / 3.0 * base)
+
+        numerador = np.sum(area_rect * centro_rect + area_tri * centro_tri, axis=1)
+        denominador = np.sum(area_rect + area_tri, axis=1)
+
+        # Sin ninguna regla activada, fuzzy_expert devuelve el punto medio del universo
+        vacia = np.sum(pertenencia, axis=1) == 0.0
+        return np.where(vacia, np.mean(universo), numerador / np.where(vacia, 1.0, denominador))
+
+    def __call__(self, **entradas):
+        """
+        Ejecuta la inferencia para uno o varios valores de cada entrada.
+
+        Args:
+            **entradas: Valor nítido (float) o array de valores de cada variable de entrada.
+
+        Returns:
+            tuple: (resultado, factor de certeza), donde `resultado` asocia cada variable de salida
+            a un float (entradas escalares) o a un array con la forma de las entradas.
+        """
+        escalar = all(np.ndim(valor) == 0 for valor in entradas.values())
+        valores = {nombre: np.atleast_1d(np.asarray(valor, dtype=np.float64)) for nombre, valor in entradas.items()}
+        forma = np.broadcast_shapes(*(valor.shape for valor in valores.values()))
+
+        pertenencias = {nombre: self.fuzzificar(nombre, np.broadcast_to(valor, forma).ravel())
+                        for nombre, valor in valores.items()}
+        agregadas = self.agregar(self.grados_activacion(pertenencias))
+
+        resultado = {}
+        for nombre, pertenencia in agregadas.items():
+            nitido = self.centro_de_gravedad(self.salidas[nombre][0], pertenencia).reshape(forma)
+            resultado[nombre] = float(nitido[0]) if escalar else nitido
+
+        return resultado, self.factor_certeza
@@ -0,0 +1,108 @@
+'''
+ Visualización del FuzzySystem
+ Punto de entrada para dibujar la base de conocimiento: funciones de pertenencia
+ de cada variable y superficies de control (distance, angle) -> (V, W). Es el
+ único módulo de los controladores que usa matplotlib, que se importa al dibujar,
+ así que ni importar `fuzzyExpert` ni construir un controlador lo cargan.
+
+ Uso:
+     python FuzzyExpert/fuzzyPlots.py [--reglas baseConocimiento.toml] [--resolucion N] [--guardar figura.png]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import os
+import sys
+
+import numpy as np
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(CARPETA)
+sys.path[:0] = [os.getcwd(), CARPETA] + [os.path.join(RAIZ, carpeta) for carpeta in ("Comun", "Simulador")]
+
+from fuzzyExpert import FuzzySystem
+from fuzzyRules import FICHERO_BASE_CONOCIMIENTO
+
+
+def graficar_variables(variables, ejes):
+    """
+    Dibuja las funciones de pertenencia de cada variable en su eje.
+
+    Args:
+        variables (dict): Variables difusas (`VariableDifusa`) indexadas por nombre.
+        ejes (iterable): Ejes de matplotlib, uno por variable.
+    """
+    for (nombre, variable), eje in zip(variables.items(), ejes):
+        for termino, pertenencia in variable.terms.items():
+            eje.plot(variable.universe, pertenencia, linewidth=2, label=termino)
+        eje.set_title(nombre)
+        eje.set_ylim(-0.05, 1.05)
+        eje.legend(fontsize="small")
+
+
+def graficar_superficie(motor, variables, ejes, resolucion: int = 121):
+    """
+    Dibuja las superficies de control de las salidas sobre el universo de las entradas.
+
+    Args:
+        motor (MotorMamdani): Motor de inferencia del controlador.
+        variables (dict): Variables difusas, de las que se toman los universos de `distance` y `angle`.
+        ejes (iterable): Ejes de matplotlib, uno por salida del motor.
+        resolucion (int): Puntos por entrada de la rejilla.
+
+    Detalles:
+    - La rejilla completa se evalúa en una sola llamada vectorizada al motor nativo.
+    """
+    distancia = np.linspace(*variables["distance"].universe_range, resolucion)
+    angulo = np.linspace(*variables["angle"].universe_range, resolucion)
+    D, A = np.meshgrid(distancia, angulo, indexing="ij")
+    salidas, _ = motor(distance=D.ravel(), angle=A.ravel())
+
+    for (nombre, valores), eje in zip(salidas.items(), ejes):
+        mapa = eje.pcolormesh(angulo, distancia, np.asarray(valores).reshape(D.shape), shading="auto")
+        eje.figure.colorbar(mapa, ax=eje)
+        eje.set_title(nombre)
+        eje.set_xlabel("angle")
+        eje.set_ylabel("distance")
+
+
+def figura_base_conocimiento(fichero_reglas=FICHERO_BASE_CONOCIMIENTO, resolucion: int = 121):
+    """
+    Figura con las variables y las superficies de control de una base de conocimiento.
+
+    Returns:
+        matplotlib.figure.Figure: Figura con una fila de variables y otra de superficies.
+    """
+    import matplotlib.pyplot as plt
+
+    variables, _, _, motor = FuzzySystem.base_conocimiento(fichero_reglas)
+    columnas = max(len(variables), len(motor.salidas))
+    figura, ejes = plt.subplots(2, columnas, figsize=(4 * columnas, 7), squeeze=False)
+    graficar_variables(variables, ejes[0])
+    graficar_superficie(motor, variables, ejes[1], resolucion)
+    for eje in list(ejes[0][len(variables):]) + list(ejes[1][len(motor.salidas):]):
+        eje.set_visible(False)
+    figura.tight_layout()
+    return figura
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reglas", default=FICHERO_BASE_CONOCIMIENTO, help="Base de conocimiento en TOML")
+    parser.add_argument("--resolucion", type=int, default=121, help="Puntos por entrada de las superficies")
+    parser.add_argument("--guardar", metavar="FICHERO", help="Guarda la figura en lugar de mostrarla")
+    args = parser.parse_args()
+
+    import matplotlib.pyplot as plt
+
+    figura = figura_base_conocimiento(args.reglas, args.resolucion)
+    if args.guardar:
+        figura.savefig(args.guardar, dpi=120)
+    else:
+        plt.show()
+
+
+if __name__ == "__main__":
+    main()
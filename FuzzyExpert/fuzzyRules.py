@@ -0,0 +1,246 @@
+'''
+ Tablas de reglas del FuzzySystem
+ Carga la base de conocimiento (variables y reglas) desde un fichero TOML, o las
+ reglas desde matrices CSV, y la compila: la lista de reglas Mamdani y, para
+ cada salida, una matriz de índices de términos indexada por el par de términos
+ de entrada. Las variables y reglas son propias, con los mismos atributos que
+ las de fuzzy_expert, para no importar esa librería (ni matplotlib, que importa
+ ella) salvo cuando se pide su inferencia de referencia (`a_fuzzy_expert`).
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import csv
+import os
+import tomllib
+from dataclasses import dataclass
+
+import numpy as np
+
+# Base de conocimiento por defecto del FuzzySystem
+FICHERO_BASE_CONOCIMIENTO: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseConocimiento.toml")
+
+
+class VariableDifusa:
+    """
+    Variable difusa con términos lineales a trozos, discretizada igual que `fuzzy_expert.variable.FuzzyVariable`.
+
+    Expone los mismos atributos que usan los motores (`universe`, `terms`, `universe_range`) y,
+    además, la definición original de los términos (`definicion`) para reconstruirla con fuzzy_expert.
+    """
+
+    __slots__ = ("universe_range", "definicion", "paso", "universe", "terms")
+
+    def __init__(self, universe_range, terms, paso: float = 0.1) -> None:
+        """
+        Args:
+            universe_range (tuple): Límites (mínimo, máximo) del universo.
+            terms (dict): Término -> lista de puntos (x, pertenencia).
+            paso (float): Resolución del universo discreto (la de `FuzzyVariable` por defecto).
+
+        Detalles:
+        - Sigue los mismos pasos que `FuzzyVariable`: universo equiespaciado y, por cada término en
+        orden, se añaden sus puntos al universo, se reinterpolan los términos anteriores y se
+        interpola el nuevo. Así los arrays son idénticos y la inferencia da los mismos números.
+        """
+        self.universe_range: tuple = tuple(universe_range)
+        self.definicion: dict = {termino: [tuple(punto) for punto in puntos] for termino, puntos in terms.items()}
+        self.paso: float = paso
+
+        minimo, maximo = self.universe_range
+        self.universe: np.ndarray = np.linspace(minimo, maximo, int((maximo - minimo) / paso) + 1)
+        self.terms: dict = {}
+        for termino, puntos in self.definicion.items():
+            xp = [x for x, _ in puntos]
+            fp = [f for _, f in puntos]
+            universo = np.sort(np.unique(np.clip(np.append(self.universe, xp), minimo, maximo)))
+            for nombre in self.terms:
+                self.terms[nombre] = np.interp(universo, self.universe, self.terms[nombre])
+            self.universe = universo
+            self.terms[termino] = np.interp(self.universe, xp, fp)
+
+
+@dataclass(frozen=True)
+class ReglaDifusa:
+    """
+    Regla Mamdani con los mismos atributos que `fuzzy_expert.rule.FuzzyRule`.
+    """
+
+    premise: tuple                                    # ((variable, término), ("AND", variable, término), ...)
+    consequence: tuple                                # ((variable, término), ...)
+    rule_cf: float = 1.0                              # Factor de certeza de la regla
+    threshold_cf: float = 0.0                         # Factor de certeza mínimo para dispararla
+
+
+@dataclass(frozen=True)
+class TablaReglas:
+    """
+    Reglas sobre el producto de los términos de dos entradas.
+
+    La celda (f, c) de la matriz de cada salida es la consecuencia de la regla
+    `IF filas IS terminos_filas[f] AND columnas IS terminos_columnas[c] THEN salida IS celda`;
+    una celda None no genera consecuencia para esa salida.
+    """
+
+    filas: str                                        # Variable de entrada de las filas
+    columnas: str                                     # Variable de entrada de las columnas
+    terminos_filas: tuple                             # Términos de `filas`, en el orden de las filas
+    terminos_columnas: tuple                          # Términos de `columnas`, en el orden de las columnas
+    consecuencias: dict                               # Salida -> tupla de filas de términos (o None)
+
+    @classmethod
+    def desde_diccionario(cls, datos):
+        """
+        Construye la tabla a partir de la sección `[reglas]` de la base de conocimiento.
+
+        Raises:
+            ValueError: Si falta alguna fila o alguna fila no tiene una celda por columna.
+        """
+        terminos_filas = tuple(datos["terminos_filas"])
+        terminos_columnas = tuple(datos["terminos_columnas"])
+
+        consecuencias = {}
+        for salida, matriz in datos["consecuencias"].items():
+            faltan = set(terminos_filas) - set(matriz)
+            if faltan:
+                raise ValueError(f"Faltan las filas {sorted(faltan)} en las consecuencias de {salida!r}")
+            for termino in terminos_filas:
+                if len(matriz[termino]) != len(terminos_columnas):
+                    raise ValueError(f"La fila {termino!r} de {salida!r} tiene {len(matriz[termino])} celdas "
+                                     f"y hay {len(terminos_columnas)} columnas")
+            consecuencias[salida] = tuple(tuple(celda or None for celda in matriz[termino]) for termino in terminos_filas)
+
+        return cls(datos["filas"], datos["columnas"], terminos_filas, terminos_columnas, consecuencias)
+
+    @classmethod
+    def desde_csv(cls, ficheros):
+        """
+        Construye la tabla a partir de una matriz CSV por salida.
+
+        Args:
+            ficheros (dict): Salida -> fichero CSV. La primera celda es `filas\\columnas` (p. ej.
+                `distance\\angle`), el resto de la cabecera los términos de las columnas y cada
+                fila empieza por su término.
+
+        Raises:
+            ValueError: Si las matrices no tienen las mismas entradas y términos.
+        """
+        tablas = []
+        for salida, fichero in ficheros.items():
+            with open(fichero, newline="", encoding="utf-8") as f:
+                filas_csv = [[celda.strip() for celda in fila] for fila in csv.reader(f) if fila]
+            filas, _, columnas = filas_csv[0][0].partition("\\")
+            datos = {
+                "filas": filas,
+                "columnas": columnas,
+                "terminos_filas": [fila[0] for fila in filas_csv[1:]],
+                "terminos_columnas": filas_csv[0][1:],
+                "consecuencias": {salida: {fila[0]: fila[1:] for fila in filas_csv[1:]}},
+            }
+            tablas.append(cls.desde_diccionario(datos))
+
+        primera = tablas[0]
+        for tabla in tablas[1:]:
+            if (tabla.filas, tabla.columnas, tabla.terminos_filas, tabla.terminos_columnas) != \
+                    (primera.filas, primera.columnas, primera.terminos_filas, primera.terminos_columnas):
+                raise ValueError("Las matrices CSV no tienen las mismas entradas y términos")
+        consecuencias = {salida: matriz for tabla in tablas for salida, matriz in tabla.consecuencias.items()}
+        return cls(primera.filas, primera.columnas, primera.terminos_filas, primera.terminos_columnas, consecuencias)
+
+    def validar(self, variables):
+        """
+        Comprueba que todas las variables y términos de la tabla están definidos en `variables`.
+
+        Raises:
+            ValueError: Si falta alguna variable o término.
+        """
+        usados = {self.filas: self.terminos_filas, self.columnas: self.terminos_columnas}
+        for salida, matriz in self.consecuencias.items():
+            usados[salida] = {celda for fila in matriz for celda in fila if celda is not None}
+
+        for nombre, terminos in usados.items():
+            if nombre not in variables:
+                raise ValueError(f"Variable {nombre!r} no definida")
+            desconocidos = set(terminos) - set(variables[nombre].terms)
+            if desconocidos:
+                raise ValueError(f"Términos {sorted(desconocidos)} no definidos en la variable {nombre!r}")
+
+    def reglas(self):
+        """
+        Lista de `ReglaDifusa` de la tabla, fila a fila; las celdas sin ninguna consecuencia no generan regla.
+        """
+        reglas = []
+        for f, termino_fila in enumerate(self.terminos_filas):
+            for c, termino_columna in enumerate(self.terminos_columnas):
+                consecuencia = [(salida, matriz[f][c]) for salida, matriz in self.consecuencias.items()
+                                if matriz[f][c] is not None]
+                if consecuencia:
+                    reglas.append(ReglaDifusa(
+                        premise=((self.filas, termino_fila), ("AND", self.columnas, termino_columna)),
+                        consequence=tuple(consecuencia),
+                    ))
+        return reglas
+
+    def indices(self, variables):
+        """
+        Compila la tabla a índices de términos.
+
+        Returns:
+            dict: Salida -> array de enteros (filas, columnas) con el índice de la consecuencia de cada
+            par de términos en `variables[salida].terms`, o -1 si la celda está vacía.
+        """
+        indices = {}
+        for salida, matriz in self.consecuencias.items():
+            terminos = list(variables[salida].terms)
+            indices[salida] = np.array([[terminos.index(celda) if celda is not None else -1 for celda in fila]
+                                        for fila in matriz], dtype=np.int64)
+        return indices
+
+
+def variables_desde_diccionario(datos):
+    """
+    Construye las `VariableDifusa` de la sección `[variables]` de la base de conocimiento.
+    """
+    return {nombre: VariableDifusa(variable["universo"], variable["terminos"]) for nombre, variable in datos.items()}
+
+
+def a_fuzzy_expert(variables, reglas):
+    """
+    Convierte variables y reglas a los tipos de fuzzy_expert, importándolo en este momento.
+
+    Returns:
+        tuple: (variables `FuzzyVariable` indexadas por nombre, lista de `FuzzyRule`).
+    """
+    from fuzzy_expert.rule import FuzzyRule
+    from fuzzy_expert.variable import FuzzyVariable
+
+    variables_fe = {
+        nombre: FuzzyVariable(universe_range=variable.universe_range, step=variable.paso,
+                              terms={termino: list(puntos) for termino, puntos in variable.definicion.items()})
+        for nombre, variable in variables.items()
+    }
+    reglas_fe = [FuzzyRule(premise=list(regla.premise), consequence=list(regla.consequence),
+                           cf=regla.rule_cf, threshold_cf=regla.threshold_cf) for regla in reglas]
+    return variables_fe, reglas_fe
+
+
+def cargar_base_conocimiento(fichero=FICHERO_BASE_CONOCIMIENTO):
+    """
+    Carga las variables y la tabla de reglas de un fichero TOML.
+
+    Args:
+        fichero (str): Fichero TOML con las secciones `[variables]` y `[reglas]` (ver `baseConocimiento.toml`).
+
+    Returns:
+        tuple: (variables, tabla), con las variables difusas indexadas por nombre y la `TablaReglas`.
+
+    Raises:
+        ValueError: Si la tabla usa variables o términos que no están definidos.
+    """
+    with open(fichero, "rb") as f:
+        datos = tomllib.load(f)
+    variables = variables_desde_diccionario(datos["variables"])
+    tabla = TablaReglas.desde_diccionario(datos["reglas"])
+    tabla.validar(variables)
+    return variables, tabla
@@ -0,0 +1,173 @@
+'''
+ Inferencia difusa por activación dispersa
+ Con términos lineales a trozos, una entrada nítida solo activa los términos
+ cuyo soporte la contiene (dos como mucho con las variables actuales), así que
+ de las reglas de la tabla solo se disparan las de esos pares de términos. Este
+ motor localiza los términos activos con una búsqueda binaria sobre los puntos
+ de quiebre ordenados y evalúa únicamente las reglas que se disparan, de modo
+ que el coste por decisión no depende del tamaño de la base de reglas.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from bisect import bisect_right
+
+import numpy as np
+
+
+class MotorDisperso:
+    """
+    Motor de inferencia para entradas escalares que solo evalúa las reglas que se disparan.
+
+    Da los mismos números que `MotorMamdani` (usa sus matrices de pertenencia y su
+    defuzzificación), pero en lugar de fuzzificar todos los términos y recortar todas las
+    consecuencias:
+    - Por cada entrada, busca en los puntos de quiebre el tramo que contiene el valor y toma
+    los términos no nulos en ese tramo, precalculados al construir.
+    - Recorre solo los pares (fila, columna) de términos activos de la `TablaReglas` y, por cada
+    salida, guarda el mayor grado de activación de cada término consecuente.
+    - Agrega los términos consecuentes con grado no nulo y defuzzifica.
+    """
+
+    def __init__(self, motor, tabla, variables) -> None:
+        """
+        Args:
+            motor (MotorMamdani): Motor compilado con las variables y reglas de `tabla`.
+            tabla (TablaReglas): Tabla de reglas sobre las dos entradas.
+            variables (dict): Variables difusas (`VariableDifusa`) indexadas por nombre.
+        """
+        self.factor_certeza: float = motor.factor_certeza
+
+        # --- Tramos de activación de las entradas ---
+        self.filas: tuple = (tabla.filas,) + self._tramos(motor.entradas[tabla.filas], tabla.terminos_filas)
+        self.columnas: tuple = (tabla.columnas,) + self._tramos(motor.entradas[tabla.columnas], tabla.terminos_columnas)
+
+        # --- Consecuencias indexadas por (fila, columna) ---
+        self.salidas: dict = {}                       # nombre -> (matriz de pertenencia, geometría del centro de gravedad)
+        self.consecuencias: list = []                 # Por salida: [fila][columna] -> índice de término, -1 si vacía
+        for nombre, indices in tabla.indices(variables).items():
+            universo, _, matriz = motor.salidas[nombre]
+            self.salidas[nombre] = (matriz, self._geometria(universo))
+            self.consecuencias.append(indices.tolist())
+
+    @staticmethod
+    def _geometria(universo):
+        """
+        Términos de `MotorMamdani.centro_de_gravedad` que solo dependen del universo de la salida.
+
+        Returns:
+            tuple: (base, centro de los rectángulos, centro de los triángulos crecientes,
+            centro de los triángulos decrecientes, punto medio del universo).
+        """
+        base = np.diff(universo)
+        return (base, universo[:-1] + base / 2.0, universo[:-1] + 2.0 / 3.0 * base,
+                universo[:-1] + 1.0 / 3.0 * base, float(np.mean(universo)))
+
+    @staticmethod
+    def centro_de_gravedad(geometria, pertenencia):
+        """
+        Centro de gravedad de una sola pertenencia agregada (no nula), con las mismas operaciones que
+        `MotorMamdani.centro_de_gravedad` pero con la geometría del universo ya calculada.
+        """
+        base, centro_rect, centro_sube, centro_baja, _ = geometria
+        izquierda = pertenencia[:-1]
+        derecha = pertenencia[1:]
+
+        area_rect = np.minimum(izquierda, derecha) * base
+        area_tri = base * np.abs(derecha - izquierda) / 2.0
+        centro_tri = np.where(derecha > izquierda, centro_sube, centro_baja)
+
+        numerador = np.add.reduce(area_rect * centro_rect + area_tri * centro_tri)
+        return float(numerador / np.add.reduce(area_rect + area_tri))
+
+    @staticmethod
+    def _tramos(entrada, terminos_tabla):
+        """
+        Puntos de quiebre ordenados de una entrada y términos no nulos en cada tramo.
+
+        Args:
+            entrada (tuple): (universo, nombres de términos, matriz de pertenencia) de `MotorMamdani.entradas`.
+            terminos_tabla (tuple): Términos de la entrada en el orden de la tabla de reglas.
+
+        Returns:
+            tuple: (universo, quiebres, candidatos), donde `candidatos[k]` lista los pares
+            (índice en la tabla, pertenencia sobre el universo) de los términos no nulos en
+            `[quiebres[k - 1], quiebres[k])`; el último tramo es el extremo superior del universo.
+
+        Detalles:
+        - Los quiebres son los puntos del universo donde empieza o acaba el soporte de algún
+        término; entre dos quiebres consecutivos cada término es nulo o no nulo en todo el tramo,
+        así que basta con comprobarlo en su punto medio.
+        - En el extremo izquierdo de un tramo un término candidato puede valer 0; esos se
+        descartan al evaluar la pertenencia.
+        """
+        universo, nombres, matriz = entrada
+        filas = [(i_tabla, matriz[nombres.index(termino)]) for i_tabla, termino in enumerate(terminos_tabla)]
+
+        quiebres = {float(universo[0]), float(universo[-1])}
+        for _, pertenencia in filas:
+            # El soporte empieza en el último punto nulo antes de un tramo no nulo y acaba en el primero después
+            no_nula = pertenencia > 0
+            cambios = np.flatnonzero(np.diff(no_nula))
+            quiebres.update(np.where(no_nula[cambios + 1], universo[cambios], universo[cambios + 1]).tolist())
+        quiebres = sorted(quiebres)
+
+        candidatos = [()]                             # Antes del universo no se activa nada
+        for a, b in zip(quiebres[:-1], quiebres[1:]):
+            medio = (a + b) / 2.0
+            candidatos.append(tuple(fila for fila in filas if np.interp(medio, universo, fila[1]) > 0))
+        candidatos.append(tuple(fila for fila in filas if fila[1][-1] > 0))
+        return universo, quiebres, candidatos
+
+    @staticmethod
+    def activos(entrada, valor):
+        """
+        Términos activos de una entrada para un valor nítido.
+
+        Returns:
+            list: Pares (índice en la tabla, pertenencia) de los términos con pertenencia no nula.
+        """
+        _, universo, quiebres, candidatos = entrada
+        if valor < universo[0] or valor > universo[-1]:
+            return []
+        activos = []
+        for i_tabla, pertenencia in candidatos[bisect_right(quiebres, valor)]:
+            grado = float(np.interp(valor, universo, pertenencia))
+            if grado > 0:
+                activos.append((i_tabla, grado))
+        return activos
+
+    def __call__(self, **entradas):
+        """
+        Ejecuta la inferencia para un valor escalar de cada entrada.
+
+        Returns:
+            tuple: (resultado, factor de certeza), con el mismo formato que `MotorMamdani` para entradas escalares.
+        """
+        filas = self.activos(self.filas, entradas[self.filas[0]])
+        columnas = self.activos(self.columnas, entradas[self.columnas[0]])
+
+        # Mayor grado de activación de cada término consecuente, por salida
+        grados = [{} for _ in self.consecuencias]
+        for f, grado_fila in filas:
+            for c, grado_columna in columnas:
+                grado = min(grado_fila, grado_columna)
+                for grados_salida, indices in zip(grados, self.consecuencias):
+                    i_termino = indices[f][c]
+                    if i_termino >= 0 and grado > grados_salida.get(i_termino, 0.0):
+                        grados_salida[i_termino] = grado
+
+        resultado = {}
+        for (nombre, (matriz, geometria)), grados_salida in zip(self.salidas.items(), grados):
+            if not grados_salida:
+                # Sin ninguna regla disparada, el punto medio del universo (como `MotorMamdani`)
+                resultado[nombre] = geometria[-1]
+                continue
+            agregada = np.zeros(matriz.shape[1], dtype=np.float64)
+            for i_termino, grado in grados_salida.items():
+                np.maximum(agregada, np.minimum(grado, matriz[i_termino]), out=agregada)
+            resultado[nombre] = self.centro_de_gravedad(geometria, agregada)
+
+        return resultado, self.factor_certeza
+
@@ -0,0 +1,19 @@
+'''
+ Ruta por defecto (sustituto local de P1Launcher.py)
+ Los controladores leen `objectiveSet` al construirse para conocer el número de
+ segmentos; el simulador lo sustituye por la ruta que vaya a ejecutar.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+from segmento import Segmento
+
+# Circuito cerrado con tramos rectos y dos segmentos triangulares
+objectiveSet: list = [
+    Segmento((0, 0), (10, 0)),
+    Segmento((10, 0), (20, 0), medio=(15, 5)),
+    Segmento((20, 0), (20, 10)),
+    Segmento((20, 10), (10, 10), medio=(15, 14)),
+    Segmento((10, 10), (0, 0)),
+]
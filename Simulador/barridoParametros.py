@@ -0,0 +1,261 @@
+'''
+ Barrido de parámetros del ExpertSystem
+ Evalúa combinaciones de constantes de ajuste (ExpertSystem.CONSTANTES_AJUSTE)
+ simulando las rutas de rutas.py en paralelo con un pool de procesos, descarta
+ pronto las configuraciones claramente peores que la mejor encontrada y muestra
+ los resultados ordenados por tiempo de vuelta.
+
+ Uso:
+     # Rejilla: todas las combinaciones de los valores indicados
+     python Simulador/barridoParametros.py --valores STOP_DISTANCE=0.2,0.4 --valores DISTANCE_TURN_CONSTANT=3,4.5,6
+     python Simulador/barridoParametros.py --valores MUESTREO_ADAPTATIVO=True,False --valores LEY_SEGUIMIENTO=checkpoints,stanley
+
+     # Búsqueda aleatoria: N configuraciones con valores uniformes en los rangos indicados
+     python Simulador/barridoParametros.py --aleatorio 64 --semilla 0 --rango STOP_DISTANCE=0.1:0.5
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import itertools
+import json
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from simulador import cargar_controlador, crear_controlador, simular
+from reproducir import leer_opcion
+from rutas import RUTAS
+
+# Estado de cada proceso del pool
+_mejor_tiempo = None                                  # multiprocessing.Value compartido: mejor tiempo total hasta ahora
+_rutas: dict = {}                                     # Rutas ya generadas en este proceso
+
+
+def _iniciar_proceso(mejor_tiempo):
+    global _mejor_tiempo
+    _mejor_tiempo = mejor_tiempo
+
+
+def _ruta(nombre):
+    if nombre not in _rutas:
+        _rutas[nombre] = RUTAS[nombre]()
+    return _rutas[nombre]
+
+
+def evaluar(indice, constantes, nombres_rutas, dt, tiempo_maximo, tiempo_sin_avance, factor_corte, referencia=None):
+    """
+    Simula el ExpertSystem con `constantes` sobre cada ruta de `nombres_rutas`.
+
+    Args:
+        referencia (float, opcional): Mejor tiempo total con el que se aplica el corte. Por defecto,
+            el mejor conocido (compartido entre procesos) al empezar la evaluación.
+
+    Returns:
+        dict: Constantes evaluadas, tiempo total, rutas completadas, error transversal medio,
+        si la configuración se descartó antes de terminar y la referencia usada para el corte.
+
+    Detalles:
+    - El tiempo de cada ruta se limita a lo que falta para superar `factor_corte` veces la
+    referencia. Si se agota, la configuración se descarta.
+    - Una configuración que no completa una ruta también se descarta.
+    - El resultado solo depende de las constantes y de la referencia, que se lee una vez; `barrer`
+    repite con la referencia final las configuraciones cuyo resultado cambiaría con ella.
+    """
+    if referencia is None:
+        referencia = _mejor_tiempo.value
+    clase = cargar_controlador("experto")
+    total, errores = 0.0, []
+    completadas = 0
+    descartada = False
+
+    for nombre in nombres_rutas:
+        limite = min(tiempo_maximo, factor_corte * referencia - total)
+        if limite <= 0:
+            descartada = True
+            break
+
+        objetivos = _ruta(nombre)
+        resultado = simular(crear_controlador(clase, objetivos, **constantes), objetivos, dt, limite,
+                            tiempo_sin_avance=tiempo_sin_avance)
+        errores.append(resultado["error_medio"])
+        if not resultado["completada"]:
+            descartada = True
+            break
+        completadas += 1
+        total += resultado["tiempo_vuelta"]
+
+    if not descartada:
+        with _mejor_tiempo.get_lock():
+            _mejor_tiempo.value = min(_mejor_tiempo.value, total)
+
+    return {
+        "indice": indice,
+        "constantes": constantes,
+        "tiempo_vuelta": None if descartada else total,
+        "rutas_completadas": completadas,
+        "error_medio": float(np.mean(errores)) if errores else None,
+        "descartada": descartada,
+        "referencia": referencia,
+    }
+
+
+def _valor(texto):
+    """
+    Interpreta un valor de `--valores` como `leer_opcion`: literal de Python (`3`, `0.4`, `True`)
+    o, si no lo es, texto (`stanley`).
+    """
+    return leer_opcion(f"valor={texto.strip()}")[1]
+
+
+def configuraciones_rejilla(valores):
+    """
+    Producto cartesiano de los valores de cada constante.
+
+    Args:
+        valores (dict): Constante -> lista de valores.
+    """
+    nombres = list(valores)
+    return [dict(zip(nombres, combinacion)) for combinacion in itertools.product(*valores.values())]
+
+
+def configuraciones_aleatorias(rangos, n, semilla):
+    """
+    `n` configuraciones con valores uniformes en `rangos`; la misma semilla da las mismas configuraciones.
+
+    Args:
+        rangos (dict): Constante -> (mínimo, máximo).
+    """
+    rng = np.random.default_rng(semilla)
+    return [{nombre: float(rng.uniform(minimo, maximo)) for nombre, (minimo, maximo) in rangos.items()}
+            for _ in range(n)]
+
+
+def barrer(configuraciones, nombres_rutas, dt=0.05, tiempo_maximo=2000.0, tiempo_sin_avance=60.0,
+           factor_corte=1.5, procesos=None, progreso=None):
+    """
+    Evalúa todas las configuraciones en un pool de procesos.
+
+    Args:
+        configuraciones (list): Diccionarios de constantes de ajuste.
+        nombres_rutas (list): Rutas de `RUTAS` sobre las que se evalúa cada configuración.
+        factor_corte (float): Se descarta una configuración en cuanto su tiempo supera este
+            múltiplo del mejor tiempo total conocido.
+        procesos (int, opcional): Procesos del pool. Por defecto, uno por núcleo.
+        progreso (callable, opcional): Se llama con cada resultado según van terminando.
+
+    Returns:
+        list: Resultados ordenados por tiempo de vuelta (los descartados al final).
+
+    Raises:
+        TypeError: Si alguna configuración contiene constantes que no son de ajuste.
+
+    Detalles:
+    - Cada evaluación aplica el corte con el mejor tiempo conocido cuando empieza, que depende
+    del orden en que los procesos terminan. Al acabar, las configuraciones descartadas o más
+    lentas que el corte, evaluadas con una referencia anterior a la final, se vuelven a evaluar
+    con la referencia final. Así, el conjunto de descartadas y sus rutas completadas y errores
+    no dependen del reparto entre procesos.
+    - La segunda pasada no puede mejorar el mejor tiempo: una configuración que terminara en él
+    ya habría terminado en la primera, con un límite mayor. Solo llama a `progreso` la primera.
+    """
+    clase = cargar_controlador("experto")
+    for constantes in configuraciones:
+        desconocidas = set(constantes) - set(clase.CONSTANTES_AJUSTE)
+        if desconocidas:
+            raise TypeError(f"Constantes de ajuste desconocidas: {sorted(desconocidas)}")
+
+    mejor_tiempo = multiprocessing.Value("d", math.inf)
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos or os.cpu_count(), initializer=_iniciar_proceso,
+                             initargs=(mejor_tiempo,)) as pool:
+        futuros = [pool.submit(evaluar, i, constantes, nombres_rutas, dt, tiempo_maximo, tiempo_sin_avance, factor_corte)
+                   for i, constantes in enumerate(configuraciones)]
+        for futuro in as_completed(futuros):
+            resultados.append(futuro.result())
+            if progreso is not None:
+                progreso(resultados[-1])
+
+        # --- Segunda pasada con la referencia final ---
+        final = mejor_tiempo.value
+        repetir = [r for r in resultados if r["referencia"] != final
+                   and (r["descartada"] or r["tiempo_vuelta"] > factor_corte * final)]
+        futuros = [pool.submit(evaluar, r["indice"], r["constantes"], nombres_rutas, dt, tiempo_maximo, tiempo_sin_avance,
+                               factor_corte, final)
+                   for r in repetir]
+        posiciones = {r["indice"]: k for k, r in enumerate(resultados)}
+        for futuro in as_completed(futuros):
+            resultado = futuro.result()
+            resultados[posiciones[resultado["indice"]]] = resultado
+
+    # La referencia de cada evaluación depende del reparto entre procesos; no forma parte del resultado
+    for resultado in resultados:
+        del resultado["referencia"]
+
+    return sorted(resultados, key=lambda r: (r["descartada"], r["tiempo_vuelta"] or math.inf, r["indice"]))
+
+
+def _asignaciones(textos, convertir):
+    """
+    Convierte argumentos `NOMBRE=valor` en un diccionario.
+    """
+    asignaciones = {}
+    for texto in textos:
+        nombre, _, valor = texto.partition("=")
+        asignaciones[nombre.strip()] = convertir(valor)
+    return asignaciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--valores", action="append", default=[], metavar="NOMBRE=v1,v2,...",
+                        help="Valores de una constante para la búsqueda en rejilla")
+    parser.add_argument("--rango", action="append", default=[], metavar="NOMBRE=min:max",
+                        help="Rango de una constante para la búsqueda aleatoria")
+    parser.add_argument("--aleatorio", type=int, default=0, help="Número de configuraciones aleatorias")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--rutas", nargs="+", choices=list(RUTAS), default=["rectas", "triangulos"])
+    parser.add_argument("--dt", type=float, default=0.05)
+    parser.add_argument("--tiempo-maximo", type=float, default=2000.0, help="Tiempo simulado máximo por ruta")
+    parser.add_argument("--factor-corte", type=float, default=1.5)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--mostrar", type=int, default=20, help="Filas de la tabla de resultados")
+    parser.add_argument("--salida", default=None, help="Fichero JSON con todos los resultados")
+    args = parser.parse_args()
+
+    if args.aleatorio:
+        rangos = _asignaciones(args.rango, lambda v: tuple(float(x) for x in v.split(":")))
+        configuraciones = configuraciones_aleatorias(rangos, args.aleatorio, args.semilla)
+    else:
+        valores = _asignaciones(args.valores, lambda v: [_valor(x) for x in v.split(",")])
+        configuraciones = configuraciones_rejilla(valores)
+
+    def progreso(resultado):
+        print(f"\r{progreso.hechas + 1}/{len(configuraciones)} configuraciones evaluadas", end="", flush=True)
+        progreso.hechas += 1
+    progreso.hechas = 0
+
+    resultados = barrer(configuraciones, args.rutas, args.dt, args.tiempo_maximo, factor_corte=args.factor_corte,
+                        procesos=args.procesos, progreso=progreso)
+    print()
+
+    descartadas = sum(r["descartada"] for r in resultados)
+    print(f"\n{len(resultados)} configuraciones, {descartadas} descartadas, rutas: {', '.join(args.rutas)}\n")
+    print(f"{'#':>4}{'vuelta (s)':>12}{'error':>9}  constantes")
+    for posicion, r in enumerate(resultados[:args.mostrar], 1):
+        vuelta = f"{r['tiempo_vuelta']:.2f}" if not r["descartada"] else "-"
+        error = f"{r['error_medio']:.3f}" if r["error_medio"] is not None else "-"
+        constantes = ", ".join(f"{k}={v:.4g}" if isinstance(v, float) else f"{k}={v}" for k, v in r["constantes"].items())
+        print(f"{posicion:>4}{vuelta:>12}{error:>9}  {constantes}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
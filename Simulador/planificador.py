@@ -0,0 +1,322 @@
+'''
+ Planificador de simulaciones
+ Reparte trabajos (ruta, configuración del controlador, semilla) entre un pool de
+ procesos y devuelve cada resultado en cuanto termina. Los datos de solo lectura
+ de las rutas (segmentos y trayectorias compiladas) se preparan una vez en el
+ proceso principal y se escriben en ficheros que los procesos de trabajo mapean
+ en memoria, así que comparten sus páginas en lugar de generarlos o copiarlos.
+
+ Uso:
+     python Simulador/planificador.py [--controladores experto difuso predictivo] [--rutas rectas triangulos]
+                                      [--semillas 0 1 2 3] [--opcion [CONTROLADOR:]NOMBRE=VALOR ...]
+                                      [--procesos P] [--directorio DIR] [--salida resultados.jsonl] [--json resumen.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import itertools
+import json
+import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from simulador import CONTROLADORES, cargar_controlador, crear_controlador, simular
+from reproducir import leer_opcion
+from rutas import FAMILIAS_RUTAS, segmentos_familia
+from segmentosStream import SegmentosMapeados, guardar_segmentos
+
+# Opciones con las que cada controlador toma su ruta compilada de `directorio_cache`
+OPCIONES_RUTA_COMPARTIDA: dict = {
+    "experto": {"usar_ruta_compilada": True},
+    "difuso": {"usar_ruta_compilada": True},
+    "predictivo": {},
+}
+
+# Estado de cada proceso del pool
+_directorio: str = None                               # Directorio con los datos compartidos de las rutas
+_rutas: dict = {}                                     # (ruta, semilla) -> segmentos leídos en este proceso
+
+
+@dataclass(frozen=True, slots=True)
+class Trabajo:
+    """
+    Una simulación: un controlador con unas opciones sobre una ruta de `FAMILIAS_RUTAS`.
+    """
+
+    ruta: str                                         # Familia de la ruta (ver `FAMILIAS_RUTAS`)
+    controlador: str = "experto"                      # Controlador de `CONTROLADORES`
+    opciones: dict = field(default_factory=dict)      # Opciones del constructor del controlador
+    semilla: int = None                               # Semilla de la ruta (None: la de referencia)
+
+    def clave_ruta(self):
+        """
+        (ruta, semilla efectiva): identifica los segmentos de la ruta.
+        """
+        return self.ruta, FAMILIAS_RUTAS[self.ruta][2] if self.semilla is None else self.semilla
+
+
+def trabajos_rejilla(rutas, controladores, semillas=(None,), opciones=None):
+    """
+    Un trabajo por cada combinación de ruta, controlador y semilla.
+
+    Args:
+        rutas (list): Familias de `FAMILIAS_RUTAS`.
+        controladores (list): Controladores de `CONTROLADORES`.
+        semillas (list): Semillas de las rutas (None: la de referencia).
+        opciones (dict, opcional): Controlador -> opciones de su constructor.
+    """
+    opciones = opciones or {}
+    return [Trabajo(ruta, controlador, dict(opciones.get(controlador, {})), semilla)
+            for ruta, controlador, semilla in itertools.product(rutas, controladores, semillas)]
+
+
+def _fichero_segmentos(directorio, ruta, semilla):
+    return os.path.join(directorio, f"segmentos_{ruta}_{semilla}.npy")
+
+
+def _opciones_compartidas(trabajo, directorio):
+    return {**trabajo.opciones, **OPCIONES_RUTA_COMPARTIDA[trabajo.controlador], "directorio_cache": directorio}
+
+
+def preparar_rutas(trabajos, directorio):
+    """
+    Escribe en `directorio` los segmentos y las trayectorias compiladas que necesitan los trabajos.
+
+    Returns:
+        dict: (ruta, semilla) -> número de segmentos.
+
+    Raises:
+        TypeError: Si las opciones de algún trabajo no las admite su controlador.
+
+    Detalles:
+    - Cada ruta se guarda una vez como fichero de segmentos (`guardar_segmentos`).
+    - Para cada configuración distinta se construye un controlador con `directorio_cache`, que
+    compila y guarda sus trayectorias (`RutaCompilada.desde_cache`); los procesos de trabajo
+    construyen el mismo controlador y las encuentran ya hechas.
+    - Los segmentos se releen del fichero, como en los procesos de trabajo, para que la clave de
+    la caché sea la misma.
+    """
+    segmentos = {}
+    preparadas = set()
+    for trabajo in trabajos:
+        ruta, semilla = trabajo.clave_ruta()
+        fichero = _fichero_segmentos(directorio, ruta, semilla)
+        if (ruta, semilla) not in segmentos:
+            if not os.path.exists(fichero):
+                guardar_segmentos(segmentos_familia(ruta, semilla), fichero)
+            segmentos[ruta, semilla] = list(SegmentosMapeados(fichero))
+
+        configuracion = (ruta, semilla, trabajo.controlador, repr(sorted(trabajo.opciones.items())))
+        if configuracion not in preparadas:
+            crear_controlador(cargar_controlador(trabajo.controlador), segmentos[ruta, semilla],
+                              **_opciones_compartidas(trabajo, directorio))
+            preparadas.add(configuracion)
+
+    return {clave: len(objetivos) for clave, objetivos in segmentos.items()}
+
+
+def _iniciar_proceso(directorio):
+    global _directorio
+    _directorio = directorio
+
+
+def _ruta(ruta, semilla):
+    if (ruta, semilla) not in _rutas:
+        _rutas[ruta, semilla] = list(SegmentosMapeados(_fichero_segmentos(_directorio, ruta, semilla)))
+    return _rutas[ruta, semilla]
+
+
+def ejecutar(indice, trabajo, dt, tiempo_maximo, tiempo_sin_avance):
+    """
+    Simula un trabajo en un proceso del pool con los datos compartidos de su ruta.
+
+    Returns:
+        dict: Índice, ruta, semilla, controlador y opciones del trabajo, proceso que lo ha
+        simulado, tiempo de construcción del controlador, tiempo de CPU del trabajo y resultado
+        de `simular`.
+    """
+    ruta, semilla = trabajo.clave_ruta()
+    objetivos = _ruta(ruta, semilla)
+    cpu = time.process_time()
+    inicio = time.perf_counter()
+    controlador = crear_controlador(cargar_controlador(trabajo.controlador), objetivos,
+                                    **_opciones_compartidas(trabajo, _directorio))
+    construccion = time.perf_counter() - inicio
+    resultado = simular(controlador, objetivos, dt, tiempo_maximo, tiempo_sin_avance=tiempo_sin_avance)
+    cpu = time.process_time() - cpu
+    return {
+        "indice": indice,
+        "ruta": ruta,
+        "semilla": semilla,
+        "controlador": trabajo.controlador,
+        "opciones": trabajo.opciones,
+        "proceso": os.getpid(),
+        "construccion": construccion,
+        "tiempo_cpu": cpu,
+        **resultado,
+    }
+
+
+def planificar(trabajos, dt=0.05, tiempo_maximo=2000.0, tiempo_sin_avance=60.0, procesos=None, directorio=None):
+    """
+    Simula los trabajos en un pool de procesos y devuelve los resultados según terminan.
+
+    Args:
+        trabajos (list): Trabajos (`Trabajo`) a simular.
+        procesos (int, opcional): Procesos del pool. Por defecto, uno por núcleo.
+        directorio (str, opcional): Directorio de los datos compartidos de las rutas. Si se indica,
+            se conservan y se reutilizan en ejecuciones posteriores; si no, se usa uno temporal.
+
+    Yields:
+        dict: Resultado de `ejecutar` de cada trabajo, en el orden en que terminan.
+
+    Raises:
+        KeyError: Si algún trabajo nombra una ruta o un controlador desconocidos.
+        TypeError: Si las opciones de algún trabajo no las admite su controlador.
+
+    Detalles:
+    - Los datos de las rutas se preparan antes de crear el pool (`preparar_rutas`), así que los
+    procesos de trabajo solo mapean ficheros: ni generan rutas ni compilan trayectorias.
+    - Los trabajos se envían de las rutas más largas a las más cortas, para que las simulaciones
+    largas no queden al final con el resto de procesos ociosos.
+    - Si se deja de consumir el generador, se cancelan los trabajos pendientes.
+    """
+    trabajos = list(trabajos)
+    for trabajo in trabajos:
+        if trabajo.ruta not in FAMILIAS_RUTAS or trabajo.controlador not in CONTROLADORES:
+            raise KeyError(f"Ruta o controlador desconocidos: {trabajo.ruta!r}, {trabajo.controlador!r}")
+
+    temporal = tempfile.TemporaryDirectory(prefix="planificador_") if directorio is None else None
+    directorio = temporal.name if temporal is not None else directorio
+    try:
+        os.makedirs(directorio, exist_ok=True)
+        longitudes = preparar_rutas(trabajos, directorio)
+        orden = sorted(range(len(trabajos)), key=lambda i: -longitudes[trabajos[i].clave_ruta()])
+
+        pool = ProcessPoolExecutor(max_workers=procesos or os.cpu_count(), initializer=_iniciar_proceso,
+                                   initargs=(directorio,))
+        try:
+            futuros = [pool.submit(ejecutar, i, trabajos[i], dt, tiempo_maximo, tiempo_sin_avance) for i in orden]
+            for futuro in as_completed(futuros):
+                yield futuro.result()
+        finally:
+            pool.shutdown(cancel_futures=True)
+    finally:
+        if temporal is not None:
+            temporal.cleanup()
+
+
+def resumir(resultados, tiempo_real, procesos):
+    """
+    Agrega los resultados por controlador y ruta, y el rendimiento del pool.
+
+    Returns:
+        dict: `grupos` ((controlador, ruta) -> trabajos, completados, tiempo de vuelta y error
+        transversal medios) y `rendimiento` (trabajos y ticks por segundo y eficiencia paralela:
+        tiempo de CPU de los trabajos / (tiempo real · procesos)).
+
+    Detalles:
+    - La eficiencia usa tiempo de CPU y no el tiempo real de cada trabajo, que incluye el tiempo
+    en que el proceso espera a un núcleo libre cuando hay más procesos que núcleos.
+    """
+    grupos = {}
+    for r in resultados:
+        grupos.setdefault(f"{r['controlador']} {r['ruta']}", []).append(r)
+
+    resumen = {}
+    for nombre, grupo in grupos.items():
+        vueltas = [r["tiempo_vuelta"] for r in grupo if r["completada"]]
+        resumen[nombre] = {
+            "trabajos": len(grupo),
+            "completados": len(vueltas),
+            "tiempo_vuelta": float(np.mean(vueltas)) if vueltas else None,
+            "error_medio": float(np.mean([r["error_medio"] for r in grupo])),
+        }
+
+    ocupado = sum(r["tiempo_cpu"] for r in resultados)
+    return {
+        "grupos": resumen,
+        "rendimiento": {
+            "procesos": procesos,
+            "trabajos": len(resultados),
+            "tiempo_real": tiempo_real,
+            "trabajos_por_segundo": len(resultados) / tiempo_real if tiempo_real > 0 else math.inf,
+            "ticks_por_segundo": sum(r["ticks"] for r in resultados) / tiempo_real if tiempo_real > 0 else math.inf,
+            "eficiencia": ocupado / (tiempo_real * procesos) if tiempo_real > 0 else 1.0,
+        },
+    }
+
+
+def leer_opcion_controlador(texto):
+    """
+    Convierte `[CONTROLADOR:]NOMBRE=VALOR` en (controlador o None si vale para todos, nombre, valor).
+    """
+    controlador, separador, resto = texto.partition(":")
+    if not separador or "=" in controlador:
+        return (None, *leer_opcion(texto))
+    return (controlador, *leer_opcion(resto))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--controladores", nargs="+", choices=sorted(CONTROLADORES), default=["experto"])
+    parser.add_argument("--rutas", nargs="+", choices=list(FAMILIAS_RUTAS), default=["rectas", "triangulos"])
+    parser.add_argument("--semillas", nargs="+", type=int, default=[None], help="Semillas de las rutas (por defecto, la de referencia)")
+    parser.add_argument("--opcion", action="append", default=[], type=leer_opcion_controlador,
+                        metavar="[CONTROLADOR:]NOMBRE=VALOR", help="Opción del constructor (de un controlador o de todos)")
+    parser.add_argument("--dt", type=float, default=0.05)
+    parser.add_argument("--tiempo-maximo", type=float, default=2000.0, help="Tiempo simulado máximo por trabajo")
+    parser.add_argument("--tiempo-sin-avance", type=float, default=60.0)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--directorio", default=None, help="Conserva aquí los datos compartidos de las rutas")
+    parser.add_argument("--salida", metavar="FICHERO", help="Escribe cada resultado en JSON Lines según termina")
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda el resumen en JSON")
+    args = parser.parse_args()
+
+    opciones = {nombre: {} for nombre in args.controladores}
+    for controlador, nombre, valor in args.opcion:
+        for destino in ([controlador] if controlador else args.controladores):
+            opciones.setdefault(destino, {})[nombre] = valor
+
+    trabajos = trabajos_rejilla(args.rutas, args.controladores, args.semillas, opciones)
+    procesos = args.procesos or os.cpu_count()
+    salida = open(args.salida, "w", encoding="utf-8") if args.salida else None
+    resultados = []
+    inicio = time.perf_counter()
+    try:
+        for resultado in planificar(trabajos, args.dt, args.tiempo_maximo, args.tiempo_sin_avance, procesos, args.directorio):
+            resultados.append(resultado)
+            vuelta = f"{resultado['tiempo_vuelta']:.2f} s" if resultado["completada"] else "no completada"
+            print(f"{len(resultados):>5}/{len(trabajos)}  {resultado['controlador']:10s} {resultado['ruta']:10s} "
+                  f"semilla {resultado['semilla']:<5} {vuelta:>14s}  error {resultado['error_medio']:.3f} m", flush=True)
+            if salida is not None:
+                salida.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+                salida.flush()
+    finally:
+        if salida is not None:
+            salida.close()
+    resumen = resumir(resultados, time.perf_counter() - inicio, procesos)
+
+    print(f"\n{'controlador y ruta':24s}{'trabajos':>9s}{'completados':>12s}{'vuelta (s)':>12s}{'error (m)':>11s}")
+    for nombre, grupo in resumen["grupos"].items():
+        vuelta = f"{grupo['tiempo_vuelta']:.2f}" if grupo["tiempo_vuelta"] is not None else "-"
+        print(f"{nombre:24s}{grupo['trabajos']:>9d}{grupo['completados']:>12d}{vuelta:>12s}{grupo['error_medio']:>11.3f}")
+    rendimiento = resumen["rendimiento"]
+    print(f"\n{rendimiento['trabajos']} trabajos en {rendimiento['tiempo_real']:.2f} s con {procesos} procesos: "
+          f"{rendimiento['trabajos_por_segundo']:.2f} trabajos/s, {rendimiento['ticks_por_segundo']:.0f} ticks/s, "
+          f"eficiencia {100 * rendimiento['eficiencia']:.0f} %")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(resumen, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
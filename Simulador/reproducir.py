@@ -0,0 +1,69 @@
+'''
+ Reproducción de trazas grabadas
+ Pasa una traza grabada con `simulador.py --grabar` (o con `controlador.traza`
+ en el lanzador) por un controlador recién construido, sin simulador, e informa
+ de los ticks cuya decisión o estado difiere de la grabación y de los ticks por
+ segundo. Sirve como prueba de regresión de los controladores frente a
+ ejecuciones reales y para perfilarlos con entradas reales.
+
+ Uso:
+     python Simulador/reproducir.py traza.bin [--controlador experto|difuso|predictivo] [--ruta rectas|triangulos|larga]
+                                    [--tolerancia TOL] [--detener] [--opcion NOMBRE=VALOR ...]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import ast
+import sys
+
+from simulador import CONTROLADORES, cargar_controlador, crear_controlador
+from rutas import RUTAS
+from trazas import leer_traza, reproducir
+import P1Launcher
+
+
+def leer_opcion(texto):
+    """
+    Convierte `NOMBRE=VALOR` en (NOMBRE, valor), interpretando el valor como literal de Python
+    (`True`, `0.3`, ...) o, si no lo es, como texto.
+    """
+    nombre, _, valor = texto.partition("=")
+    try:
+        return nombre, ast.literal_eval(valor)
+    except (ValueError, SyntaxError):
+        return nombre, valor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("traza", help="Fichero de traza")
+    parser.add_argument("--controlador", choices=sorted(CONTROLADORES), default="experto")
+    parser.add_argument("--ruta", choices=list(RUTAS), help="Ruta grabada (por defecto, P1Launcher.objectiveSet)")
+    parser.add_argument("--tolerancia", type=float, default=0.0, help="Diferencia máxima admitida en V y W")
+    parser.add_argument("--detener", action="store_true", help="Detiene la reproducción en la primera divergencia")
+    parser.add_argument("--opcion", action="append", default=[], type=leer_opcion, metavar="NOMBRE=VALOR",
+                        help="Argumento del constructor del controlador (p. ej. activacion_dispersa=True)")
+    args = parser.parse_args()
+
+    objetivos = RUTAS[args.ruta]() if args.ruta else P1Launcher.objectiveSet
+    segmentos, registros = leer_traza(args.traza)
+    if segmentos != len(objetivos):
+        sys.exit(f"La traza se grabó con una ruta de {segmentos} segmentos y la indicada tiene {len(objetivos)}")
+
+    controlador = crear_controlador(cargar_controlador(args.controlador), objetivos, **dict(args.opcion))
+    resultado = reproducir(controlador, registros, objetivos, args.tolerancia, args.detener)
+
+    primera = resultado["primera_divergencia"]
+    print(f"controlador:            {args.controlador}")
+    print(f"ticks reproducidos:     {resultado['ticks']}/{len(registros)}")
+    print(f"divergencias:           {resultado['divergencias']}" + (f" (primera en el tick {primera})" if primera is not None else ""))
+    print(f"error máximo:           V {resultado['error_V']:.3g}, W {resultado['error_W']:.3g}")
+    print(f"tiempo:                 {resultado['tiempo_real']:.3f} s ({resultado['ticks_por_segundo']:.0f} ticks/s)")
+    if resultado["divergencias"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
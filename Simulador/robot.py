@@ -0,0 +1,72 @@
+'''
+ Robot cinemático (sustituto local de robot.py)
+ Constantes de velocidad y aceleración que importan los controladores y un
+ modelo de uniciclo que las respeta, para simular sin el lanzador gráfico.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import math
+
+VMAX: float = 3.0                                     # Velocidad lineal máxima (m/s)
+WMAX: float = 1.0                                     # Velocidad angular máxima (rad/s)
+VACC: float = 1.0                                     # Aceleración lineal máxima (m/s²)
+WACC: float = 1.0                                     # Aceleración angular máxima (rad/s²)
+
+
+class Robot:
+    """
+    Uniciclo con velocidades y aceleraciones limitadas por VMAX/WMAX/VACC/WACC.
+
+    La pose tiene el formato que esperan los controladores:
+    (x, y, ángulo en grados, velocidad lineal, velocidad angular).
+    """
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, angulo: float = 0.0, dt: float = 0.05) -> None:
+        """
+        Args:
+            x (float): Posición inicial en x.
+            y (float): Posición inicial en y.
+            angulo (float): Orientación inicial en grados.
+            dt (float): Paso de integración en segundos.
+        """
+        self.x: float = float(x)
+        self.y: float = float(y)
+        self.angulo: float = float(angulo)            # Orientación en grados, en [-180, 180)
+        self.v: float = 0.0                           # Velocidad lineal actual (m/s)
+        self.w: float = 0.0                           # Velocidad angular actual (rad/s)
+        self.dt: float = dt
+
+    def pose(self):
+        return (self.x, self.y, self.angulo, self.v, self.w)
+
+    def mover(self, V, W):
+        """
+        Aplica las velocidades pedidas durante un paso `dt`.
+
+        Args:
+            V (float): Velocidad lineal pedida (negativa en reversa).
+            W (float): Velocidad angular pedida.
+
+        Detalles:
+        - Las velocidades cambian como mucho `VACC * dt` y `WACC * dt` por paso y se saturan en
+        ±VMAX y ±WMAX.
+        - Con velocidades constantes durante el paso, el uniciclo recorre un arco de
+        circunferencia, que se integra de forma exacta.
+        """
+        dv = VACC * self.dt
+        dw = WACC * self.dt
+        self.v = max(-VMAX, min(VMAX, max(self.v - dv, min(self.v + dv, V))))
+        self.w = max(-WMAX, min(WMAX, max(self.w - dw, min(self.w + dw, W))))
+
+        theta = math.radians(self.angulo)
+        giro = self.w * self.dt
+        if abs(giro) > 1e-12:
+            radio = self.v / self.w
+            self.x += radio * (math.sin(theta + giro) - math.sin(theta))
+            self.y -= radio * (math.cos(theta + giro) - math.cos(theta))
+        else:
+            self.x += self.v * self.dt * math.cos(theta)
+            self.y += self.v * self.dt * math.sin(theta)
+        self.angulo = (self.angulo + math.degrees(giro) + 180) % 360 - 180
@@ -0,0 +1,84 @@
+'''
+ Biblioteca de rutas de prueba
+ Genera, de forma determinista a partir de una semilla, rutas de segmentos
+ encadenados: solo rectas, con predominio de triángulos y rutas largas. Las rutas
+ también se pueden generar segmento a segmento para recorrerlas en flujo.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import functools
+import math
+
+import numpy as np
+from segmento import Segmento
+
+
+def generar_segmentos(n_segmentos, proporcion_triangulos, semilla=0, longitud=(6.0, 14.0), giro_maximo=90.0, altura=(2.0, 5.0)):
+    """
+    Genera uno a uno los segmentos encadenados de una ruta (el fin de cada uno es el inicio del siguiente).
+
+    Args:
+        n_segmentos (int): Número de segmentos.
+        proporcion_triangulos (float): Probabilidad de que un segmento sea triangular.
+        semilla (int): Semilla del generador aleatorio; la misma semilla da la misma ruta.
+        longitud (tuple): Longitud mínima y máxima de cada segmento.
+        giro_maximo (float): Giro máximo, en grados, entre un segmento y el siguiente.
+        altura (tuple): Distancia mínima y máxima del punto medio de un triángulo a su base.
+
+    Yields:
+        Segmento: Segmentos de la ruta, en orden; sirve como fuente de un `FlujoSegmentos`.
+    """
+    rng = np.random.default_rng(semilla)
+    inicio = np.zeros(2)
+    rumbo = 0.0
+
+    for _ in range(n_segmentos):
+        direccion = np.array((math.cos(rumbo), math.sin(rumbo)))
+        fin = inicio + rng.uniform(*longitud) * direccion
+
+        if rng.random() < proporcion_triangulos:
+            normal = np.array((-direccion[1], direccion[0])) * rng.choice((-1.0, 1.0))
+            medio = (inicio + fin) / 2 + rng.uniform(*altura) * normal
+            yield Segmento(np.round(inicio, 6), np.round(fin, 6), medio=np.round(medio, 6))
+        else:
+            yield Segmento(np.round(inicio, 6), np.round(fin, 6))
+
+        inicio = fin
+        rumbo += math.radians(rng.uniform(-giro_maximo, giro_maximo))
+
+
+def generar_ruta(n_segmentos, proporcion_triangulos, semilla=0, **opciones):
+    """
+    Genera una ruta completa en memoria (ver `generar_segmentos`).
+
+    Returns:
+        list: Segmentos de la ruta.
+    """
+    return list(generar_segmentos(n_segmentos, proporcion_triangulos, semilla, **opciones))
+
+
+# Familias de rutas: nombre -> (segmentos, proporción de triángulos, semilla de referencia)
+FAMILIAS_RUTAS: dict = {
+    "rectas": (20, 0.0, 1),
+    "triangulos": (20, 0.8, 2),
+    "larga": (1000, 0.3, 3),
+}
+
+
+def segmentos_familia(nombre, semilla=None):
+    """
+    Genera uno a uno los segmentos de una ruta de la familia `nombre` (ver `FAMILIAS_RUTAS`).
+
+    Args:
+        nombre (str): Familia de la ruta.
+        semilla (int, opcional): Semilla de la ruta; por defecto, la de referencia de la familia.
+    """
+    n_segmentos, proporcion_triangulos, referencia = FAMILIAS_RUTAS[nombre]
+    return generar_segmentos(n_segmentos, proporcion_triangulos, referencia if semilla is None else semilla)
+
+
+# Rutas de referencia: nombre -> función sin argumentos que genera la ruta (con la semilla de referencia)
+RUTAS: dict = {nombre: functools.partial(generar_ruta, n_segmentos, proporcion_triangulos, semilla=semilla)
+               for nombre, (n_segmentos, proporcion_triangulos, semilla) in FAMILIAS_RUTAS.items()}
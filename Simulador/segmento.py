@@ -0,0 +1,43 @@
+'''
+ Segmento de la ruta (sustituto local de segmento.py)
+ Misma interfaz que usan los controladores: getType, getInicio, getMedio y getFin.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+LINEA: int = 1                                        # Segmento recto de inicio a fin
+TRIANGULO: int = 2                                    # Segmento que pasa por un punto medio
+
+
+class Segmento:
+    """
+    Segmento lineal (`medio` es None) o triangular (inicio -> medio -> fin).
+    """
+
+    def __init__(self, inicio, fin, medio=None) -> None:
+        self.inicio: tuple = tuple(inicio)
+        self.fin: tuple = tuple(fin)
+        self.medio: tuple = None if medio is None else tuple(medio)
+        self.tipo: int = LINEA if medio is None else TRIANGULO
+
+    def getType(self):
+        return self.tipo
+
+    def getInicio(self):
+        return self.inicio
+
+    def getMedio(self):
+        return self.medio
+
+    def getFin(self):
+        return self.fin
+
+    def vertices(self):
+        """
+        Vértices de la polilínea del segmento: (inicio, fin) o (inicio, medio, fin).
+        """
+        return (self.inicio, self.fin) if self.medio is None else (self.inicio, self.medio, self.fin)
+
+    def __repr__(self):
+        return f"Segmento({self.inicio}, {self.fin}, medio={self.medio})"
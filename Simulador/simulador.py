@@ -0,0 +1,266 @@
+'''
+ Simulador sin interfaz gráfica
+ Ejecuta ExpertSystem o FuzzySystem en lazo cerrado sobre el robot cinemático
+ local (robot.py) y una ruta de objetos Segmento, e informa del tiempo de vuelta,
+ del error transversal respecto a la ruta y de los ticks por segundo reales.
+
+ Uso:
+     python Simulador/simulador.py [--controlador experto|difuso|predictivo] [--dt DT] [--tiempo-maximo T]
+                                   [--ruta rectas|triangulos|larga] [--grabar traza.bin]
+                                   [--flujo N | --segmentos segmentos.npy] [--ventana V]
+                                  [--perfilar] [--perfil perfil.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import importlib
+import json
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+SIMULADOR = os.path.dirname(os.path.abspath(__file__))
+RAIZ = os.path.dirname(SIMULADOR)
+for carpeta in (os.path.join(RAIZ, "ControlPredictivo"), os.path.join(RAIZ, "FuzzyExpert"), os.path.join(RAIZ, "SistemaExperto"),
+                os.path.join(RAIZ, "Comun"), SIMULADOR):
+    if carpeta not in sys.path:
+        sys.path.insert(0, carpeta)
+
+import P1Launcher
+from robot import Robot
+from rutas import RUTAS, generar_segmentos
+from perfilado import perfilar
+from segmentosStream import FlujoSegmentos
+from trazas import GrabadorTraza
+
+# Controladores disponibles: nombre -> (módulo, clase). Se importan al usarlos.
+CONTROLADORES: dict = {
+    "experto": ("expertSystem", "ExpertSystem"),
+    "difuso": ("fuzzyExpert", "FuzzySystem"),
+    "predictivo": ("controlPredictivo", "ControlPredictivo"),
+}
+
+
+def cargar_controlador(nombre):
+    """
+    Importa y devuelve la clase del controlador `nombre` (ver `CONTROLADORES`).
+    """
+    modulo, clase = CONTROLADORES[nombre]
+    return getattr(importlib.import_module(modulo), clase)
+
+
+def crear_controlador(clase, objetivos, **opciones):
+    """
+    Construye un controlador para la ruta `objetivos` (una lista de segmentos o un `FlujoSegmentos`).
+    """
+    if not isinstance(objetivos, FlujoSegmentos):
+        objetivos = list(objetivos)
+    return clase(objetivos=objetivos, **opciones)
+
+
+def pose_inicial(objetivos):
+    """
+    Pose de salida: inicio del primer segmento, orientado hacia su siguiente vértice.
+    """
+    inicio = objetivos[0].getInicio()
+    siguiente = objetivos[0].getMedio() if objetivos[0].getType() != 1 else objetivos[0].getFin()
+    return inicio[0], inicio[1], math.degrees(math.atan2(siguiente[1] - inicio[1], siguiente[0] - inicio[0]))
+
+
+def aristas_ruta(objetivos):
+    """
+    Aristas de la polilínea de cada segmento, dos por segmento (la de un segmento lineal se repite).
+
+    Returns:
+        tuple: Arrays (M, 2, 2) con el origen y el final de las dos aristas de cada segmento.
+    """
+    origen = np.empty((len(objetivos), 2, 2))
+    final = np.empty((len(objetivos), 2, 2))
+    for i, segmento in enumerate(objetivos):
+        if segmento.getType() == 1:
+            origen[i] = segmento.getInicio()
+            final[i] = segmento.getFin()
+        else:
+            origen[i] = (segmento.getInicio(), segmento.getMedio())
+            final[i] = (segmento.getMedio(), segmento.getFin())
+    return origen, final
+
+
+def error_transversal(posiciones, indices, objetivos):
+    """
+    Distancia de cada posición a la polilínea del segmento que el robot tenía como objetivo.
+
+    Args:
+        posiciones (numpy.ndarray): Posiciones del robot, de forma (N, 2).
+        indices (numpy.ndarray): Segmento objetivo en cada posición, de forma (N,).
+        objetivos (list): Segmentos de la ruta.
+
+    Returns:
+        numpy.ndarray: Error transversal de cada posición, de forma (N,).
+    """
+    origen, final = aristas_ruta(objetivos)
+    a, b = origen[indices], final[indices]
+    p = posiciones[:, None, :]
+    ab = b - a
+    longitud = np.einsum("nij,nij->ni", ab, ab)
+    t = np.clip(np.einsum("nij,nij->ni", p - a, ab) / np.where(longitud > 0, longitud, 1.0), 0.0, 1.0)
+    proyeccion = a + t[..., None] * ab
+    return np.min(np.linalg.norm(p - proyeccion, axis=2), axis=1)
+
+
+def simular(controlador, objetivos, dt: float = 0.05, tiempo_maximo: float = 600.0, robot: Robot = None,
+            tiempo_sin_avance: float = None):
+    """
+    Ejecuta el controlador en lazo cerrado hasta completar la ruta o agotar `tiempo_maximo`.
+
+    Args:
+        controlador: ExpertSystem, FuzzySystem o cualquier objeto con `setObjetivo`,
+            `tomarDecision`, `esObjetivoAlcanzado` y `segment_number`.
+        objetivos (list): Segmentos de la ruta, los mismos con los que se construyó el controlador.
+        dt (float): Paso de simulación en segundos.
+        tiempo_maximo (float): Tiempo simulado máximo en segundos.
+        robot (Robot, opcional): Robot a mover. Por defecto, uno en `pose_inicial(objetivos)`.
+        tiempo_sin_avance (float, opcional): Detiene la simulación si `segment_number` no cambia
+            durante este tiempo simulado (p. ej. un robot que orbita su objetivo).
+
+    Returns:
+        dict: Resultado de la simulación:
+        - `completada`: Si el controlador llegó a recorrer todos los segmentos.
+        - `estancada`: Si se detuvo por `tiempo_sin_avance`.
+        - `tiempo_vuelta`: Tiempo simulado hasta completar la ruta (None si no se completó).
+        - `ticks`, `segmentos_completados`.
+        - `error_medio`, `error_maximo`: Error transversal respecto a la polilínea de la ruta.
+        - `tiempo_real`, `ticks_por_segundo`: Coste real del bucle de simulación.
+
+    Detalles:
+    - Igual que el lanzador, se pasa al siguiente segmento cuando `esObjetivoAlcanzado()`.
+    - La ruta se da por completada cuando `segment_number` alcanza el número de segmentos; el
+    tramo de regreso al inicio (`VOLVER_AL_INICIO`) no cuenta en el tiempo de vuelta.
+    - `objetivos` puede ser un `FlujoSegmentos` compartido con el controlador: el número de
+    segmentos se consulta en cada tick (`math.inf` hasta agotar el flujo) y el error transversal
+    se acumula por segmento, así que la memoria no depende de la longitud de la ruta.
+    """
+    if robot is None:
+        robot = Robot(*pose_inicial(objetivos), dt=dt)
+
+    flujo = isinstance(objetivos, FlujoSegmentos)
+    total = objetivos.total if flujo else len(objetivos)
+    max_ticks = int(round(tiempo_maximo / dt))
+
+    # Posiciones del segmento objetivo actual; su error se acumula al cambiar de objetivo
+    posiciones = []
+    suma_errores, error_maximo = 0.0, 0.0
+
+    def acumular_errores(segmento):
+        nonlocal suma_errores, error_maximo
+        if posiciones:
+            errores = error_transversal(np.array(posiciones), np.zeros(len(posiciones), dtype=np.int64), [segmento])
+            suma_errores += float(np.sum(errores))
+            error_maximo = max(error_maximo, float(np.max(errores)))
+            posiciones.clear()
+
+    max_ticks_sin_avance = math.inf if tiempo_sin_avance is None else int(round(tiempo_sin_avance / dt))
+    ultimo_avance = 0
+    segmento_actual = controlador.segment_number
+
+    indice = 0
+    completada = False
+    estancada = False
+    objetivo = objetivos[indice]
+    controlador.setObjetivo(objetivo)
+
+    ticks = 0
+    inicio = time.perf_counter()
+    while ticks < max_ticks:
+        V, W = controlador.tomarDecision(robot.pose())
+        robot.mover(V, W)
+        posiciones.append((robot.x, robot.y))
+        ticks += 1
+
+        if flujo:
+            total = objetivos.total
+        if controlador.segment_number >= total:
+            completada = True
+            break
+        if controlador.segment_number != segmento_actual:
+            segmento_actual, ultimo_avance = controlador.segment_number, ticks
+        elif ticks - ultimo_avance >= max_ticks_sin_avance:
+            estancada = True
+            break
+        if controlador.esObjetivoAlcanzado() and indice + 1 < total:
+            acumular_errores(objetivo)
+            indice += 1
+            objetivo = objetivos[indice]
+            controlador.setObjetivo(objetivo)
+    tiempo_real = time.perf_counter() - inicio
+    acumular_errores(objetivo)
+
+    return {
+        "completada": completada,
+        "estancada": estancada,
+        "tiempo_vuelta": ticks * dt if completada else None,
+        "ticks": ticks,
+        "segmentos_completados": min(controlador.segment_number, total),
+        "error_medio": suma_errores / ticks if ticks else 0.0,
+        "error_maximo": error_maximo,
+        "tiempo_real": tiempo_real,
+        "ticks_por_segundo": ticks / tiempo_real if tiempo_real > 0 else math.inf,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--controlador", choices=sorted(CONTROLADORES), default="experto")
+    parser.add_argument("--dt", type=float, default=0.05, help="Paso de simulación en segundos")
+    parser.add_argument("--tiempo-maximo", type=float, default=600.0, help="Tiempo simulado máximo en segundos")
+    parser.add_argument("--ruta", choices=list(RUTAS), help="Ruta de rutas.py (por defecto, P1Launcher.objectiveSet)")
+    parser.add_argument("--grabar", metavar="FICHERO", help="Graba cada decisión en una traza (ver reproducir.py)")
+    parser.add_argument("--flujo", type=int, metavar="N", help="Recorre en flujo una ruta generada de N segmentos")
+    parser.add_argument("--segmentos", metavar="FICHERO", help="Recorre en flujo un fichero de segmentos (ver segmentosStream.py)")
+    parser.add_argument("--ventana", type=int, default=8, help="Segmentos leídos por delante del actual en los flujos")
+    parser.add_argument("--perfilar", action="store_true", help="Mide el tiempo de cada etapa de tomarDecision")
+    parser.add_argument("--perfil", metavar="FICHERO", help="Guarda en JSON el informe del perfilado (implica --perfilar)")
+    args = parser.parse_args()
+    if args.grabar and (args.flujo or args.segmentos):
+        parser.error("--grabar necesita una ruta completa; no se puede combinar con --flujo ni --segmentos")
+
+    if args.segmentos:
+        objetivos = FlujoSegmentos(args.segmentos, args.ventana)
+    elif args.flujo:
+        objetivos = FlujoSegmentos(generar_segmentos(args.flujo, 0.3, semilla=3), args.ventana)
+    else:
+        objetivos = RUTAS[args.ruta]() if args.ruta else P1Launcher.objectiveSet
+    controlador = crear_controlador(cargar_controlador(args.controlador), objetivos)
+    if args.grabar:
+        controlador.traza = GrabadorTraza(args.grabar, len(objetivos))
+    perfilador = perfilar(controlador) if args.perfilar or args.perfil else None
+    try:
+        resultado = simular(controlador, objetivos, args.dt, args.tiempo_maximo)
+    finally:
+        if controlador.traza is not None:
+            controlador.traza.cerrar()
+
+    vuelta = f"{resultado['tiempo_vuelta']:.2f} s" if resultado["completada"] else "no completada"
+    print(f"controlador:            {args.controlador}")
+    print(f"tiempo de vuelta:       {vuelta}")
+    total = objetivos.total if isinstance(objetivos, FlujoSegmentos) else len(objetivos)
+    print(f"segmentos completados:  {resultado['segmentos_completados']}/{total}")
+    print(f"error transversal:      medio {resultado['error_medio']:.3f} m, máximo {resultado['error_maximo']:.3f} m")
+    print(f"ticks:                  {resultado['ticks']} ({resultado['ticks_por_segundo']:.0f} ticks/s)")
+    if args.grabar:
+        print(f"traza:                  {args.grabar} ({controlador.traza.total} registros)")
+    if perfilador is not None:
+        perfilador.desactivar()
+        print(f"\n{perfilador.texto()}")
+        if args.perfil:
+            with open(args.perfil, "w", encoding="utf-8") as f:
+                json.dump(perfilador.informe(), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+'''
+ Control en tiempo real con asyncio
+ Ejecuta uno o varios robots simulados (FuenteLocal sobre robot.py) con su propio
+ controlador a frecuencia fija en un mismo bucle de eventos (Comun/bucleControl.py)
+ e informa de los plazos incumplidos y del jitter y el cómputo de los ticks.
+
+ Uso:
+     python Simulador/tiempoReal.py [--controlador experto|difuso|predictivo] [--ruta rectas|triangulos|larga]
+                                    [--robots N] [--frecuencia HZ] [--duracion S] [--latencia S]
+                                    [--opcion NOMBRE=VALOR ...] [--json resultados.json]
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import argparse
+import asyncio
+import json
+
+from simulador import CONTROLADORES, cargar_controlador, crear_controlador, pose_inicial
+from reproducir import leer_opcion
+from robot import Robot
+from rutas import RUTAS
+from bucleControl import BucleControl, FuenteLocal, ejecutar_bucles
+from histograma import Histograma
+
+
+def crear_bucles(controlador, objetivos, robots, periodo, latencia=0.0, **opciones):
+    """
+    Un bucle por robot, cada uno con su controlador y su robot simulado en el inicio de la ruta.
+
+    Returns:
+        list: Bucles de control (`BucleControl`).
+    """
+    clase = cargar_controlador(controlador)
+    return [BucleControl(crear_controlador(clase, objetivos, **opciones),
+                         FuenteLocal(Robot(*pose_inicial(objetivos), dt=periodo), latencia), periodo=periodo,
+                         objetivos=objetivos)
+            for _ in range(robots)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--controlador", choices=sorted(CONTROLADORES), default="experto")
+    parser.add_argument("--ruta", choices=list(RUTAS), default="rectas")
+    parser.add_argument("--robots", type=int, default=1, help="Robots en el mismo bucle de eventos")
+    parser.add_argument("--frecuencia", type=float, default=20.0, help="Frecuencia del bucle de control (Hz)")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Tiempo real máximo en segundos")
+    parser.add_argument("--latencia", type=float, default=0.0, help="Retardo de cada lectura de la pose (s)")
+    parser.add_argument("--sin-escalonar", action="store_true", help="Todos los robots deciden en el mismo instante")
+    parser.add_argument("--opcion", action="append", default=[], type=leer_opcion, metavar="NOMBRE=VALOR")
+    parser.add_argument("--json", metavar="FICHERO", help="Guarda los resultados en JSON")
+    args = parser.parse_args()
+
+    objetivos = RUTAS[args.ruta]()
+    bucles = crear_bucles(args.controlador, objetivos, args.robots, 1.0 / args.frecuencia, args.latencia,
+                          **dict(args.opcion))
+    resultados = asyncio.run(ejecutar_bucles(bucles, duracion=args.duracion, escalonar=not args.sin_escalonar))
+
+    # Histogramas de todos los robots juntos
+    totales = {nombre: Histograma() for nombre in ("jitter", "computo", "ciclo")}
+    for bucle in bucles:
+        for nombre, histograma in totales.items():
+            histograma.combinar(getattr(bucle, nombre))
+    ticks = sum(r["ticks"] for r in resultados)
+    perdidos = sum(r["perdidos"] for r in resultados)
+
+    print(f"controlador:          {args.controlador} x {args.robots} robots a {args.frecuencia:g} Hz")
+    print(f"ticks:                {ticks} ({ticks / args.robots:.0f} por robot)")
+    print(f"plazos incumplidos:   {perdidos} ({100 * perdidos / max(ticks, 1):.2f} %), "
+          f"{sum(r['saltados'] for r in resultados)} ticks saltados")
+    print(f"rutas completadas:    {sum(r['completada'] for r in resultados)}/{args.robots}")
+    print(f"\n{'(µs)':10s}{'media':>10s}{'p50':>10s}{'p90':>10s}{'p99':>10s}{'máximo':>10s}")
+    for nombre, histograma in totales.items():
+        resumen = histograma.resumen()
+        print(f"{nombre:10s}" + "".join(f"{resumen[campo] / 1e3:10.1f}" for campo in ("media", "p50", "p90", "p99", "maximo")))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"robots": resultados, "totales": {nombre: h.resumen() for nombre, h in totales.items()}}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
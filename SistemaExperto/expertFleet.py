@@ -0,0 +1,216 @@
+'''
+ Controlador de flota para el Sistema Experto
+ Aplica las reglas de ExpertSystem a N robots a la vez, guardando el estado de
+ cada robot en arrays (estructura de arrays) en lugar de un objeto por robot.
+
+ Creado por: Stanislav Gatin
+
+'''
+
+import numpy as np
+from robot import WACC, WMAX, VACC, VMAX
+from expertSystem import ConfiguracionExperto, ExpertSystem
+from rutaCompilada import RutaCompilada
+from rutaLanzador import objetivos_lanzador
+
+
+class FlotaExpertSystem:
+    """
+    Versión vectorizada de `ExpertSystem.tomarDecision` para una flota de robots sobre la misma ruta.
+
+    Cada robot tiene como objetivo un segmento de la ruta (`indice_objetivo`), que asigna el
+    lanzador con `setObjetivo`, igual que en el controlador individual. Las trayectorias de
+    todos los segmentos se generan una sola vez con un `ExpertSystem` de plantilla, suponiendo
+    que el segmento i de la ruta se recorre con `segment_number == i`.
+    """
+
+    def __init__(self, numero_robots: int, objetivos=None, directorio_cache: str = None,
+                 configuracion: ConfiguracionExperto = None, **constantes) -> None:
+        """
+        Args:
+            numero_robots (int): Número de robots de la flota.
+            objetivos (list, opcional): Segmentos de la ruta. Por defecto `P1Launcher.objectiveSet`.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+            configuracion (ConfiguracionExperto, opcional): Constantes de ajuste de la plantilla.
+            **constantes: Constantes de ajuste de la plantilla (ver `ExpertSystem.CONSTANTES_AJUSTE`).
+
+        Raises:
+            ValueError: Si la plantilla usa una `LEY_SEGUIMIENTO` continua, `PERFIL_VELOCIDAD` o
+                `AVANCE_POR_PROYECCION`; la flota solo vectoriza las reglas reactivas de checkpoints.
+        """
+        if objetivos is None:
+            objetivos = objetivos_lanzador()
+
+        # --- Plantilla con las constantes de ajuste y los generadores de trayectoria ---
+        self.objetivos: list = list(objetivos)
+        self.plantilla: ExpertSystem = ExpertSystem(objetivos=self.objetivos, configuracion=configuracion, **constantes)
+        self.TOTAL_SEGMENT_NUMBER: int = len(self.objetivos)
+        if self.plantilla.config.LEY_SEGUIMIENTO != "checkpoints":
+            raise ValueError(f"FlotaExpertSystem no admite LEY_SEGUIMIENTO={self.plantilla.config.LEY_SEGUIMIENTO!r}")
+        if self.plantilla.config.PERFIL_VELOCIDAD:
+            raise ValueError("FlotaExpertSystem no admite PERFIL_VELOCIDAD")
+        if self.plantilla.config.AVANCE_POR_PROYECCION:
+            raise ValueError("FlotaExpertSystem no admite AVANCE_POR_PROYECCION")
+
+        # --- Trayectorias de la ruta: puntos contiguos y desplazamiento de cada segmento ---
+        self.ruta: RutaCompilada = self.plantilla.compilar_ruta(self.objetivos, directorio_cache)
+        self.tipos, self.puntos, self.offsets = self.ruta.tipos, self.ruta.puntos, self.ruta.offsets
+        self.longitudes: np.ndarray = self.ruta.longitudes
+
+        # --- Estado por robot (estructura de arrays) ---
+        n = numero_robots
+        self.indice_objetivo: np.ndarray = np.zeros(n, dtype=np.int64)          # Segmento objetivo de cada robot
+        self.objetivoAlcanzado: np.ndarray = np.zeros(n, dtype=bool)
+        self.segment_number: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.check_point_segmento: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.check_point_triangulo: np.ndarray = np.zeros(n, dtype=np.int64)
+        self.CHECKPOINT_DISTANCE_ACTIVATOR: np.ndarray = np.full(n, self.plantilla.CHECKPOINT_DISTANCE_ACTIVATOR)
+        self.FRENAR: np.ndarray = np.zeros(n, dtype=bool)
+        self.reverse: np.ndarray = np.zeros(n, dtype=bool)
+        self.velocidad: np.ndarray = np.zeros(n)
+        self.velocidad_angular: np.ndarray = np.zeros(n)
+        self.distance: np.ndarray = np.zeros(n)
+        self.turn_angle_deg: np.ndarray = np.zeros(n)
+
+    def setObjetivo(self, indice_segmento, robots=None):
+        """
+        Asigna a los robots indicados (todos por defecto) el segmento `indice_segmento` de la ruta.
+        """
+        robots = slice(None) if robots is None else robots
+        self.objetivoAlcanzado[robots] = False
+        self.indice_objetivo[robots] = indice_segmento
+
+    def esObjetivoAlcanzado(self):
+        return self.objetivoAlcanzado
+
+    def normalize_angle(self, angle):
+        """
+        Normaliza ángulos al rango [-180, 180) grados.
+        """
+        return (angle + 180) % 360 - 180
+
+    def calcular_angulo(self, x_target, y_target, x_robot, y_robot, current_angle):
+        """
+        Diferencia angular, en grados, entre la dirección hacia cada objetivo y la orientación de cada robot.
+        """
+        goal_angle_degrees = self.normalize_angle(np.degrees(np.arctan2(y_target - y_robot, x_target - x_robot)))
+        current_angle = self.normalize_angle(current_angle)
+        return self.normalize_angle(goal_angle_degrees - current_angle)
+
+    def obtener_coordenadas_objetivo(self, linea):
+        """
+        Selecciona el checkpoint objetivo de cada robot y actualiza `FRENAR` y `CHECKPOINT_DISTANCE_ACTIVATOR`.
+
+        Args:
+            linea (numpy.ndarray): Máscara de los robots cuyo segmento objetivo es lineal.
+        """
+        en_inicio = linea & (self.check_point_segmento == 0)
+        primer_segmento = en_inicio & (self.segment_number == 0)
+        self.FRENAR[primer_segmento] = True
+        self.CHECKPOINT_DISTANCE_ACTIVATOR[primer_segmento] = 2
+
+        en_recorrido = linea & (self.check_point_segmento != 0)
+        self.FRENAR[en_recorrido] = False
+        self.CHECKPOINT_DISTANCE_ACTIVATOR[en_recorrido] = 0.5
+        self.FRENAR[~linea] = False
+
+        check_point = np.where(linea, self.check_point_segmento, self.check_point_triangulo)
+        objetivo = self.puntos[self.offsets[self.indice_objetivo] + check_point]
+        return objetivo[:, 0], objetivo[:, 1]
+
+    def calcular_velocidad_lineal(self, linea, turn_angle_rad, distance):
+        """
+        Ley de velocidad lineal de `ExpertSystem.calcular_velocidad_lineal` para toda la flota.
+        """
+        p = self.plantilla.config
+        giro = np.abs(turn_angle_rad)
+        en_inicio = self.check_point_segmento == 0
+
+        # --- Segmentos lineales ---
+        arranque = en_inicio & ((giro < np.radians(distance * p.DISTANCE_TURN_CONSTANT)) | (giro < np.radians(p.MAXIMUM_ANGLE_DEG)))
+        crucero = ~en_inicio & (giro < np.radians(p.MAXIMUM_ANGLE_DEG))
+        velocidad_linea = np.where(arranque, np.minimum(VMAX, distance * VACC * p.CONSTANTE_AUMENTAR_VELOCIDAD),
+                                   np.where(crucero, 3, 0))
+
+        # --- Segmentos triangulares ---
+        velocidad_angular_factor = np.maximum(0, 1 - giro / np.radians(90))
+        factor_final = np.where(self.segment_number == self.TOTAL_SEGMENT_NUMBER - 1, 1.5, 1.25)
+        velocidad_triangulo = np.minimum(VMAX, distance * VACC * p.TRIANGLE_SPEED * velocidad_angular_factor * factor_final)
+
+        self.velocidad = np.where(linea, velocidad_linea, velocidad_triangulo).astype(np.float64)
+
+    def calcular_velocidad_angular(self, linea, turn_angle_rad):
+        """
+        Ley de velocidad angular de `ExpertSystem.calcular_velocidad_angular` para toda la flota.
+        """
+        w = np.clip(turn_angle_rad * WACC * self.plantilla.config.VELOCIDAD_ANGULAR_CONSTANT, -WMAX, WMAX)
+        self.velocidad_angular = np.where(linea, w, np.clip(w * 1.5, -WMAX, WMAX))
+
+    def verificar_proximidad_objetivo(self, linea, distance):
+        """
+        Transiciones de checkpoint, segmento y frenado de `ExpertSystem.verificar_proximidad_objetivo`.
+        """
+        p = self.plantilla.config
+        ultimo = self.longitudes[self.indice_objetivo] - 1
+        triangulo = ~linea
+
+        # --- Segmentos lineales ---
+        fin_linea = linea & (distance <= p.STOP_DISTANCE) & (self.check_point_segmento == ultimo)
+        siguiente_linea = linea & ~fin_linea & (distance < self.CHECKPOINT_DISTANCE_ACTIVATOR) & (self.check_point_segmento < ultimo)
+        frenado = linea & ~fin_linea & ~siguiente_linea & self.FRENAR
+
+        self.segment_number[fin_linea] += 1
+        if p.VOLVER_AL_INICIO:
+            self.objetivoAlcanzado[fin_linea] = self.segment_number[fin_linea] != self.TOTAL_SEGMENT_NUMBER
+        else:
+            self.objetivoAlcanzado[fin_linea] = True
+        self.check_point_segmento[fin_linea] = 0
+        self.check_point_segmento[siguiente_linea] += 1
+
+        # Reducción suave de la velocidad en la distancia de frenado
+        stop_distance = self.velocidad ** 2 / (2 * VACC)
+        frenado &= (distance <= stop_distance) & (stop_distance > 0)
+        self.velocidad[frenado] *= distance[frenado] / stop_distance[frenado]
+
+        # --- Segmentos triangulares (FRENAR siempre es False en ellos) ---
+        fin_triangulo = triangulo & (distance <= 0.5) & (self.check_point_triangulo == ultimo)
+        siguiente_triangulo = triangulo & ~fin_triangulo & (distance <= p.MINIMUM_DISTANCE_TRIANGLE_CP) & (self.check_point_triangulo <= ultimo - 1)
+
+        self.objetivoAlcanzado[fin_triangulo] = True
+        self.check_point_triangulo[fin_triangulo] = 0
+        self.segment_number[fin_triangulo] += 1
+        self.check_point_triangulo[siguiente_triangulo] += 1
+
+    def tomarDecision(self, posesRobots):
+        """
+        Calcula las velocidades de todos los robots de la flota en una sola llamada.
+
+        Args:
+            posesRobots (numpy.ndarray): Array (N, >=3) con (x_robot, y_robot, current_angle) de cada robot.
+
+        Returns:
+            tuple: Arrays (V, W) de velocidades lineales y angulares, de longitud N.
+        """
+        poses = np.asarray(posesRobots, dtype=np.float64)
+        x_robot, y_robot, current_angle = poses[:, 0], poses[:, 1], poses[:, 2]
+        linea = self.tipos[self.indice_objetivo] == 1
+
+        # --- RECOPILAR DATOS ---
+        x_target, y_target = self.obtener_coordenadas_objetivo(linea)
+
+        # --- CÁLCULO DE ANGULO Y MODO DE MOVIMIENTO ---
+        turn_angle_deg = self.calcular_angulo(x_target, y_target, x_robot, y_robot, current_angle)
+        self.reverse = np.abs(turn_angle_deg) > self.plantilla.config.REVERSE_THRESHOLD
+        self.turn_angle_deg = np.where(self.reverse, self.normalize_angle(turn_angle_deg - 180), turn_angle_deg)
+        turn_angle_rad = np.radians(self.turn_angle_deg)
+
+        # --- VELOCIDADES Y PROXIMIDAD ---
+        self.calcular_velocidad_angular(linea, turn_angle_rad)
+        self.distance = np.sqrt((x_target - x_robot) ** 2 + (y_target - y_robot) ** 2)
+        self.calcular_velocidad_lineal(linea, turn_angle_rad, self.distance)
+        self.verificar_proximidad_objetivo(linea, self.distance)
+
+        # --- AJUSTE DE LA VELOCIDAD PARA MOVIMIENTO REVERSO ---
+        self.velocidad = np.where(self.reverse, -self.velocidad, self.velocidad)
+
+        return self.velocidad, self.velocidad_angular
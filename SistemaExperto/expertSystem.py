@@ -12,17 +12,150 @@ from segmento import *
 import math
 from robot import WACC, WMAX, VACC, VMAX
 import numpy as np
-
+from dataclasses import dataclass, fields, replace
+from rutaCompilada import RutaCompilada
+from rutaLanzador import objetivos_lanzador
+from segmentosStream import FlujoSegmentos, RutaVentana, abrir_flujo
+from proyeccion import checkpoint_adelantado
+from muestreoAdaptativo import bezier_adaptativa, divisiones_recta
+from perfilVelocidad import perfil_velocidad
+from seguimiento import LEYES_SEGUIMIENTO, SeguidorTrayectoria
+from telemetria import Telemetria, obtener_logger
+from trazas import GrabadorTraza
+from decision import Decision
+from configuracion import constantes_de_solo_lectura
+from geometria import (altura_relativa, bezier_cubica, circuncentro, desplazar_perpendicular,
+                       puntos_control, tangente_circunscrita)
+
+logger = obtener_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ConfiguracionExperto:
+    """
+    Constantes de ajuste del ExpertSystem.
+
+    Es inmutable, así que una misma configuración puede compartirse entre todos los controladores
+    que la usen (p. ej. `ExpertSystem(configuracion=config)` para cada robot de una flota).
+    """
+
+    # --- Trayecto ---
+    VOLVER_AL_INICIO: bool = True                     # Controla si el robot debe regresar al punto inicial
+
+    # --- Trayectoria lineal ---
+    LINE_CHECKPOINTS: int = 20                        # Cantidad de puntos de control en trayecto lineal
+    STOP_DISTANCE: float = 0.2                        # Distancia para detener el robot
+    CHECKPOINT_DISTANCE_ACTIVATOR: float = 0.5        # Valor inicial de la distancia que activa cambio de punto de control
+    CONSTANTE_AUMENTAR_VELOCIDAD: float = 1.5         # Constante para aumentar velocidad
+    LINE_EXPANSION_FACTOR: float = 0.03               # Factor para extender punto inicial de la trayectoria lineal
+
+    # --- Trayectoria triangular ---
+    MAX_TRIANGLE_CHECKPOINTS: int = 4                 # Cantidad máxima de puntos en trayecto triangular
+    CONTROL_POINT_CONSTANT: float = 0.5               # Constante para ajustar puntos de control
+    TRIANGLE_SPEED: float = 1                         # Velocidad para movimiento triangular
+    MINIMUM_DISTANCE_TRIANGLE_CP: float = 1.5         # Distancia mínima para activar puntos de control
+    CURVE_EXPANSION_FACTOR: float = 0.25              # Factor para expansión de curvas
+    CURVE_CONTROLL_POINTS_OFFSET: float = 0.5         # Desplazamiento de puntos de control en curvas
+
+    # --- Muestreo adaptativo ---
+    MUESTREO_ADAPTATIVO: bool = False                 # Reparte los checkpoints según la longitud y la curvatura de cada tramo
+    ESPACIADO_MAXIMO: float = 2.0                     # Longitud máxima entre checkpoints consecutivos (m)
+    TOLERANCIA_MUESTREO: float = 0.05                 # Separación máxima entre la curva y la cuerda entre checkpoints (m)
+
+    # --- Ángulos y control de giros ---
+    REVERSE_THRESHOLD: int = 90                       # Umbral en grados para activar marcha atrás
+    MAXIMUM_ANGLE_DEG: int = 10                       # Ángulo máximo antes de desviarse
+    DISTANCE_TURN_CONSTANT: float = 4.5               # Constante para ajustar ángulo según distancia
+    VELOCIDAD_ANGULAR_CONSTANT: int = 2               # Constante para ajustar velocidad angular
+
+    # --- Avance de checkpoints ---
+    AVANCE_POR_PROYECCION: bool = False               # Adelanta el checkpoint proyectando la pose sobre la trayectoria
+    VENTANA_PROYECCION: int = 8                       # Aristas de la trayectoria en las que se busca la proyección
+
+    # --- Perfil de velocidad ---
+    PERFIL_VELOCIDAD: bool = False                    # Toma la velocidad lineal de un perfil planificado sobre toda la ruta
+
+    # --- Ley de seguimiento ---
+    LEY_SEGUIMIENTO: str = "checkpoints"              # "checkpoints" (reglas por checkpoint), "pure_pursuit" o "stanley"
+    ANTICIPACION_MINIMA: float = 1.0                  # Distancia de anticipación de pure pursuit en reposo (m)
+    ANTICIPACION_POR_VELOCIDAD: float = 0.6           # Segundos de anticipación: se suman a la mínima por cada m/s
+    GANANCIA_STANLEY: float = 1.5                     # Ganancia del error transversal en Stanley (1/s)
+    SUAVIZADO_STANLEY: float = 0.5                    # Velocidad que suaviza Stanley a baja velocidad (m/s)
+    DISTANCIA_LLEGADA: float = 0.5                    # Distancia al final del segmento para darlo por recorrido al rebasarlo
+
+
+_CONFIGURACION_POR_DEFECTO = ConfiguracionExperto()
+
+
+@constantes_de_solo_lectura
 class ExpertSystem:
-    
-    def __init__(self) -> None:
-        from P1Launcher import objectiveSet  # Importación de los objetivos del trayecto
+
+    # Constantes de ajuste que pueden indicarse en el constructor (p. ej. ExpertSystem(STOP_DISTANCE=0.3))
+    CONSTANTES_AJUSTE: tuple = tuple(campo.name for campo in fields(ConfiguracionExperto))
+
+    # Etapas de tomarDecision que mide el perfilado (ver Comun/perfilado.py)
+    ETAPAS_PERFILADO: tuple = (
+        "seguir_trayectoria", "decidir_por_checkpoints", "obtener_coordenadas_objetivo", "obtener_trayectoria",
+        "calcular_angulo", "decidir_modo_movimiento", "calcular_velocidad_angular", "calcular_distancia_objetivo",
+        "calcular_velocidad_lineal", "verificar_proximidad_objetivo",
+    )
+
+    # Constantes sin uso en las reglas actuales
+    GO_AROUND_TRIANGLE: bool = False                  # Indica si el robot debe rodear un obstáculo triangular
+    FIRST_SEGMENT_INDEX: int = 0                      # Índice del primer segmento
+
+    # Estado mutable del controlador; las constantes de ajuste viven en `config`
+    __slots__ = (
+        "config", "objetivoAlcanzado", "segmentoObjetivo", "FRENAR",
+        "velocidad", "velocidad_angular", "reverse",
+        "check_point_segmento", "line_trayectory", "start_point", "segment_number", "distance",
+        "CHECKPOINT_DISTANCE_ACTIVATOR", "TOTAL_SEGMENT_NUMBER",
+        "check_point_triangulo", "CURRENT_TRIANGLE_CHECKPOINTS", "triangle_trayectory",
+        "turn_angle_rad", "turn_angle_deg",
+        "flujo", "ruta", "perfil", "seguidor", "telemetria", "traza",
+    )
+
+    def __init__(self, usar_ruta_compilada: bool = False, directorio_cache: str = None,
+                 objetivos=None, ventana_segmentos: int = 8,
+                 configuracion: ConfiguracionExperto = None, **constantes) -> None:
+        """
+        Args:
+            usar_ruta_compilada (bool): Precalcula las trayectorias de toda la ruta al construir.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+            objetivos (list | iterable | str, opcional): Segmentos de la ruta. Una lista o tupla se usa
+                entera; un iterador, generador, `FlujoSegmentos` o fichero de segmentos se lee a medida
+                que se avanza (ver `segmentosStream.py`). Por defecto, `P1Launcher.objectiveSet`.
+            ventana_segmentos (int): Segmentos que se leen (y, con ruta compilada, se generan) por
+                delante del actual cuando la ruta es un flujo.
+            configuracion (ConfiguracionExperto, opcional): Constantes de ajuste, compartidas con otros
+                controladores. Por defecto, las de `ConfiguracionExperto()`.
+            **constantes: Valores para cualquiera de las `CONSTANTES_AJUSTE`, que sustituyen a los de `configuracion`.
+
+        Raises:
+            TypeError: Si alguna constante indicada no está en `CONSTANTES_AJUSTE`.
+            ValueError: Si la ruta es un flujo y se pide `directorio_cache` o `PERFIL_VELOCIDAD`, que
+                necesitan la ruta completa, o si `LEY_SEGUIMIENTO` no está en `LEYES_SEGUIMIENTO`.
+        """
+
+        # --- Constantes de ajuste ---
+        for nombre in constantes:
+            if nombre not in self.CONSTANTES_AJUSTE:
+                raise TypeError(f"ExpertSystem() got an unexpected keyword argument {nombre!r}")
+        config = configuracion if configuracion is not None else _CONFIGURACION_POR_DEFECTO
+        self.config: ConfiguracionExperto = replace(config, **constantes) if constantes else config
+        if self.config.LEY_SEGUIMIENTO not in LEYES_SEGUIMIENTO:
+            raise ValueError(f"LEY_SEGUIMIENTO={self.config.LEY_SEGUIMIENTO!r} no es ninguna de {LEYES_SEGUIMIENTO}")
+
+        # --- Ruta: lista completa o flujo de segmentos leído por delante ---
+        if objetivos is None:
+            objetivos = objetivos_lanzador()
+        self.flujo: FlujoSegmentos = abrir_flujo(objetivos, ventana_segmentos) # None si la ruta es una lista
+        if self.flujo is not None and (directorio_cache is not None or self.config.PERFIL_VELOCIDAD):
+            raise ValueError("directorio_cache y PERFIL_VELOCIDAD necesitan la ruta completa, no un flujo de segmentos")
 
         # --- Flags y estados del trayecto ---
         self.objetivoAlcanzado: bool = False           # Indica si el robot ha alcanzado su objetivo final
         self.segmentoObjetivo: object = None           # Segmento actual del trayecto
-        self.VOLVER_AL_INICIO: bool = True             # Controla si el robot debe regresar al punto inicial
-        self.GO_AROUND_TRIANGLE: bool = False          # Indica si el robot debe rodear un obstáculo triangular
         self.FRENAR: bool = None                       # Indica si el robot debe frenar
 
         # --- Velocidades y modos de movimiento ---
@@ -30,38 +163,45 @@ class ExpertSystem:
         self.velocidad_angular: float = 0              # Velocidad angular inicial (en rad/s)
         self.reverse: bool = False                     # Modo reversa activado/desactivado
 
-        # --- Parámetros de la trayectoria lineal ---
+        # --- Estado de la trayectoria lineal ---
         self.check_point_segmento: int = 0             # Estado del trayecto: punto inicial o final
-        self.LINE_CHECKPOINTS: int = 20                # Cantidad de puntos de control en trayecto lineal
         self.line_trayectory = None                    # Lista de coordenadas del trayecto lineal
         self.start_point: tuple = None                 # Punto de inicio del trayecto
         self.segment_number: int = 0                   # Número del segmento actual
         self.distance: int = 0                         # Distancia al punto objetivo
-        self.STOP_DISTANCE: float = 0.2                # Distancia para detener el robot
-        self.CHECKPOINT_DISTANCE_ACTIVATOR: float = 0.5 # Distancia que activa cambio de punto de control
-        self.CONSTANTE_AUMENTAR_VELOCIDAD: float = 1.5  # Constante para aumentar velocidad
-        self.FIRST_SEGMENT_INDEX: int = 0              # Índice del primer segmento
-        self.TOTAL_SEGMENT_NUMBER: int = len(objectiveSet) # Número total de segmentos
-        self.LINE_EXPANSION_FACTOR: float = 0.03       # Factor para extender punto inicial de la trayectoria lineal
-
-        # --- Parámetros de la trayectoria triangular ---
+        self.CHECKPOINT_DISTANCE_ACTIVATOR: float = self.config.CHECKPOINT_DISTANCE_ACTIVATOR # Cambia entre segmentos
+        self.TOTAL_SEGMENT_NUMBER: int = len(objetivos) if self.flujo is None else self.flujo.total # Total de segmentos (inf hasta agotar el flujo)
+
+        # --- Estado de la trayectoria triangular ---
         self.check_point_triangulo: int = 0            # Contador de puntos de control en trayecto triangular
-        self.MAX_TRIANGLE_CHECKPOINTS: int = 4         # Cantidad máxima de puntos en trayecto triangular
         self.CURRENT_TRIANGLE_CHECKPOINTS: int = 0     # Puntos actuales en la trayectoria triangular
         self.triangle_trayectory = None                # Lista de coordenadas del trayecto triangular
-        self.CONTROL_POINT_CONSTANT: float = 0.5       # Constante para ajustar puntos de control
-        self.TRIANGLE_SPEED: float = 1                 # Velocidad para movimiento triangular
-        self.MINIMUM_DISTANCE_TRIANGLE_CP: float = 1.5 # Distancia mínima para activar puntos de control
-        self.CURVE_EXPANSION_FACTOR: float = 0.25      # Factor para expansión de curvas
-        self.CURVE_CONTROLL_POINTS_OFFSET: float = 0.5 # Desplazamiento de puntos de control en curvas
 
-        # --- Ángulos y control de giros ---
+        # --- Ángulos de giro ---
         self.turn_angle_rad: float = 0.0               # Ángulo de giro en radianes
         self.turn_angle_deg: float = 0.0               # Ángulo de giro en grados
-        self.REVERSE_THRESHOLD: int = 90               # Umbral en grados para activar marcha atrás
-        self.MAXIMUM_ANGLE_DEG: int = 10               # Ángulo máximo antes de desviarse
-        self.DISTANCE_TURN_CONSTANT: float = 4.5       # Constante para ajustar ángulo según distancia
-        self.VELOCIDAD_ANGULAR_CONSTANT: int = 2       # Constante para ajustar velocidad angular
+
+        # --- Ley de seguimiento continua (opcional) ---
+        self.seguidor: SeguidorTrayectoria = None      # Pure pursuit o Stanley; None con las reglas por checkpoint
+        if self.config.LEY_SEGUIMIENTO != "checkpoints":
+            self.seguidor = SeguidorTrayectoria()
+
+        # --- Ruta compilada (opcional; la ley continua la usa para anticipar el segmento siguiente) ---
+        self.ruta: RutaCompilada = None                # Trayectorias de todos los segmentos, precalculadas
+        if usar_ruta_compilada or self.config.PERFIL_VELOCIDAD or self.seguidor is not None:
+            self.ruta = self.compilar_ruta(objetivos, directorio_cache) if self.flujo is None else \
+                RutaVentana(self.flujo, self.trayectoria_segmento)
+
+        # --- Perfil de velocidad (opcional) ---
+        self.perfil: list = None                       # Velocidad planificada de cada checkpoint, por segmento
+        if self.config.PERFIL_VELOCIDAD:
+            self.perfil = self.planificar_perfil(self.ruta)
+
+        # --- Telemetría (opcional) ---
+        self.telemetria: Telemetria = None            # Registro por tick; None la desactiva sin coste
+
+        # --- Grabación de trazas (opcional) ---
+        self.traza: GrabadorTraza = None              # Grabador de ticks para reproducirlos; None lo desactiva
 
     # función setObjetivo
     #   Especifica un segmento como objetivo para el recorrido del robot
@@ -104,18 +244,12 @@ class ExpertSystem:
         para permitir una curva más amplia si la base es corta y C está lejos de ella, o una curva más 
         cerrada si la base es larga y C está cerca.
         """
-        # Calcula la longitud de la base AB
-        longitud_base = math.dist(A, B)
-        
-        # Calcula la altura desde el punto C hasta la línea AB
-        altura = abs((B[1] - A[1]) * C[0] - (B[0] - A[0]) * C[1] + B[0] * A[1] - B[1] * A[0]) / longitud_base
-        
-        # Calcula el offset, normalizando el valor
-        offset = self.CURVE_CONTROLL_POINTS_OFFSET + (2 * (altura / (longitud_base + 1)))
+        # Calcula el offset a partir de la altura de C sobre la base AB, normalizada por su longitud
+        offset = self.config.CURVE_CONTROLL_POINTS_OFFSET + 2 * altura_relativa(A, B, C)
         
         # Limita el offset entre 0.5 y 1.5
         offset = max(0.5, min(offset, 1.5))
-        print(offset)
+        logger.debug("Offset de los puntos de control: %s", offset)
         
         return offset
 
@@ -124,171 +258,63 @@ class ExpertSystem:
         Calcula los puntos de control que definen las curvas fuera de la línea entre los puntos clave.
 
         Parámetros:
-        B, C, D (numpy.array): Los puntos clave entre los cuales se construirán las curvas.
-        offset (float): La distancia que define cuánto se desplazan los puntos de control desde la línea recta.
+        B, C, D (tuple): Los puntos clave entre los cuales se construirán las curvas.
 
         Retorna:
-        tuple: Los puntos de control CP1 y CP2 que generan las curvas suaves entre B-C y C-D.
+        tuple: Los puntos de control CP1 y CP2 (tuplas (x, y)) que generan las curvas suaves entre B-C y C-D,
+        desplazados `calcular_offset(B, D, C)` en perpendicular a cada tramo (`geometria.puntos_control`).
         """
-        # Vectores de dirección de B a C y de C a D
-        vBC = np.array(C) - np.array(B)
-        vCD = np.array(D) - np.array(C)
-
-        # Normalización para obtener la dirección perpendicular
-        norm_vBC = np.array([-vBC[1], vBC[0]]) / np.linalg.norm(vBC)
-        norm_vCD = np.array([-vCD[1], vCD[0]]) / np.linalg.norm(vCD)
-        
-        offset = self.calcular_offset(B,D,C)
-
-        # Desplazamiento de los puntos de control según el offset
-        CP1 = np.array(B) + self.CONTROL_POINT_CONSTANT * vBC + offset * norm_vBC  # Desplazamiento de CP1
-        CP2 = np.array(C) + self.CONTROL_POINT_CONSTANT * vCD + offset * norm_vCD  # Desplazamiento de CP2
+        return puntos_control(B, C, D, self.config.CONTROL_POINT_CONSTANT, self.calcular_offset(B, D, C))
 
-        return CP1, CP2
-    
     def move_point_C_perpendicular(self, B, C, D):
         """
-        Desplaza el punto C hacia arriba en relación con el segmento B-D a una distancia dada.
+        Desplaza el punto C `CURVE_EXPANSION_FACTOR` en dirección perpendicular al segmento B-D.
 
         Parámetros:
-        B, C, D (numpy.array): Puntos B, C y D.
-        distancia (float): Distancia para desplazar el punto C.
+        B, C, D (tuple): Puntos B, C y D.
 
         Devuelve:
-        numpy.array: Nuevo punto C desplazado perpendicularmente al segmento B-D.
+        tuple: Nuevo punto C desplazado perpendicularmente al segmento B-D.
         """
-        B = np.array(B)
-        C = np.array(C)
-        D = np.array(D)
-
-        # Vector de B a D
-        vector_BD = D - B
-
-        # Vector perpendicular a BD (en 2D se pueden intercambiar los componentes e invertir el signo de uno de ellos)
-        vector_perpendicular = np.array([-vector_BD[1], vector_BD[0]])  # Vector perpendicular a BD
-
-        # Normalizamos el vector perpendicular
-        vector_perpendicular_unitario = vector_perpendicular / np.linalg.norm(vector_perpendicular)
-
-        # Desplazamos el punto C a lo largo del vector perpendicular
-        nuevo_C = C + vector_perpendicular_unitario * self.CURVE_EXPANSION_FACTOR
+        return desplazar_perpendicular(C, B, D, self.config.CURVE_EXPANSION_FACTOR)
 
-        return nuevo_C
-    
     def find_circumcenter(self, B, C, D):
         """
-        Encuentra el circuncentro del triángulo definido por los puntos B, C y D.
+        Encuentra el circuncentro del triángulo definido por los puntos B, C y D, en forma cerrada
+        (`geometria.circuncentro`).
 
         Parámetros:
-        B, C, D (numpy.array): Puntos que definen los vértices del triángulo.
+        B, C, D (tuple): Puntos que definen los vértices del triángulo.
 
         Devuelve:
         numpy.array: Coordenadas del circuncentro del triángulo.
 
         Lanza:
-        ValueError: Si las líneas perpendiculares no se intersectan en un único punto.
-        """
-        A = np.array(B)
-        B = np.array(C)
-        C = np.array(D)
-
-        # Calculamos los vectores AB, BC, CA
-        AB = B - A
-        BC = C - B
-        CA = A - C
-
-        # Encontramos los puntos medios de los vectores
-        punto_medio_AB = A + 0.5 * AB
-        punto_medio_BC = B + 0.5 * BC
-        punto_medio_CA = C + 0.5 * CA
-
-        # Calculamos las direcciones de las líneas perpendiculares
-        perp_AB = np.array([-AB[1], AB[0]])
-        perp_BC = np.array([-BC[1], BC[0]])
-        perp_CA = np.array([-CA[1], CA[0]])
-
-        # Ecuaciones de las líneas en la forma Ax + By = C
-        def ecuacion_linea(p1, p2):
-            """
-            Calcula la ecuación de una línea en la forma Ax + By = C.
-
-            Parámetros:
-            p1, p2 (numpy.array): Puntos por los que pasa la línea.
-
-            Devuelve:
-            tuple: Coeficientes A, B y C de la ecuación de la línea.
-            """
-            A = p2[1] - p1[1]
-            B = p1[0] - p2[0]
-            C = A * p1[0] + B * p1[1]
-            return A, B, C
-
-        # Ecuaciones de las líneas perpendiculares en los puntos medios
-        A1, B1, C1 = ecuacion_linea(punto_medio_AB, punto_medio_AB + perp_AB)
-        A2, B2, C2 = ecuacion_linea(punto_medio_BC, punto_medio_BC + perp_BC)
-        A3, B3, C3 = ecuacion_linea(punto_medio_CA, punto_medio_CA + perp_CA)
-
-        # Encontramos el punto de intersección de las dos primeras líneas
-        def interseccion(A1, B1, C1, A2, B2, C2):
-            """
-            Calcula el punto de intersección de dos líneas en la forma Ax + By = C.
-
-            Parámetros:
-            A1, B1, C1 (float): Coeficientes de la primera línea.
-            A2, B2, C2 (float): Coeficientes de la segunda línea.
-
-            Devuelve:
-            numpy.array: Coordenadas del punto de intersección.
-
-            Lanza:
-            ValueError: Si las líneas son paralelas o no se intersectan.
-            """
-            det = A1 * B2 - A2 * B1
-            if det == 0:
-                raise ValueError("Las líneas no se intersectan o son paralelas")
-            x = (B2 * C1 - B1 * C2) / det
-            y = (A1 * C2 - A2 * C1) / det
-            return np.array([x, y])
-
-        # Calculamos el punto de intersección de las dos primeras líneas
-        P = interseccion(A1, B1, C1, A2, B2, C2)
-
-        # Verificamos que el punto P está en la tercera línea
-        if np.isclose(A3 * P[0] + B3 * P[1], C3):
-            return P
-        else:
-            raise ValueError("Las líneas no se intersectan en un único punto")
-    
+        ValueError: Si los puntos están alineados y el circuncentro no existe.
+        """
+        centro = circuncentro(B, C, D)
+        if centro is None:
+            raise ValueError("Los puntos están alineados: el circuncentro no existe")
+        return np.array(centro)
+
     def add_point_above_D(self, B, C, D):
         """
-        Crea tres puntos por encima del punto D que son perpendiculares al segmento B-D.
+        Crea tres puntos desplazados desde D en dirección tangente a la circunferencia que pasa por B, C y D.
 
         Parámetros:
-        B, C, D (numpy.array): Coordenadas de los puntos B, C y D.
+        B, C, D (tuple): Coordenadas de los puntos B, C y D.
 
         Devuelve:
-        tuple: Tres nuevos puntos desplazados perpendicularmente al segmento B-D.
-        """
-        # Encuentra el punto de referencia como el circuncentro de B, C y D
-        punto_referencia = self.find_circumcenter(B, C, D)
-        D = np.array(D)
-
-        # Vector desde el punto de referencia hacia D
-        vector_BD = D - punto_referencia
-
-        # Vector perpendicular al segmento BD
-        vector_perpendicular = np.array([-vector_BD[1], vector_BD[0]])
+        tuple: Tres nuevos puntos (tuplas (x, y)) a 4, 2.5 y 1.5 de D.
 
-        # Normaliza el vector perpendicular
-        vector_perpendicular_unitario = vector_perpendicular / np.linalg.norm(vector_perpendicular)
-
-        # Desplaza el punto D para generar nuevos puntos
-        nuevo_punto1 = D + vector_perpendicular_unitario * 4
-        nuevo_punto2 = D + vector_perpendicular_unitario * 2.5
-        nuevo_punto3 = D + vector_perpendicular_unitario * 1.5
+        Detalles:
+        - La dirección es la perpendicular al radio que va del circuncentro a D
+        (`geometria.tangente_circunscrita`), calculada sin el circuncentro, de modo que
+        con B, C y D casi alineados tiende a la dirección de la recta en lugar de fallar.
+        """
+        tx, ty = tangente_circunscrita(B, C, D)
+        return tuple((D[0] + tx * distancia, D[1] + ty * distancia) for distancia in (4, 2.5, 1.5))
 
-        return nuevo_punto1, nuevo_punto2, nuevo_punto3
-    
     def generate_curved_path(self, B, C, D):
         """
         Genera una trayectoria utilizando dos curvas de Bézier cúbicas que pasan por los puntos B, C y D,
@@ -299,41 +325,48 @@ class ExpertSystem:
         shift_distance (float): Distancia para ajustar el punto C de manera perpendicular.
 
         Devuelve:
-        numpy.array: Trayectoria generada como una lista de puntos.
+        numpy.array: Array (n, 2) de float64 con la trayectoria generada.
         """
         # Verifica si debe cerrar la trayectoria en el segmento final
-        if self.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER - 1:
-            trayectoria = []
-            trayectoria.append(B)
-            trayectoria.append(C)
-            trayectoria.append(D)
+        if self.config.VOLVER_AL_INICIO and self.segment_number == self.TOTAL_SEGMENT_NUMBER - 1:
+            trayectoria = np.array((B, C, D), dtype=np.float64)
             self.CURRENT_TRIANGLE_CHECKPOINTS = len(trayectoria)
-            return np.array(trayectoria)
+            return trayectoria
         else:
             # Genera un punto único perpendicular al segmento B-D y por encima de D
             D_nuevo, punto_encima_D2, punto_encima_D3 = self.add_point_above_D(B, C, D)
             nuevo_C = self.move_point_C_perpendicular(B, C, D)
             CP1, CP2 = self.calculate_control_points(self.segmentoObjetivo.getInicio(), nuevo_C, D_nuevo)
-            trayectoria = []
+
+            if self.config.MUESTREO_ADAPTATIVO:
+                # Checkpoints según la longitud y la curvatura de cada curva; nuevo_C no se repite
+                tolerancia, espaciado = self.config.TOLERANCIA_MUESTREO, self.config.ESPACIADO_MAXIMO
+                trayectoria = np.concatenate((
+                    bezier_adaptativa(B, CP1, CP1, nuevo_C, tolerancia, espaciado),
+                    bezier_adaptativa(nuevo_C, CP2, CP2, D_nuevo, tolerancia, espaciado)[1:],
+                    (punto_encima_D2, punto_encima_D3, D),
+                ))
+                self.CURRENT_TRIANGLE_CHECKPOINTS = len(trayectoria)
+                return trayectoria
+
+            # MAX_TRIANGLE_CHECKPOINTS valores de t en [0, 1] por curva
+            n = self.config.MAX_TRIANGLE_CHECKPOINTS
+            trayectoria = np.empty((2 * n + 3, 2), dtype=np.float64)
 
             # Primera parte: curva de Bézier cúbica de B a C con CP1 como punto de control
-            for t in np.linspace(0, 1, self.MAX_TRIANGLE_CHECKPOINTS):
-                punto = self.cubic_bezier(t, np.array(B), np.array(CP1), np.array(CP1), np.array(nuevo_C))
-                trayectoria.append(punto)
+            bezier_cubica(B, CP1, CP1, nuevo_C, out=trayectoria[:n])
 
             # Segunda parte: curva de Bézier cúbica de C a D con CP2 como punto de control
-            for t in np.linspace(0, 1, self.MAX_TRIANGLE_CHECKPOINTS):
-                punto = self.cubic_bezier(t, np.array(nuevo_C), np.array(CP2), np.array(CP2), np.array(D_nuevo))
-                trayectoria.append(punto)
+            bezier_cubica(nuevo_C, CP2, CP2, D_nuevo, out=trayectoria[n:2 * n])
 
             # Añade puntos adicionales por encima de D
-            trayectoria.append(punto_encima_D2)
-            trayectoria.append(punto_encima_D3)
-            trayectoria.append(D)
+            trayectoria[2 * n] = punto_encima_D2
+            trayectoria[2 * n + 1] = punto_encima_D3
+            trayectoria[2 * n + 2] = D
 
             self.CURRENT_TRIANGLE_CHECKPOINTS = len(trayectoria)
 
-            return np.array(trayectoria)
+            return trayectoria
 
     # #######################
     # ---- LINE CONTROLL ----
@@ -354,8 +387,8 @@ class ExpertSystem:
         x2, y2 = B
 
         # Cálculo de las coordenadas del punto C
-        x = x1 - self.LINE_EXPANSION_FACTOR * (x2 - x1)
-        y = y1 - self.LINE_EXPANSION_FACTOR * (y2 - y1)
+        x = x1 - self.config.LINE_EXPANSION_FACTOR * (x2 - x1)
+        y = y1 - self.config.LINE_EXPANSION_FACTOR * (y2 - y1)
 
         return (x, y)
 
@@ -368,36 +401,129 @@ class ExpertSystem:
         A, B (tuple): Coordenadas de los puntos inicial (A) y final (B).
 
         Devuelve:
-        list: Lista de puntos (tuplas) que forman la trayectoria lineal, incluyendo puntos intermedios.
+        numpy.array: Array (n, 2) de float64 con los puntos de la trayectoria lineal, incluyendo puntos intermedios.
         """
         # Coordenadas del punto A
         x1, y1 = float(A[0]), float(A[1])
         # Coordenadas del punto B
         x2, y2 = float(B[0]), float(B[1])
 
-        puntos = []
+        # Puntos intermedios: LINE_CHECKPOINTS, o los justos para no superar ESPACIADO_MAXIMO
+        n = self.config.LINE_CHECKPOINTS
+        if self.config.MUESTREO_ADAPTATIVO:
+            n = divisiones_recta((x1, y1), (x2, y2), self.config.ESPACIADO_MAXIMO) - 1
 
-        # Si el número de segmento es 0, añade un punto en la extensión de la línea
-        if self.segment_number == 0:
-            puntos.append(self.generate_point_on_extension(A, B))
+        # Si el número de segmento es 0, se reserva un punto en la extensión de la línea
+        extension = 1 if self.segment_number == 0 else 0
+        puntos = np.empty((n + 2 + extension, 2), dtype=np.float64)
+        if extension:
+            puntos[0] = self.generate_point_on_extension(A, B)
 
         # Añadimos el punto A al inicio
-        puntos.append(A)
+        puntos[extension] = x1, y1
 
         # Calculamos los incrementos entre puntos en los ejes x e y
-        dx = (x2 - x1) / (self.LINE_CHECKPOINTS + 1)
-        dy = (y2 - y1) / (self.LINE_CHECKPOINTS + 1)
+        dx = (x2 - x1) / (n + 1)
+        dy = (y2 - y1) / (n + 1)
 
-        # Añadimos puntos intermedios con precisión flotante
-        for i in range(1, self.LINE_CHECKPOINTS + 1):
-            x = round(x1 + i * dx, 6)
-            y = round(y1 + i * dy, 6)
-            puntos.append((x, y))
+        # Añadimos de una vez los puntos intermedios, redondeados a 6 decimales
+        i = np.arange(1, n + 1)
+        intermedios = puntos[extension + 1:-1]
+        np.round(x1 + i * dx, 6, out=intermedios[:, 0])
+        np.round(y1 + i * dy, 6, out=intermedios[:, 1])
 
         # Añadimos el punto B al final
-        puntos.append(B)
+        puntos[-1] = x2, y2
         return puntos
 
+    # ########################
+    # ---- RUTA COMPILADA ----
+    # ########################
+
+    def parametros_trayectoria(self):
+        """
+        Constantes que intervienen en la generación de trayectorias; forman parte de la clave de la caché.
+        """
+        return {
+            "LINE_CHECKPOINTS": self.config.LINE_CHECKPOINTS,
+            "LINE_EXPANSION_FACTOR": self.config.LINE_EXPANSION_FACTOR,
+            "MAX_TRIANGLE_CHECKPOINTS": self.config.MAX_TRIANGLE_CHECKPOINTS,
+            "CONTROL_POINT_CONSTANT": self.config.CONTROL_POINT_CONSTANT,
+            "CURVE_EXPANSION_FACTOR": self.config.CURVE_EXPANSION_FACTOR,
+            "CURVE_CONTROLL_POINTS_OFFSET": self.config.CURVE_CONTROLL_POINTS_OFFSET,
+            "VOLVER_AL_INICIO": self.config.VOLVER_AL_INICIO,
+            "MUESTREO_ADAPTATIVO": self.config.MUESTREO_ADAPTATIVO,
+            "ESPACIADO_MAXIMO": self.config.ESPACIADO_MAXIMO,
+            "TOLERANCIA_MUESTREO": self.config.TOLERANCIA_MUESTREO,
+        }
+
+    def trayectoria_segmento(self, numero, segmento):
+        """
+        Genera la trayectoria que tendría `segmento` al recorrerlo como segmento número `numero`.
+
+        Args:
+            numero (int): Número de segmento (decide el punto de extensión y el cierre de la ruta).
+            segmento (Segmento): Segmento de la ruta.
+
+        Returns:
+            numpy.array: Trayectoria del segmento.
+        """
+        segment_number, segmentoObjetivo = self.segment_number, self.segmentoObjetivo
+        self.segment_number, self.segmentoObjetivo = numero, segmento
+        try:
+            if segmento.getType() == 1:
+                return self.generate_linear_path(segmento.getInicio(), segmento.getFin())
+            return self.generate_curved_path(segmento.getInicio(), segmento.getMedio(), segmento.getFin())
+        finally:
+            self.segment_number, self.segmentoObjetivo = segment_number, segmentoObjetivo
+
+    def compilar_ruta(self, objetivos, directorio_cache=None):
+        """
+        Genera de una vez las trayectorias de todos los segmentos de la ruta.
+
+        Args:
+            objetivos (list): Segmentos de la ruta, en orden.
+            directorio_cache (str, opcional): Directorio donde reutilizar o guardar la ruta compilada.
+
+        Returns:
+            RutaCompilada: Trayectorias de la ruta en un único array con desplazamientos por segmento.
+        """
+        if directorio_cache is None:
+            return RutaCompilada.compilar(objetivos, self.trayectoria_segmento)
+        return RutaCompilada.desde_cache(directorio_cache, objetivos, self.parametros_trayectoria(), self.trayectoria_segmento)
+
+    def planificar_perfil(self, ruta):
+        """
+        Planifica la velocidad lineal de cada checkpoint de la ruta compilada (ver `perfilVelocidad`).
+
+        Args:
+            ruta (RutaCompilada): Ruta compilada del controlador.
+
+        Returns:
+            list: Para cada segmento, la lista de velocidades (m/s) de sus checkpoints.
+
+        Detalles:
+        - El perfil se calcula sobre la polilínea de toda la ruta, de modo que en las uniones entre
+        segmentos el robot no tiene que detenerse si la trayectoria no gira.
+        - Empieza y termina en reposo y respeta `VMAX`, `VACC` y `WMAX`.
+        """
+        perfil = perfil_velocidad(ruta.puntos, VMAX, VACC, WMAX)
+        return [perfil[inicio:fin].tolist() for inicio, fin in zip(ruta.offsets[:-1].tolist(), ruta.offsets[1:].tolist())]
+
+    def obtener_trayectoria(self):
+        """
+        Trayectoria del segmento actual: la precalculada si hay ruta compilada, o generada en el momento.
+
+        Si la ruta es un flujo, antes lee los segmentos de la ventana por delante del actual y
+        actualiza `TOTAL_SEGMENT_NUMBER` (conocido en cuanto el flujo se agota).
+        """
+        if self.flujo is not None:
+            self.flujo.avanzar(self.segment_number)
+            self.TOTAL_SEGMENT_NUMBER = self.flujo.total
+        if self.ruta is not None and self.segment_number < len(self.ruta):
+            return self.ruta.trayectoria(self.segment_number)
+        return self.trayectoria_segmento(self.segment_number, self.segmentoObjetivo)
+
     # ########################
     # ---- CODIGO GENERAL ----
     # ########################
@@ -442,7 +568,7 @@ class ExpertSystem:
         """
         Decide el modo de movimiento del robot.
         """
-        self.reverse = abs(turn_angle_deg) > self.REVERSE_THRESHOLD
+        self.reverse = abs(turn_angle_deg) > self.config.REVERSE_THRESHOLD
 
     def verificar_proximidad_objetivo(self, distance):
         """
@@ -451,15 +577,24 @@ class ExpertSystem:
 
         Args:
             distance (float): La distancia actual entre el robot y el objetivo.
+
+        Detalles:
+        - Con `PERFIL_VELOCIDAD` el robot no se detiene al final de cada segmento lineal, así que su
+        último checkpoint se alcanza como los demás (`CHECKPOINT_DISTANCE_ACTIVATOR`). Solo en el
+        último segmento de la ruta se exige `STOP_DISTANCE`.
         """
         if self.segmentoObjetivo.getType() == 1:
-            # Si la distancia al objetivo es menor o igual a STOP_DISTANCE, detenerse completamente
-            if distance <= self.STOP_DISTANCE and self.check_point_segmento == len(self.line_trayectory)-1:
+            distancia_final = self.config.STOP_DISTANCE
+            if self.perfil is not None and self.segment_number < self.TOTAL_SEGMENT_NUMBER - 1:
+                distancia_final = max(distancia_final, self.CHECKPOINT_DISTANCE_ACTIVATOR)
+
+            # Si la distancia al objetivo es menor o igual a la distancia final, el segmento termina
+            if distance <= distancia_final and self.check_point_segmento == len(self.line_trayectory)-1:
                 self.objetivoAlcanzado = True  # Marcar el objetivo como alcanzado
                 self.segment_number += 1        # Pasar al siguiente segmento
 
                 # Control de lógica para volver al inicio
-                self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.VOLVER_AL_INICIO else True
+                self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.config.VOLVER_AL_INICIO else True
 
                 # Reiniciar el checkpoint
                 self.check_point_segmento = 0
@@ -481,7 +616,7 @@ class ExpertSystem:
                 self.check_point_triangulo = 0
                 self.segment_number += 1 
 
-            elif distance <= self.MINIMUM_DISTANCE_TRIANGLE_CP and self.check_point_triangulo <= self.CURRENT_TRIANGLE_CHECKPOINTS-2:
+            elif distance <= self.config.MINIMUM_DISTANCE_TRIANGLE_CP and self.check_point_triangulo <= self.CURRENT_TRIANGLE_CHECKPOINTS-2:
                 self.check_point_triangulo += 1
 
             # --- REDUCCIÓN SUAVE DE VELOCIDAD ---
@@ -502,7 +637,7 @@ class ExpertSystem:
         """
         if self.segmentoObjetivo.getType() == 1:
             if self.check_point_segmento == 0:
-                self.line_trayectory = self.generate_linear_path(self.segmentoObjetivo.getInicio(), self.segmentoObjetivo.getFin())
+                self.line_trayectory = self.obtener_trayectoria()
                 if self.segment_number == 0:
                     self.FRENAR = True
                     self.CHECKPOINT_DISTANCE_ACTIVATOR = 2
@@ -512,10 +647,38 @@ class ExpertSystem:
             x_target, y_target = self.line_trayectory[self.check_point_segmento]
         else:
             if self.check_point_triangulo == 0:
-                self.triangle_trayectory = self.generate_curved_path(self.segmentoObjetivo.getInicio(), self.segmentoObjetivo.getMedio(), self.segmentoObjetivo.getFin())
+                self.triangle_trayectory = self.obtener_trayectoria()
+                self.CURRENT_TRIANGLE_CHECKPOINTS = len(self.triangle_trayectory)
             x_target, y_target = self.triangle_trayectory[self.check_point_triangulo]
             self.FRENAR = False
         return x_target, y_target
+
+    def avanzar_checkpoint_por_proyeccion(self, x_robot, y_robot, x_target, y_target):
+        """
+        Adelanta el checkpoint actual hasta el primero que queda por delante de la proyección del
+        robot sobre la trayectoria (ver `proyeccion.checkpoint_adelantado`).
+
+        Args:
+            x_robot (float): Coordenada X actual del robot.
+            y_robot (float): Coordenada Y actual del robot.
+            x_target (float): Coordenada X del objetivo elegido por `obtener_coordenadas_objetivo`.
+            y_target (float): Coordenada Y del objetivo elegido por `obtener_coordenadas_objetivo`.
+
+        Returns:
+            tuple: Coordenadas del objetivo tras el avance (x_target, y_target).
+        """
+        if self.segmentoObjetivo.getType() == 1:
+            nuevo = checkpoint_adelantado(self.line_trayectory, x_robot, y_robot, self.check_point_segmento, self.config.VENTANA_PROYECCION)
+            if nuevo == self.check_point_segmento:
+                return x_target, y_target
+            self.check_point_segmento = nuevo
+            return tuple(self.line_trayectory[nuevo])
+
+        nuevo = checkpoint_adelantado(self.triangle_trayectory, x_robot, y_robot, self.check_point_triangulo, self.config.VENTANA_PROYECCION)
+        if nuevo == self.check_point_triangulo:
+            return x_target, y_target
+        self.check_point_triangulo = nuevo
+        return tuple(self.triangle_trayectory[nuevo])
     
     def calcular_distancia_objetivo(self, x_target, y_target, x_robot, y_robot):
         """
@@ -539,22 +702,36 @@ class ExpertSystem:
         Args:
             turn_angle_rad (float): Ángulo de giro en radianes.
             distance (float): Distancia euclidiana entre el robot y el objetivo.
-        """
-        if self.segmentoObjetivo.getType() == 1:
-            if (self.check_point_segmento == 0 and abs(turn_angle_rad) < math.radians(distance * self.DISTANCE_TURN_CONSTANT)) or \
-            (self.check_point_segmento == 0 and abs(turn_angle_rad) < math.radians(self.MAXIMUM_ANGLE_DEG)):
-                self.velocidad = min(VMAX, distance * VACC * self.CONSTANTE_AUMENTAR_VELOCIDAD)  # VMAX es la velocidad máxima, VACC es el coeficiente de aceleración lineal
-            elif self.check_point_segmento != 0 and abs(turn_angle_rad) < math.radians(self.MAXIMUM_ANGLE_DEG):
+
+        Detalles:
+        - Con `PERFIL_VELOCIDAD`, la velocidad es la mayor desde la que el robot aún puede frenar hasta
+        la planificada para el checkpoint objetivo en la distancia que le queda (`sqrt(v² + 2·VACC·d)`),
+        limitada además por el arco que lleva al objetivo desde la orientación actual (curvatura
+        `2·sin(giro) / d`), que el robot debe poder recorrer sin superar `WMAX`. Las reglas reactivas
+        solo se usan fuera de la ruta compilada.
+        """
+        if self.perfil is not None and self.segment_number < len(self.perfil):
+            check_point = self.check_point_segmento if self.segmentoObjetivo.getType() == 1 else self.check_point_triangulo
+            v_objetivo = self.perfil[self.segment_number][check_point]
+            self.velocidad = min(VMAX, math.sqrt(v_objetivo * v_objetivo + 2 * VACC * distance))
+            curvatura_arco = 2 * math.sin(abs(turn_angle_rad)) / max(distance, 1e-9)
+            if curvatura_arco * self.velocidad > WMAX:
+                self.velocidad = WMAX / curvatura_arco
+        elif self.segmentoObjetivo.getType() == 1:
+            if (self.check_point_segmento == 0 and abs(turn_angle_rad) < math.radians(distance * self.config.DISTANCE_TURN_CONSTANT)) or \
+            (self.check_point_segmento == 0 and abs(turn_angle_rad) < math.radians(self.config.MAXIMUM_ANGLE_DEG)):
+                self.velocidad = min(VMAX, distance * VACC * self.config.CONSTANTE_AUMENTAR_VELOCIDAD)  # VMAX es la velocidad máxima, VACC es el coeficiente de aceleración lineal
+            elif self.check_point_segmento != 0 and abs(turn_angle_rad) < math.radians(self.config.MAXIMUM_ANGLE_DEG):
                 self.velocidad = 3  
             else:
                 self.velocidad = 0  # Si no cumple con las condiciones, la velocidad es 0
         else:
             if self.segment_number == self.TOTAL_SEGMENT_NUMBER-1:
                 velocidad_angular_factor = max(0, 1 - abs(turn_angle_rad) / math.radians(90))
-                self.velocidad = min(VMAX, distance * VACC * self.TRIANGLE_SPEED * velocidad_angular_factor * 1.5) 
+                self.velocidad = min(VMAX, distance * VACC * self.config.TRIANGLE_SPEED * velocidad_angular_factor * 1.5) 
             else:
                 velocidad_angular_factor = max(0, 1 - abs(turn_angle_rad) / math.radians(90))
-                self.velocidad = min(VMAX, distance * VACC * self.TRIANGLE_SPEED * velocidad_angular_factor * 1.25)
+                self.velocidad = min(VMAX, distance * VACC * self.config.TRIANGLE_SPEED * velocidad_angular_factor * 1.25)
 
     def calcular_velocidad_angular(self, turn_angle_rad):
         """
@@ -564,7 +741,7 @@ class ExpertSystem:
             turn_angle_rad (float): Ángulo de giro en radianes.
         """
         # Calcular la velocidad angular proporcional al ángulo de giro necesario
-        self.velocidad_angular = turn_angle_rad * WACC * self.VELOCIDAD_ANGULAR_CONSTANT  # WACC es el coeficiente de aceleración angular
+        self.velocidad_angular = turn_angle_rad * WACC * self.config.VELOCIDAD_ANGULAR_CONSTANT  # WACC es el coeficiente de aceleración angular
         
         # Limitar la velocidad angular a los valores máximos permitidos
         self.velocidad_angular = max(-WMAX, min(WMAX, self.velocidad_angular))  # WMAX es la velocidad angular máxima
@@ -572,46 +749,27 @@ class ExpertSystem:
         if self.segmentoObjetivo.getType() == 2:
             self.velocidad_angular = max(-WMAX, min(WMAX, self.velocidad_angular*1.5))
 
-    def tomarDecision(self, poseRobot):
+    def decidir_por_checkpoints(self, poseRobot):
         """
-        Toma una decisión de movimiento para el robot basado en su posición actual
-        y la posición del objetivo en el segmento.
-
-        Este método calcula las velocidades lineal y angular necesarias para mover
-        al robot hacia el objetivo de manera eficiente, ajustando su trayectoria 
-        en función del ángulo de giro y la distancia al objetivo. También considera 
-        la posibilidad de moverse en reversa para optimizar el movimiento en casos 
-        donde el ángulo de giro es mayor al umbral definido.
-
-        Además, se maneja la lógica de activación de checkpoints y el retorno al 
-        inicio de la trayectoria si es necesario.
+        Reglas originales: dirige el robot hacia el checkpoint actual con una ganancia proporcional
+        sobre el ángulo de giro, marcha atrás por encima de `REVERSE_THRESHOLD` y las velocidades
+        lineales de cada tipo de segmento. Actualiza `velocidad`, `velocidad_angular` y el estado.
 
         Args:
-            poseRobot (tuple): Una tupla que contiene la posición actual del robot y su
-                            ángulo de orientación en grados, en el formato (x_robot, y_robot, current_angle).
+            poseRobot (tuple): Pose del robot (x, y, ángulo, v, w).
 
         Returns:
-            tuple: Una tupla con las velocidades lineal y angular calculadas
-                (velocidad, velocidad_angular), donde:
-                - velocidad (float): Velocidad lineal en m/s.
-                - velocidad_angular (float): Velocidad angular en rad/s.
-
-        Comportamiento:
-            - Si el ángulo de giro es menor que un valor calculado (dependiendo de la 
-            distancia o un ángulo máximo fijo), el robot avanza hacia el objetivo.
-            - Si la distancia al objetivo es menor o igual a un umbral de parada, el 
-            robot se detiene completamente.
-            - Si el ángulo de giro excede un umbral definido, el robot puede activar 
-            el modo reversa para minimizar el giro.
-            - Controla la lógica de volver al inicio cuando el robot ha alcanzado el 
-            último segmento de la trayectoria.
+            tuple: Coordenadas del checkpoint objetivo (x_target, y_target).
         """
-
         # --- RECOPILAR DATOS ---
         x_target, y_target = self.obtener_coordenadas_objetivo()
         # Obtener las coordenadas actuales del robot
         x_robot, y_robot, current_angle, _, _ = poseRobot
 
+        # --- AVANCE DE CHECKPOINT POR PROYECCIÓN (opcional) ---
+        if self.config.AVANCE_POR_PROYECCION:
+            x_target, y_target = self.avanzar_checkpoint_por_proyeccion(x_robot, y_robot, x_target, y_target)
+
         # --- CÁLCULO DE ANGULO ---
         self.turn_angle_deg = self.calcular_angulo(x_target, y_target, x_robot, y_robot, current_angle)
 
@@ -641,8 +799,164 @@ class ExpertSystem:
         if self.reverse:
             self.velocidad = -self.velocidad
 
+        return x_target, y_target
+
+    def seguir_trayectoria(self, poseRobot):
+        """
+        Ley de seguimiento continua (`LEY_SEGUIMIENTO`) sobre la trayectoria precalculada del segmento.
+        Actualiza `velocidad`, `velocidad_angular` y el estado del segmento.
+
+        Args:
+            poseRobot (tuple): Pose del robot (x, y, ángulo, v, w).
+
+        Returns:
+            tuple: Punto de la trayectoria que se sigue (x_target, y_target): el punto anticipado en
+            pure pursuit o la proyección del robot en Stanley.
+
+        Detalles:
+        - Al empezar cada segmento se carga en el `SeguidorTrayectoria` su trayectoria y la del
+        siguiente, con su perfil de velocidad (`VMAX`, `VACC`, `WMAX`); en cada tick solo se proyecta
+        la pose y se consulta el perfil, con un número constante de operaciones.
+        - pure pursuit: apunta a un punto a `ANTICIPACION_MINIMA + ANTICIPACION_POR_VELOCIDAD·|v|` por
+        delante de la proyección y gira con la curvatura del arco que lleva a él (`2·sin(α) / d`).
+        - Stanley: gira para corregir el error de orientación respecto a la arista más el término
+        `atan(GANANCIA_STANLEY·e / (SUAVIZADO_STANLEY + |v|))` del error transversal `e`, con la
+        ganancia proporcional de las reglas (`WACC·VELOCIDAD_ANGULAR_CONSTANT`).
+        - La velocidad es la del perfil, la que permite frenar hasta él y, en pure pursuit, la que
+        permite describir el arco sin superar `WMAX`; se reduce con el coseno del giro pendiente y
+        con el objetivo detrás del robot se gira en el sitio. No se usa marcha atrás.
+        - El segmento termina a `STOP_DISTANCE` de su final, o al rebasarlo a menos de
+        `DISTANCIA_LLEGADA`; si se rebasa más lejos, el robot vuelve hacia el final.
+        """
+        x_robot, y_robot, current_angle, v_robot, _ = poseRobot
+        seguidor = self.seguidor
+
+        # --- CARGA DEL SEGMENTO (una vez por segmento) ---
+        if seguidor.numero != self.segment_number:
+            trayectoria = self.obtener_trayectoria()
+            siguiente = self.segment_number + 1
+            proxima = self.ruta.trayectoria(siguiente) if siguiente < min(self.TOTAL_SEGMENT_NUMBER, len(self.ruta)) else None
+            seguidor.cargar(self.segment_number, trayectoria, proxima, VMAX, VACC, WMAX)
+            if self.segmentoObjetivo.getType() == 1:
+                self.line_trayectory = trayectoria
+            else:
+                self.triangle_trayectory = trayectoria
+                self.CURRENT_TRIANGLE_CHECKPOINTS = len(trayectoria)
+            self.FRENAR = proxima is None
+
+        # --- PROYECCIÓN Y PUNTO SEGUIDO ---
+        recorrido, error = seguidor.proyectar(x_robot, y_robot)
+        x_fin, y_fin = seguidor.fin
+        distancia_fin = math.sqrt((x_fin - x_robot) ** 2 + (y_fin - y_robot) ** 2)
+        rebasado = seguidor.rebasado_fin(x_robot, y_robot)
+        self.velocidad = min(VMAX, seguidor.velocidad(recorrido))
+        rapidez = abs(v_robot)
+
+        volver_al_fin = rebasado and distancia_fin > self.config.DISTANCIA_LLEGADA
+        if volver_al_fin:
+            # Final rebasado lejos de él: volver a buscarlo
+            x_target, y_target = x_fin, y_fin
+        elif self.config.LEY_SEGUIMIENTO == "pure_pursuit":
+            # El punto anticipado no pasa del final del segmento: en las uniones en horquilla el
+            # segmento siguiente vuelve sobre el actual y el punto caería junto al robot
+            anticipacion = self.config.ANTICIPACION_MINIMA + self.config.ANTICIPACION_POR_VELOCIDAD * rapidez
+            x_target, y_target = seguidor.punto(min(recorrido + anticipacion, seguidor.longitud_segmento))
+        else:
+            x_target, y_target = seguidor.punto(recorrido)
+
+        # --- ÁNGULO DE GIRO ---
+        if self.config.LEY_SEGUIMIENTO == "stanley" and not volver_al_fin:
+            orientacion = self.normalize_angle(seguidor.angulo[seguidor.arista] - self.normalize_angle(current_angle))
+            correccion = math.atan2(self.config.GANANCIA_STANLEY * error, self.config.SUAVIZADO_STANLEY + rapidez)
+            self.turn_angle_rad = math.radians(orientacion) - correccion
+            self.turn_angle_deg = math.degrees(self.turn_angle_rad)
+        else:
+            self.turn_angle_deg = self.calcular_angulo(x_target, y_target, x_robot, y_robot, current_angle)
+            self.turn_angle_rad = math.radians(self.turn_angle_deg)
+        self.distance = math.sqrt((x_target - x_robot) ** 2 + (y_target - y_robot) ** 2)
+
+        # --- VELOCIDADES ---
+        self.reverse = False
+        if abs(self.turn_angle_rad) >= math.pi / 2:
+            # Objetivo detrás del robot: girar en el sitio
+            self.velocidad = 0.0
+            self.velocidad_angular = math.copysign(WMAX, self.turn_angle_rad)
+        elif self.config.LEY_SEGUIMIENTO == "pure_pursuit" or volver_al_fin:
+            self.velocidad *= math.cos(self.turn_angle_rad)
+            curvatura = 2 * math.sin(self.turn_angle_rad) / max(self.distance, 1e-9)
+            if abs(curvatura) * self.velocidad > WMAX:
+                self.velocidad = WMAX / abs(curvatura)
+            self.velocidad_angular = max(-WMAX, min(WMAX, curvatura * self.velocidad))
+        else:
+            self.velocidad *= math.cos(self.turn_angle_rad)
+            self.velocidad_angular = max(-WMAX, min(WMAX, self.turn_angle_rad * WACC * self.config.VELOCIDAD_ANGULAR_CONSTANT))
+
+        # --- PROGRESO DEL SEGMENTO ---
+        check_point = seguidor.arista + 1
+        if distancia_fin <= self.config.STOP_DISTANCE or (rebasado and distancia_fin <= self.config.DISTANCIA_LLEGADA):
+            self.segment_number += 1
+            self.objetivoAlcanzado = self.segment_number != self.TOTAL_SEGMENT_NUMBER if self.config.VOLVER_AL_INICIO else True
+            check_point = 0
+        if self.segmentoObjetivo.getType() == 1:
+            self.check_point_segmento = check_point
+        else:
+            self.check_point_triangulo = check_point
+
+        return x_target, y_target
+
+    def tomarDecision(self, poseRobot):
+        """
+        Toma una decisión de movimiento para el robot basado en su posición actual
+        y la posición del objetivo en el segmento.
+
+        Este método calcula las velocidades lineal y angular necesarias para mover
+        al robot hacia el objetivo de manera eficiente, ajustando su trayectoria 
+        en función del ángulo de giro y la distancia al objetivo. También considera 
+        la posibilidad de moverse en reversa para optimizar el movimiento en casos 
+        donde el ángulo de giro es mayor al umbral definido.
+
+        Además, se maneja la lógica de activación de checkpoints y el retorno al 
+        inicio de la trayectoria si es necesario.
+
+        Args:
+            poseRobot (tuple): Una tupla que contiene la posición actual del robot y su
+                            ángulo de orientación en grados, en el formato (x_robot, y_robot, current_angle).
+
+        Returns:
+            Decision: Tupla con nombre con las velocidades lineal y angular calculadas
+                (velocidad, velocidad_angular), donde:
+                - velocidad (float): Velocidad lineal en m/s.
+                - velocidad_angular (float): Velocidad angular en rad/s.
+
+        Comportamiento:
+            - Si el ángulo de giro es menor que un valor calculado (dependiendo de la 
+            distancia o un ángulo máximo fijo), el robot avanza hacia el objetivo.
+            - Si la distancia al objetivo es menor o igual a un umbral de parada, el 
+            robot se detiene completamente.
+            - Si el ángulo de giro excede un umbral definido, el robot puede activar 
+            el modo reversa para minimizar el giro.
+            - Controla la lógica de volver al inicio cuando el robot ha alcanzado el 
+            último segmento de la trayectoria.
+        """
+
+        # --- LEY DE SEGUIMIENTO: CONTINUA (pure pursuit / Stanley) O POR CHECKPOINTS ---
+        if self.seguidor is not None:
+            x_target, y_target = self.seguir_trayectoria(poseRobot)
+        else:
+            x_target, y_target = self.decidir_por_checkpoints(poseRobot)
+
+        # --- TELEMETRÍA ---
+        if self.telemetria is not None:
+            check_point = self.check_point_segmento if self.segmentoObjetivo.getType() == 1 else self.check_point_triangulo
+            self.telemetria.registrar(poseRobot, (x_target, y_target), self.segment_number, check_point,
+                                      self.velocidad, self.velocidad_angular, self.reverse, self.FRENAR)
+
+        # --- GRABACIÓN DE LA TRAZA ---
+        if self.traza is not None:
+            self.traza.registrar(self, poseRobot, self.velocidad, self.velocidad_angular)
+
         # --- DEVOLVER LAS VELOCIDADES CALCULADAS ---
-        return self.velocidad, self.velocidad_angular
+        return Decision(self.velocidad, self.velocidad_angular)
     
     # función esObjetivoAlcanzado 
     #   Devuelve True cuando el punto final del objetivo ha sido alcanzado. 